@@ -0,0 +1,83 @@
+"""Общие помощники для микробенчмарков: окружение для Config и замер скорости."""
+
+import os
+import tempfile
+import time
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.hazmat.primitives.asymmetric.types import PrivateKeyTypes
+
+ENV_DEFAULTS = {
+    "ADMIN_USERNAME": "bench",
+    "ADMIN_PASSWORD": "bench-password",
+    "POSTGRES_USER": "bench",
+    "POSTGRES_PASSWORD": "bench",
+    "POSTGRES_DB": "bench",
+    "POSTGRES_HOST": "localhost",
+    "POSTGRES_PORT": "5432",
+    "MONGO_USER": "bench",
+    "MONGO_PASSWORD": "bench",
+    "MONGO_HOST": "localhost",
+    "MONGO_PORT": "27017",
+    "REFRESH_TOKEN_EXPIRE_SECONDS": "86400",
+    "ACCESS_TOKEN_EXPIRE_SECONDS": "900",
+    "POSTS_CACHE_EXPIRE_SECONDS": "60",
+    "COMMENTS_CACHE_EXPIRE_SECONDS": "60",
+    "PROJECTS_CACHE_EXPIRE_SECONDS": "60",
+}
+
+
+def write_key_pair(directory: Path, name: str, private_key: PrivateKeyTypes) -> Path:
+    """Сохраняет пару PEM ключей, возвращает путь к приватному."""
+    private_path = directory / f"{name}_private.pem"
+    private_path.write_bytes(
+        private_key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        )
+    )
+    (directory / f"{name}_public.pem").write_bytes(
+        private_key.public_key().public_bytes(
+            serialization.Encoding.PEM,
+            serialization.PublicFormat.SubjectPublicKeyInfo,
+        )
+    )
+    return private_path
+
+
+def setup_env() -> Path:
+    """Заполняет обязательные переменные Config и генерирует временную пару RSA ключей."""
+    for key, value in ENV_DEFAULTS.items():
+        os.environ.setdefault(key, value)
+    keys_dir = Path(tempfile.mkdtemp(prefix="bench_keys_"))
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    write_key_pair(keys_dir, "rs256", private_key)
+    os.environ.setdefault("JWT_PRIVATE_KEY", str(keys_dir / "rs256_private.pem"))
+    os.environ.setdefault("JWT_PUBLIC_KEY", str(keys_dir / "rs256_public.pem"))
+    return keys_dir
+
+
+def measure(fn: Callable[[], object], seconds: float = 2.0) -> float:
+    """Операций в секунду для синхронной функции."""
+    count = 0
+    started = time.perf_counter()
+    while (elapsed := time.perf_counter() - started) < seconds:
+        fn()
+        count += 1
+    return count / elapsed
+
+
+async def measure_async(
+    fn: Callable[[], Awaitable[object]], seconds: float = 2.0
+) -> float:
+    """Операций в секунду для корутины."""
+    count = 0
+    started = time.perf_counter()
+    while (elapsed := time.perf_counter() - started) < seconds:
+        await fn()
+        count += 1
+    return count / elapsed
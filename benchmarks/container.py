@@ -0,0 +1,91 @@
+"""
+Стоимость получения guard'а маршрута из контейнера на запрос: граф из Factory
+(как было — новые guard, use case, сервисы, auth сервис и репозиторий на каждый
+запрос) против собранных при старте Singleton. Меряются вызовы в секунду и
+память, выделенная под граф одного запроса. Подключения к базам не нужны.
+
+    python -m benchmarks.container
+"""
+
+import contextvars
+import tracemalloc
+
+from benchmarks.common import measure, setup_env
+
+setup_env()
+
+from dependency_injector import providers
+
+from src.application.authorize import UseCaseGuard
+from src.application.services.posts import PostsService
+from src.application.services.projects import ProjectsService
+from src.application.services.users import UsersService
+from src.application.usecases.abs import AbstractUseCase
+from src.container import container
+from src.infrastructure.repositories.tokens import JWTRedisAuthRepository
+from src.infrastructure.services.auth import JwtAuthService
+from src.infrastructure.unit_of_work import UnitOfWork
+
+ROUTES = ("get_posts_use_case", "create_comment_use_case", "login_use_case")
+# Что раньше собиралось на каждый запрос.
+PER_REQUEST = (
+    UseCaseGuard,
+    PostsService,
+    ProjectsService,
+    UsersService,
+    JwtAuthService,
+    JWTRedisAuthRepository,
+)
+ALLOCATION_ROUNDS = 1000
+
+
+def as_factory(provider: object, memo: dict[int, providers.Provider]) -> object:
+    """Копия графа, где объекты запроса снова собираются через Factory."""
+    if not isinstance(provider, providers.Singleton):
+        return provider
+    cls = provider.cls
+    if not (issubclass(cls, PER_REQUEST + (AbstractUseCase,)) or cls is UnitOfWork):
+        return provider
+    if id(provider) not in memo:
+        args = [as_factory(arg, memo) for arg in provider.args]
+        kwargs = {k: as_factory(v, memo) for k, v in provider.kwargs.items()}
+        # Единица работы была одна на контекст запроса.
+        kind = (
+            providers.ContextLocalSingleton if cls is UnitOfWork else providers.Factory
+        )
+        memo[id(provider)] = kind(cls, *args, **kwargs)
+    return memo[id(provider)]
+
+
+def per_request(provider: providers.Provider) -> object:
+    # Каждый запрос — в своём контексте, как задача uvicorn.
+    return contextvars.Context().run(provider)
+
+
+def allocated(provider: providers.Provider) -> float:
+    """Байт памяти, удерживаемой графом одного запроса."""
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    graphs = [per_request(provider) for _ in range(ALLOCATION_ROUNDS)]
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del graphs
+    return (after - before) / ALLOCATION_ROUNDS
+
+
+def main() -> None:
+    memo: dict[int, providers.Provider] = {}
+    for route in ROUTES:
+        singleton = getattr(container, route)
+        factory = as_factory(singleton, memo)
+        singleton()  # сборка при старте
+        for label, provider in (("factory", factory), ("singleton", singleton)):
+            rate = measure(lambda provider=provider: per_request(provider))
+            print(
+                f"{route:>24} {label:>9}: {rate:>10.0f} resolutions/s, "
+                f"{allocated(provider):>8.0f} B/request"
+            )
+
+
+if __name__ == "__main__":
+    main()
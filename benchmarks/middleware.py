@@ -0,0 +1,64 @@
+"""
+Пропускная способность GET /posts/ с credentials middleware на BaseHTTPMiddleware
+(как было) и на чистом ASGI. Нужны Redis и MongoDB из конфига: лента отдаётся
+из кеша, поэтому меряем в основном накладные расходы слоёв.
+
+    python -m benchmarks.middleware
+"""
+
+import asyncio
+from collections.abc import Awaitable, Callable
+
+from benchmarks.common import measure_async, setup_env
+
+setup_env()
+
+import httpx
+from fastapi import FastAPI
+from starlette.requests import Request
+from starlette.responses import Response
+
+from src.container import container
+from src.context import CredentialsHolder
+from src.presentation.http.middlewares import (
+    CredentialsMiddleware,
+    credentials_cookies,
+)
+from src.presentation.http.posts.router import router as posts_router
+
+
+async def base_http_credentials(
+    request: Request, call_next: Callable[[Request], Awaitable[Response]]
+) -> Response:
+    request.state.creds_holder = CredentialsHolder()
+    response = await call_next(request)
+    if creds := request.state.creds_holder.credentials:
+        response.raw_headers.extend(credentials_cookies(creds))
+    return response
+
+
+def build_app(pure_asgi: bool) -> FastAPI:
+    app = FastAPI()
+    app.include_router(posts_router)
+    if pure_asgi:
+        app.add_middleware(CredentialsMiddleware)
+    else:
+        app.middleware("http")(base_http_credentials)
+    return app
+
+
+async def main() -> None:
+    # Приложение собирается без src.main, поэтому роутер связываем здесь.
+    container.wire(modules=["src.presentation.http.posts.router"])
+    for label, pure_asgi in (("BaseHTTPMiddleware", False), ("pure ASGI", True)):
+        transport = httpx.ASGITransport(app=build_app(pure_asgi))
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://bench"
+        ) as client:
+            await client.get("/posts/")  # прогрев кеша ленты
+            rps = await measure_async(lambda: client.get("/posts/"), seconds=5)
+        print(f"{label:>18}: {rps:>8.0f} req/s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,63 @@
+"""
+Задержка, которую RateLimitMiddleware добавляет к запросу: проверка в Redis на
+каждый запрос и аренда квоты пачками (нужен Redis из DEV_REDIS_URL).
+
+    python -m benchmarks.rate_limit
+"""
+
+import asyncio
+
+from benchmarks.common import measure_async, setup_env
+
+setup_env()
+
+from redis.asyncio import Redis
+from starlette.types import Message, Receive, Scope, Send
+
+from src.config import CONFIG
+from src.infrastructure.rate_limit import LeasedRateLimiter, RedisRateLimiter
+from src.presentation.http.middlewares import RateLimitMiddleware
+
+SCOPE: Scope = {
+    "type": "http",
+    "method": "GET",
+    "path": "/",
+    "headers": [],
+    "client": ("10.0.0.1", 40000),
+}
+
+
+async def app(scope: Scope, receive: Receive, send: Send) -> None:
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+
+async def receive() -> Message:
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def send(message: Message) -> None:
+    pass
+
+
+async def main() -> None:
+    redis = Redis.from_url(CONFIG.DEV_REDIS_URL, decode_responses=True)
+    # Лимит с запасом: меряем стоимость проверки, а не ответы 429.
+    limiter = RedisRateLimiter(redis, limit=10**9, period=1)
+    variants = {
+        "redis": limiter,
+        "leased x100": LeasedRateLimiter(limiter, lease_size=100),
+    }
+
+    bare_rps = await measure_async(lambda: app(SCOPE, receive, send))
+    print(f"{'bare app':>12}: {bare_rps:>10.0f} req/s")
+    for label, variant in variants.items():
+        limited = RateLimitMiddleware(app, limiter=variant)
+        rps = await measure_async(lambda limited=limited: limited(SCOPE, receive, send))
+        added = (1 / rps - 1 / bare_rps) * 1e6
+        print(f"{label:>12}: {rps:>10.0f} req/s, +{added:.1f} µs/request")
+    await redis.aclose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
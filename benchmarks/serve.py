@@ -0,0 +1,97 @@
+"""
+Сравнение под нагрузкой locust: uvicorn по умолчанию (один процесс) против
+python -m src.serve. Нужны Redis, MongoDB и Postgres из конфига и .env.
+
+    python -m benchmarks.serve --users 500 --duration 30s
+"""
+
+import argparse
+import csv
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from pathlib import Path
+
+SETUPS = {
+    "uvicorn default": [sys.executable, "-m", "uvicorn", "src.main:app"],
+    "src.serve": [sys.executable, "-m", "src.serve"],
+}
+
+
+def wait_ready(url: str, timeout: float = 30) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            urllib.request.urlopen(url, timeout=1)
+            return
+        except OSError:
+            time.sleep(0.5)
+    raise TimeoutError(f"{url} is not ready")
+
+
+def run_locust(host: str, users: int, duration: str) -> dict[str, str]:
+    prefix = Path(tempfile.mkdtemp(prefix="locust_")) / "stats"
+    subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "locust",
+            "-f",
+            "locustfile.py",
+            "--headless",
+            "--only-summary",
+            f"--users={users}",
+            f"--spawn-rate={max(1, users // 10)}",
+            f"--run-time={duration}",
+            f"--host={host}",
+            f"--csv={prefix}",
+        ],
+        check=True,
+        stdout=subprocess.DEVNULL,
+    )
+    with open(f"{prefix}_stats.csv") as f:
+        return next(row for row in csv.DictReader(f) if row["Name"] == "Aggregated")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--duration", default="30s")
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args()
+
+    host = f"http://127.0.0.1:{args.port}"
+    # Вся нагрузка идёт с одного IP: лимиты снимаем, иначе меряем ответы 429.
+    unlimited = {"limit": 10**9, "period": 1}
+    env = {
+        **os.environ,
+        "SERVER_HOST": "127.0.0.1",
+        "SERVER_PORT": str(args.port),
+        "RATE_LIMIT_LIMIT": str(10**9),
+        "RATE_LIMIT_POLICIES": json.dumps(
+            {name: unlimited for name in ("auth", "feed", "vote", "comment")}
+        ),
+    }
+    for label, command in SETUPS.items():
+        if command[-1] == "src.main:app":
+            command = [*command, "--host=127.0.0.1", f"--port={args.port}"]
+        server = subprocess.Popen(command, env=env, stdout=subprocess.DEVNULL)
+        try:
+            wait_ready(f"{host}/")
+            stats = run_locust(host, args.users, args.duration)
+        finally:
+            server.terminate()
+            server.wait()
+        print(
+            f"{label:>16}: {float(stats['Requests/s']):>8.1f} req/s, "
+            f"p50 {stats['50%']} ms, p95 {stats['95%']} ms, "
+            f"failures {stats['Failure Count']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Скорость подписи и проверки JWT для RS256, ES256 и EdDSA.
+
+    python -m benchmarks.signing
+"""
+
+from datetime import UTC, datetime
+
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
+
+from benchmarks.common import measure, setup_env, write_key_pair
+
+keys_dir = setup_env()
+
+from src.domain.entities.user import RolesEnum, User
+from src.infrastructure.hashing import BcryptHasher
+from src.infrastructure.keys import JwtKeyManager
+from src.infrastructure.services.auth import JwtAuthService
+from src.infrastructure.token_cache import VerifiedTokenCache
+
+PRIVATE_KEYS = {
+    "RS256": rsa.generate_private_key(public_exponent=65537, key_size=2048),
+    "ES256": ec.generate_private_key(ec.SECP256R1()),
+    "EdDSA": ed25519.Ed25519PrivateKey.generate(),
+}
+
+
+def main() -> None:
+    user = User(
+        id=1,
+        created_at=datetime.now(UTC),
+        email="bench@example.com",
+        password=b"",
+        username="bench",
+        role=RolesEnum.USER,
+    )
+    for algorithm, private_key in PRIVATE_KEYS.items():
+        private_path = write_key_pair(keys_dir, algorithm.lower(), private_key)
+        public_path = private_path.with_name(f"{algorithm.lower()}_public.pem")
+        keys = JwtKeyManager(private_path, [public_path], algorithm=algorithm)  # type: ignore[arg-type]
+        service = JwtAuthService(
+            auth_repo=None,  # type: ignore[arg-type]
+            keys=keys,
+            token_cache=VerifiedTokenCache(maxsize=0),
+            hasher=BcryptHasher(),
+        )
+        token = service.create_access_token(user).token
+        sign = measure(lambda service=service: service.create_access_token(user))
+        verify = measure(
+            lambda service=service, token=token: service.decode_token(token)
+        )
+        print(f"{algorithm:>6}: sign {sign:>9.0f}/s  verify {verify:>9.0f}/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+Холодный старт воркера: самые дорогие пакеты при импорте src.main по
+-X importtime (модули верхнего уровня src.* и сторонние пакеты) и время
+от запуска процесса до первого ответа. Для второго замера нужны Redis, MongoDB
+и Postgres из конфига и .env (lifespan открывает пулы до первого запроса).
+
+    python -m benchmarks.startup --top 20
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+import urllib.request
+
+from benchmarks.common import setup_env
+from benchmarks.serve import SETUPS
+
+setup_env()
+
+
+def package_of(name: str) -> str:
+    """Группа модуля: src.<модуль верхнего уровня> или пакет верхнего уровня."""
+    parts = name.split(".")
+    return ".".join(parts[:2]) if parts[0] == "src" else parts[0]
+
+
+def parse_import_times(stderr: str) -> list[tuple[int, int, int, str]]:
+    """Строки -X importtime: (глубина, self мкс, cumulative мкс, модуль)."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|")
+        # Верхний уровень — с одним пробелом, каждый уровень вложенности — ещё два.
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        rows.append((depth, int(self_us), int(cumulative_us), name.strip()))
+    return rows
+
+
+def package_times(
+    rows: list[tuple[int, int, int, str]],
+) -> dict[str, tuple[int, int]]:
+    """
+    (self мкс, cumulative мкс) по пакетам. cumulative складывается только по
+    внешним импортам пакета — вложенные в него самого уже в них учтены.
+    """
+    times: dict[str, tuple[int, int]] = {}
+    # importtime печатает модуль после его зависимостей; в обратном порядке
+    # родитель идёт раньше детей, и stack[:depth] — его предки.
+    stack: list[str] = []
+    for depth, self_us, cumulative_us, name in reversed(rows):
+        package = package_of(name)
+        del stack[depth:]
+        total_self, total_cumulative = times.get(package, (0, 0))
+        if package not in stack:
+            total_cumulative += cumulative_us
+        times[package] = (total_self + self_us, total_cumulative)
+        stack.append(package)
+    return times
+
+
+def import_times(module: str) -> tuple[int, dict[str, tuple[int, int]]]:
+    """cumulative мкс импорта module и (self, cumulative) мкс его пакетов."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        env=os.environ,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    rows = parse_import_times(result.stderr)
+    total = next(cumulative for depth, _, cumulative, name in rows if name == module)
+    packages = package_times(rows)
+    # Сам module — это total.
+    packages.pop(package_of(module), None)
+    return total, packages
+
+
+def time_to_first_request(command: list[str], url: str, timeout: float = 60) -> float:
+    """Секунд от запуска сервера до первого успешного ответа."""
+    started = time.perf_counter()
+    server = subprocess.Popen(command, stdout=subprocess.DEVNULL)
+    try:
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            try:
+                urllib.request.urlopen(url, timeout=1)
+                return time.perf_counter() - started
+            except OSError:
+                time.sleep(0.01)
+        raise TimeoutError(f"{url} is not ready")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--module", default="src.main")
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--skip-server", action="store_true")
+    args = parser.parse_args()
+
+    total, packages = import_times(args.module)
+    print(f"import {args.module}: {total / 1000:.1f} ms")
+    ranked = sorted(packages.items(), key=lambda item: -item[1][1])
+    for name, (self_us, cumulative_us) in ranked[: args.top]:
+        print(
+            f"{name:>40}: {cumulative_us / 1000:>8.1f} ms "
+            f"(self {self_us / 1000:.1f} ms)"
+        )
+    if args.skip_server:
+        return
+
+    os.environ.update(
+        {
+            "SERVER_HOST": "127.0.0.1",
+            "SERVER_PORT": str(args.port),
+            "SERVER_WORKERS": "1",
+        }
+    )
+    for label, command in SETUPS.items():
+        if command[-1] == "src.main:app":
+            command = [*command, "--host=127.0.0.1", f"--port={args.port}"]
+        seconds = time_to_first_request(command, f"http://127.0.0.1:{args.port}/")
+        print(f"{label:>16}: first response in {seconds * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Проверок access токена в секунду с кешем проверенных токенов и без него.
+
+    python -m benchmarks.token_cache
+"""
+
+import asyncio
+from datetime import UTC, datetime
+
+from benchmarks.common import measure_async, setup_env
+
+setup_env()
+
+from src.config import CONFIG
+from src.domain.entities.user import RolesEnum, User
+from src.infrastructure.credentials import JwtCredentials
+from src.infrastructure.hashing import BcryptHasher
+from src.infrastructure.keys import JwtKeyManager
+from src.infrastructure.services.auth import JwtAuthService
+from src.infrastructure.token_cache import VerifiedTokenCache
+
+
+async def main() -> None:
+    keys = JwtKeyManager(CONFIG.JWT_PRIVATE_KEY, [CONFIG.JWT_PUBLIC_KEY])
+    user = User(
+        id=1,
+        created_at=datetime.now(UTC),
+        email="bench@example.com",
+        password=b"",
+        username="bench",
+        role=RolesEnum.USER,
+    )
+    for maxsize in (0, CONFIG.ACCESS_TOKEN_CACHE_SIZE):
+        cache = VerifiedTokenCache(maxsize=maxsize)
+        service = JwtAuthService(
+            auth_repo=None,  # type: ignore[arg-type]
+            keys=keys,
+            token_cache=cache,
+            hasher=BcryptHasher(),
+        )
+        credentials = JwtCredentials(
+            authorize=service.create_access_token(user).token, authenticate=""
+        )
+        rps = await measure_async(
+            lambda service=service, credentials=credentials: service.authorize(
+                credentials=credentials, device_id="bench"
+            )
+        )
+        label = "with cache" if maxsize else "without cache"
+        print(f"{label:>14}: {rps:>10.0f} authorize/s  {cache.stats()}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,22 +1,43 @@
 import logging
-from typing import TypeVar, Generic
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, TypeVar, Generic
 
+from src.application.interfaces.clients.rate_limit import AbstractRateLimiter
 from src.application.interfaces.credentials import Credentials
 from src.application.interfaces.services.auth import AbstractAuthService
 from src.application.interfaces.unit_of_work import AbstractUnitOfWork
 from src.application.usecases.abs import AbstractUseCase
 from src.context import CredentialsHolder
-from src.domain.entities.user import RolesEnum
+from src.domain.entities.user import RolesEnum, User
 from src.domain.exceptions.auth import TokenError, AccessDeniedError
+from src.domain.exceptions.base import RateLimitExceededError
 from src.domain.filters.users import UserFilter
 from src.domain.value_objects.auth import AuthorizationContext
+from src.timing import span
 
 logger = logging.getLogger(__name__)
 
-U = TypeVar("U", bound=AbstractUseCase)
+# None — guard без use case (только авторизация, как у /batch).
+U = TypeVar("U", bound=AbstractUseCase | None)
 
 
 class UseCaseGuard(Generic[U]):
+    """
+    Проверяет роль перед выполнением use case.
+
+    lazy — режим для публичных (GUEST) маршрутов: access токен проверяется
+    (обычно из кеша проверенных токенов), но истёкший или невалидный токен не
+    продлевается, а запрос обслуживается как гостевой. Обмен refresh токена с
+    походом в Postgres и Redis остаётся маршрутам, которым нужна авторизация.
+
+    Guard не хранит состояния запроса: один объект на маршрут собирается при
+    старте, а данные запроса передаются аргументами вызова.
+
+    Без use case guard только авторизует — так /batch проверяет токен один раз
+    на пакет, а подзапросы берут готовый контекст из creds_holder и списывают
+    лимиты своих маршрутов.
+    """
+
     def __init__(
         self,
         required_role: RolesEnum,
@@ -24,74 +45,115 @@ class UseCaseGuard(Generic[U]):
         use_case: U,
         uow: AbstractUnitOfWork,
         default_context: AuthorizationContext,
+        lazy: bool = False,
+        rate_limiter: AbstractRateLimiter | None = None,
     ):
+        if lazy and required_role != RolesEnum.GUEST:
+            raise ValueError("Lazy authorization is allowed only for GUEST routes")
         self.required_role = required_role
+        self.lazy = lazy
+        self.rate_limiter = rate_limiter
         self.auth = auth_service
         self.__use_case = use_case
         self.uow = uow
         self.default_context = default_context
-        self.__credentials: None | Credentials = None
-        self.__creds_holder: None | CredentialsHolder = None
-        self.__device_id: None | str = None
 
-    def configure(
+    @asynccontextmanager
+    async def __call__(
         self,
         *,
         credentials: Credentials,
         creds_holder: CredentialsHolder,
         device_id: str,
-    ) -> None:
-        self.__credentials = credentials
-        self.__creds_holder = creds_holder
-        self.__device_id = device_id
-
-    async def __aenter__(self) -> tuple[U, AuthorizationContext, Credentials]:
-        if (
-            self.__credentials is None
-            or self.__creds_holder is None
-            or self.__device_id is None
-        ):
-            raise RuntimeError("AuthDecorator must be configured before use")
+        cost: int = 1,
+    ) -> AsyncIterator[tuple[U, AuthorizationContext, Credentials]]:
+        # Внешняя граница единицы работы запроса: вложенные входы в use case
+        # и сервисах переиспользуют уже открытые сессии.
+        async with self.uow:
+            with span("guard"):
+                authorized = await self._authorize(
+                    credentials=credentials,
+                    creds_holder=creds_holder,
+                    device_id=device_id,
+                    cost=cost,
+                )
+            yield authorized
+
+    async def _authorize(
+        self,
+        credentials: Credentials,
+        creds_holder: CredentialsHolder,
+        device_id: str,
+        cost: int = 1,
+    ) -> tuple[U, AuthorizationContext, Credentials]:
+        if creds_holder.context is not None:
+            # Подзапрос пакета: токен проверен на весь пакет, а лимит
+            # списывается по политике самого маршрута.
+            self._check_role(creds_holder.context)
+            await self._check_rate_limit(creds_holder.context, device_id, cost)
+            return self.__use_case, creds_holder.context, credentials
         try:
             context = await self.auth.authorize(
-                credentials=self.__credentials, device_id=self.__device_id
+                credentials=credentials, device_id=device_id
             )
         except TokenError:
+            if self.lazy:
+                await self._check_rate_limit(self.default_context, device_id, cost)
+                return self.__use_case, self.default_context, credentials
             try:
                 new_credentials = await self._try_renew_creds(
-                    credentials=self.__credentials
+                    credentials=credentials, device_id=device_id
                 )
                 context = await self.auth.authorize(
-                    credentials=new_credentials, device_id=self.__device_id
+                    credentials=new_credentials, device_id=device_id
                 )
-                self.__creds_holder.credentials = new_credentials
+                creds_holder.credentials = new_credentials
             except TokenError:
                 logger.warning("Access denied: no token found")
                 context = self.default_context
+        self._check_role(context)
+        # Маршруты пользователей не ждут истечения токена после смены пароля,
+        # роли или удаления: отозванный токен получает 403 сразу.
+        if RolesEnum.GUEST < self.required_role and await self.auth.is_revoked(context):
+            raise AccessDeniedError("Access denied: token has been revoked")
+        await self._check_rate_limit(context, device_id, cost)
+        credentials = creds_holder.credentials or credentials
+
+        return self.__use_case, context, credentials
+
+    def _check_role(self, context: AuthorizationContext) -> None:
+        if not context.role < self.required_role:
+            return
         message = f"Access denied: required {self.required_role.name} or higher, got {context.role.name}"
         if context.role == RolesEnum.GUEST:
             message += " (possibly due to an invalid or expired token)"
-        if context.role < self.required_role:
-            raise AccessDeniedError(message)
-        credentials = self.__creds_holder.credentials or self.__credentials
-
-        return self.__use_case, context, credentials
+        raise AccessDeniedError(message)
 
-    async def __aexit__(self, exc_type, exc, tb):  # type: ignore
-        self.__credentials = None
-        self.__creds_holder = None
+    async def _check_rate_limit(
+        self, context: AuthorizationContext, device_id: str, cost: int = 1
+    ) -> None:
+        """Лимит маршрута: по пользователю, а для гостя — по IP."""
+        if self.rate_limiter is None:
+            return
+        if context.user_id is not None:
+            key = f"user:{context.user_id}"
+        else:
+            key = f"ip:{device_id}"
+        result = await self.rate_limiter.hit(key, cost)
+        if not result.allowed:
+            raise RateLimitExceededError(
+                limit=result.limit, retry_after=result.retry_after
+            )
 
-    async def _try_renew_creds(self, credentials: Credentials) -> Credentials:
-        user_id = self.auth.get_subject_id(credentials=credentials)
-        if not user_id:
-            raise TokenError("Missing user id")
-        async with self.uow as uow:
-            user = await uow.users.get_user(UserFilter(id=user_id))
-            if user is None:
-                raise TokenError("User not found")
-        credentials = await self.auth.renew_credentials(
+    async def _try_renew_creds(
+        self, credentials: Credentials, device_id: str
+    ) -> Credentials:
+        return await self.auth.renew_credentials(
             credentials=credentials,
-            user=user,
-            device_id=self.__device_id if self.__device_id else "*",
+            device_id=device_id or "*",
+            get_user=self._get_user,
         )
-        return credentials
+
+    async def _get_user(self, user_id: int) -> User | None:
+        async with self.uow as uow:
+            return await uow.users.get_user(UserFilter(id=user_id))
@@ -26,6 +26,17 @@ class AbstractCacheClient(ABC):
     async def get(self, key: str) -> cache | None:
         raise NotImplementedError
 
+    @abstractmethod
+    async def get_many(self, *keys: str) -> list[dict[str, Any] | None]:
+        """Получить несколько JSON объектов за один запрос (в порядке keys)."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def set_many(
+        self, items: dict[str, dict[str, Any]], expiration: int | None = None
+    ) -> None:
+        raise NotImplementedError
+
     @abstractmethod
     async def delete(self, *keys: str) -> None:
         raise NotImplementedError
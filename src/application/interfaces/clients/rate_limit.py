@@ -0,0 +1,19 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class RateLimitResult:
+    allowed: bool
+    limit: int
+    remaining: int
+    retry_after: float  # секунд до следующего разрешённого запроса
+    reset_after: float  # секунд до полного восстановления лимита
+
+
+class AbstractRateLimiter(ABC):
+    limit: int
+
+    @abstractmethod
+    async def hit(self, key: str, cost: int = 1) -> RateLimitResult:
+        raise NotImplementedError
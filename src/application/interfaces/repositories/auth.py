@@ -26,6 +26,60 @@ class AbstractAuthRepository(ABC):
     async def delete(self, subject_id: str, device_id: str) -> bool:
         raise NotImplementedError
 
+    @abstractmethod
+    async def delete_one(
+        self, subject: str, credentials_id: str, device_id: str
+    ) -> bool:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def lock_rotation(
+        self, subject: str, credentials_id: str, timeout: float
+    ) -> str | None:
+        """
+        Захватить ротацию refresh токена. Возвращает токен владельца блокировки;
+        None — её уже выполняет другой запрос.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def unlock_rotation(
+        self, subject: str, credentials_id: str, token: str
+    ) -> None:
+        """Снять блокировку, если её держит владелец token."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def is_rotation_locked(self, subject: str, credentials_id: str) -> bool:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def save_rotated(
+        self,
+        subject: str,
+        credentials_id: str,
+        device_id: str,
+        credentials: str,
+        expiration: int,
+    ) -> None:
+        """Запомнить пару, выданную взамен credentials_id, на expiration секунд."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_rotated(
+        self, subject: str, credentials_id: str, device_id: str
+    ) -> str | None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def revoke(self, subject: str, revoked_at: float, expiration: int) -> None:
+        """Отозвать все токены субъекта, выпущенные до revoked_at."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def revoked_at(self, subject: str) -> float | None:
+        raise NotImplementedError
+
     @abstractmethod
     async def register(
         self,
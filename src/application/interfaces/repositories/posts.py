@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Literal
+from typing import Any, Literal
 
 from src.domain.entities.post import Post, Comment
 
@@ -11,9 +11,24 @@ class AbstractPostsRepository(ABC):
         last_id: str | None = None,
         limit: int = 20,
         sort: Literal["asc", "desc"] = "desc",
+        stale_ok: bool = False,
     ) -> tuple[list[Post], bool]:
         raise NotImplementedError
 
+    @abstractmethod
+    async def get_sparse_posts(
+        self,
+        fields: frozenset[str],
+        last_id: str | None = None,
+        limit: int = 20,
+        stale_ok: bool = False,
+    ) -> tuple[list[dict[str, Any]], bool]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_post(self, post_id: str, stale_ok: bool = False) -> Post | None:
+        raise NotImplementedError
+
     @abstractmethod
     async def create_post(self, post: Post) -> Post:
         raise NotImplementedError
@@ -33,6 +48,7 @@ class AbstractPostsRepository(ABC):
         last_id: str | None = None,
         limit: int = 10,
         sort: Literal["asc", "desc"] = "desc",
+        stale_ok: bool = False,
     ) -> tuple[list[Comment], bool] | None:
         raise NotImplementedError
 
@@ -59,5 +75,6 @@ class AbstractPostsRepository(ABC):
         last_id: str | None = None,
         limit: int = 10,
         sort: Literal["asc", "desc"] = "desc",
+        stale_ok: bool = False,
     ) -> tuple[list[Comment], bool]:
         raise NotImplementedError
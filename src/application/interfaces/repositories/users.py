@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
+from typing import Sequence
 
-from src.domain.entities.user import User
+from src.domain.entities.user import User, Author, RolesEnum
 from src.domain.filters.users import UserFilter
 
 
@@ -15,6 +16,11 @@ class AbstractUsersRepository(ABC):
         """Получить пользователя по фильтру (одного)"""
         raise NotImplementedError
 
+    @abstractmethod
+    async def get_authors(self, user_ids: Sequence[int]) -> dict[int, Author]:
+        """Получить проекции авторов по списку id одним запросом"""
+        raise NotImplementedError
+
     @abstractmethod
     async def delete(self, user_filter: UserFilter) -> bool:
         """Удалить пользователей по фильтру (несколько)"""
@@ -26,3 +32,8 @@ class AbstractUsersRepository(ABC):
     ) -> User:
         """Обновить пользователей по фильтру (несколько)"""
         raise NotImplementedError
+
+    @abstractmethod
+    async def set_role(self, user_filter: UserFilter, role: RolesEnum) -> User | None:
+        """Назначить роль пользователю; None, если его нет"""
+        raise NotImplementedError
@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from typing import Awaitable, Callable
 
 from src.application.interfaces.credentials import Credentials
 from src.application.interfaces.repositories.auth import AbstractAuthRepository
@@ -26,17 +27,43 @@ class AbstractAuthService(ABC):
     ) -> AuthorizationContext:
         raise NotImplementedError
 
-    @staticmethod
     @abstractmethod
-    def hash_password(password: str) -> bytes:
+    async def hash_password(self, password: str) -> bytes:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def check_password(
+        self, user_password: bytes | None, plain_password: str
+    ) -> bool:
+        raise NotImplementedError
+
+    @abstractmethod
+    def needs_rehash(self, password_hash: bytes) -> bool:
+        """Хеш пароля посчитан с устаревшими параметрами и его стоит пересчитать."""
         raise NotImplementedError
 
     @abstractmethod
     async def renew_credentials(
-        self, credentials: Credentials, user: User, device_id: str
+        self,
+        credentials: Credentials,
+        device_id: str,
+        get_user: Callable[[int], Awaitable[User | None]],
     ) -> Credentials:
+        """
+        Обменять refresh токен на новую пару. Пользователь загружается через
+        get_user только тем запросом, который действительно выполняет ротацию.
+        """
         raise NotImplementedError
 
     @abstractmethod
     def get_subject_id(self, credentials: Credentials) -> int:
         raise NotImplementedError
+
+    @abstractmethod
+    async def revoke(self, user_id: int) -> None:
+        """Отозвать все выданные пользователю токены (бан, удаление, смена данных)."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def is_revoked(self, context: AuthorizationContext) -> bool:
+        raise NotImplementedError
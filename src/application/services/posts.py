@@ -1,12 +1,17 @@
-from typing import Annotated
+import asyncio
+from typing import Annotated, Any
 
 from src.application.interfaces.clients.cache import AbstractCacheClient
 from src.application.interfaces.unit_of_work import AbstractUnitOfWork
 from src.config import CONFIG
-from src.domain.entities.post import Post, Comment
+from src.domain.entities.post import Post, Comment, make_excerpt
 
 HasNext = Annotated[bool, "has_next"]
 
+# Префикс ключей для чтений с вторичных узлов (stale_ok): отставшие данные не
+# должны попадать к тем, кто читает с primary и ждёт своих записей.
+STALE_PREFIX = "stale:"
+
 
 class PostsService:
     def __init__(self, uow: AbstractUnitOfWork, cache_client: AbstractCacheClient):
@@ -29,6 +34,51 @@ class PostsService:
     def posts_key(*, last_id: str = "*", limit: str | None = "*") -> str:
         return f"posts:{last_id}:{limit}"
 
+    @staticmethod
+    def post_key(post_id: str) -> str:
+        # Не попадает под шаблон ленты posts:*:* и сбрасывается точечно.
+        return f"post:{post_id}"
+
+    @classmethod
+    def post_keys(cls, post_id: str) -> tuple[str, str]:
+        """Ключ поста и его копия чтения с вторичного узла — сбрасываются вместе."""
+        return cls.post_key(post_id), STALE_PREFIX + cls.post_key(post_id)
+
+    @staticmethod
+    def sparse_posts_key(
+        *, fields: frozenset[str], last_id: str | None, limit: int
+    ) -> str:
+        # Под шаблон posts_key(), поэтому сбрасывается вместе с полной лентой.
+        return f"posts:{last_id}:{limit}:{','.join(sorted(fields))}"
+
+    @staticmethod
+    def cache_key(key: str, stale_ok: bool) -> str:
+        return STALE_PREFIX + key if stale_ok else key
+
+    async def _matching_keys(self, *patterns: str) -> list[str]:
+        """
+        Ключи по шаблонам вместе с их копиями чтений с вторичных узлов.
+        Обходы (SCAN) по всем шаблонам идут параллельно.
+        """
+        found = await asyncio.gather(
+            *(
+                self.cache_client.keys(prefix + pattern)
+                for pattern in patterns
+                for prefix in ("", STALE_PREFIX)
+            )
+        )
+        return [key for keys in found for key in keys]
+
+    async def _cache(
+        self, key: str, data: Any, expiration: int, stale_ok: bool
+    ) -> None:
+        """Запись в кеш; чтения с вторичных узлов — на короткий срок."""
+        if stale_ok:
+            expiration = min(expiration, CONFIG.STALE_CACHE_EXPIRE_SECONDS)
+            if not expiration:
+                return
+        await self.cache_client.set(key=key, data=data, expiration=expiration)
+
     async def __aenter__(self) -> None:
         await self.uow.__aenter__()
 
@@ -36,60 +86,108 @@ class PostsService:
         await self.uow.__aexit__(exc_type, exc, tb)
 
     async def get_posts(
-        self, last_id: str | None = None, limit: int = 20
+        self, last_id: str | None = None, limit: int = 20, stale_ok: bool = False
     ) -> tuple[list[Post], HasNext] | None:
-        if cached := await self.cache_client.get(f"posts:{last_id}:{limit}"):
+        key = self.cache_key(f"posts:{last_id}:{limit}", stale_ok)
+        if cached := await self.cache_client.get(key):
             posts = cached["data"]
             has_next = cached["has_next"]
             return [Post.from_dict(post) for post in posts], has_next  # type: ignore
 
-        posts, has_next = await self.uow.posts.get_posts(last_id=last_id, limit=limit)  # type: ignore
+        posts, has_next = await self.uow.posts.get_posts(  # type: ignore
+            last_id=last_id, limit=limit, stale_ok=stale_ok
+        )
 
-        await self.cache_client.set(
-            key=f"posts:{last_id}:{limit}",
+        await self._cache(
+            key=key,
             data={"data": [post.to_dict() for post in posts], "has_next": has_next},  # type: ignore
             expiration=CONFIG.POSTS_CACHE_EXPIRE_SECONDS,
+            stale_ok=stale_ok,
         )
 
         return posts, has_next  # type: ignore
 
+    async def get_post(self, post_id: str, stale_ok: bool = False) -> Post | None:
+        key = self.cache_key(self.post_key(post_id), stale_ok)
+        if cached := await self.cache_client.get(key):
+            return Post.from_dict(cached)  # type: ignore
+        post = await self.uow.posts.get_post(post_id=post_id, stale_ok=stale_ok)
+        if post is not None:
+            await self._cache(
+                key=key,
+                data=post.to_dict(),
+                expiration=CONFIG.POSTS_CACHE_EXPIRE_SECONDS,
+                stale_ok=stale_ok,
+            )
+        return post
+
+    async def get_sparse_posts(
+        self,
+        fields: frozenset[str],
+        last_id: str | None = None,
+        limit: int = 20,
+        stale_ok: bool = False,
+    ) -> tuple[list[dict[str, Any]], HasNext]:
+        key = self.cache_key(
+            self.sparse_posts_key(fields=fields, last_id=last_id, limit=limit),
+            stale_ok,
+        )
+        if cached := await self.cache_client.get(key):
+            return cached["data"], cached["has_next"]  # type: ignore
+        posts, has_next = await self.uow.posts.get_sparse_posts(
+            fields=fields, last_id=last_id, limit=limit, stale_ok=stale_ok
+        )
+        await self._cache(
+            key=key,
+            data={"data": posts, "has_next": has_next},
+            expiration=CONFIG.POSTS_CACHE_EXPIRE_SECONDS,
+            stale_ok=stale_ok,
+        )
+        return posts, has_next
+
     async def create_post(self, post: Post) -> Post:
+        post.excerpt = make_excerpt(post.content, CONFIG.POST_EXCERPT_LENGTH)
         return await self.uow.posts.create_post(post=post)
 
     async def like_post(self, post_id: str, user_id: int) -> bool:
         res = await self.uow.posts.like_post(post_id=post_id, user_id=user_id)
         if res:
-            key = self.posts_key()
-            keys = await self.cache_client.keys(key)
-            await self.cache_client.delete(*keys)
+            keys = await self._matching_keys(self.posts_key())
+            await self.cache_client.delete(*self.post_keys(post_id), *keys)
         return res
 
     async def dislike_post(self, post_id: str, user_id: int) -> bool:
         res = await self.uow.posts.dislike_post(post_id=post_id, user_id=user_id)
         if res:
-            key = self.posts_key()
-            keys = await self.cache_client.keys(key)
-            await self.cache_client.delete(*keys)
+            keys = await self._matching_keys(self.posts_key())
+            await self.cache_client.delete(*self.post_keys(post_id), *keys)
         return res
 
     async def get_comments(
-        self, post_id: str, last_id: str | None = None, limit: int = 10
+        self,
+        post_id: str,
+        last_id: str | None = None,
+        limit: int = 10,
+        stale_ok: bool = False,
     ) -> tuple[list[Comment], HasNext] | None:
-        key = self.comments_key(post_id=post_id, last_id=last_id, limit=limit)
+        key = self.cache_key(
+            self.comments_key(post_id=post_id, last_id=last_id, limit=limit), stale_ok
+        )
         if cached := await self.cache_client.get(key):
             comments = cached["data"]
             has_next = cached["has_next"]
             return [Comment.from_dict(comment) for comment in comments], has_next  # type: ignore
         comments, has_next = await self.uow.posts.get_comments(  # type: ignore
-            post_id=post_id, last_id=last_id, limit=limit
+            post_id=post_id, last_id=last_id, limit=limit, stale_ok=stale_ok
         )
-        await self.cache_client.set(
+        await self._cache(
             key=key,
             data={
                 "data": [comment.to_dict() for comment in comments],  # type: ignore
                 "has_next": has_next,
             },  # noqa
             expiration=CONFIG.COMMENTS_CACHE_EXPIRE_SECONDS,
+            stale_ok=stale_ok,
         )
 
         return comments, has_next  # type: ignore
@@ -121,44 +219,50 @@ class PostsService:
         if res := await self.uow.posts.create_answer(
             answer=answer, comment_id=comment_id
         ):
-            pattern_c = self.comments_key(post_id=post_id)
-            pattern_a = self.answers_key(parent_id=comment_id)
-            keys_a = await self.cache_client.keys(pattern_c)
-            keys_c = await self.cache_client.keys(pattern_a)
-            keys = keys_a + keys_c
-            await self.cache_client.delete(*keys)
+            # answers_count комментария виден в recent_comments поста и ленты.
+            keys = await self._matching_keys(
+                self.comments_key(post_id=post_id),
+                self.answers_key(parent_id=comment_id),
+                self.posts_key(),
+            )
+            await self.cache_client.delete(*self.post_keys(post_id), *keys)
         return res
 
     async def get_answers(
-        self, comment_id: str, last_id: str | None = None, limit: int = 10
+        self,
+        comment_id: str,
+        last_id: str | None = None,
+        limit: int = 10,
+        stale_ok: bool = False,
     ) -> tuple[list[Comment], HasNext] | None:
-        key = self.answers_key(parent_id=comment_id, last_id=last_id, limit=limit)
+        key = self.cache_key(
+            self.answers_key(parent_id=comment_id, last_id=last_id, limit=limit),
+            stale_ok,
+        )
         if cached := await self.cache_client.get(key):
             answers = cached["data"]
             has_next = cached["has_next"]
             return [Comment.from_dict(comment) for comment in answers], has_next  # type: ignore
 
         answers, has_next = await self.uow.posts.get_answers(  # type: ignore
-            comment_id=comment_id, last_id=last_id, limit=limit
+            comment_id=comment_id, last_id=last_id, limit=limit, stale_ok=stale_ok
         )
 
-        await self.cache_client.set(
+        await self._cache(
             key=key,
             data={
                 "data": [answer.to_dict() for answer in answers],  # type: ignore
                 "has_next": has_next,
             },  # noqa
             expiration=CONFIG.COMMENTS_CACHE_EXPIRE_SECONDS,
+            stale_ok=stale_ok,
         )
 
         return answers, has_next  # type: ignore
 
     async def _clear_cache(self, post_id: str, with_answers: bool = False) -> None:
-        key_c = self.comments_key(post_id=post_id)
-        keys = await self.cache_client.keys(key_c)
-        key_p = self.posts_key()
-        keys.extend(await self.cache_client.keys(key_p))
+        patterns = [self.comments_key(post_id=post_id), self.posts_key()]
         if with_answers:
-            key_a = self.answers_key()
-            keys.extend(await self.cache_client.keys(key_a))
-        await self.cache_client.delete(*keys)
+            patterns.append(self.answers_key())
+        keys = await self._matching_keys(*patterns)
+        await self.cache_client.delete(*self.post_keys(post_id), *keys)
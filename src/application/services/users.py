@@ -0,0 +1,65 @@
+from typing import Sequence
+
+from src.application.interfaces.clients.cache import AbstractCacheClient
+from src.application.interfaces.unit_of_work import AbstractUnitOfWork
+from src.config import CONFIG
+from src.domain.entities.user import Author, User
+from src.domain.filters.users import UserFilter
+
+
+class UsersService:
+    def __init__(self, uow: AbstractUnitOfWork, cache_client: AbstractCacheClient):
+        self.uow = uow
+        self.cache_client = cache_client
+
+    @staticmethod
+    def profile_key(user_id: int | str = "*") -> str:
+        # Значение — Author.to_dict() без обёртки data/has_next.
+        return f"author:{user_id}"
+
+    async def get_author(self, user_id: int) -> Author | None:
+        return (await self.get_authors([user_id])).get(user_id)
+
+    async def get_authors(self, user_ids: Sequence[int]) -> dict[int, Author]:
+        """Авторы по id: один MGET в кеш и один IN (...) в БД на промахи."""
+        ids = list(dict.fromkeys(user_ids))
+        if not ids:
+            return {}
+        cached = await self.cache_client.get_many(*map(self.profile_key, ids))
+        authors = {
+            user_id: Author.from_dict(item)
+            for user_id, item in zip(ids, cached)
+            if item
+        }
+        if missing := [user_id for user_id in ids if user_id not in authors]:
+            async with self.uow as uow:
+                loaded = await uow.users.get_authors(missing)
+            await self.cache_client.set_many(
+                {
+                    self.profile_key(user_id): author.to_dict()
+                    for user_id, author in loaded.items()
+                },
+                expiration=CONFIG.PROFILE_CACHE_EXPIRE_SECONDS,
+            )
+            authors.update(loaded)
+        return authors
+
+    async def update(
+        self, user_filter: UserFilter, update_data: dict[str, object]
+    ) -> User:
+        async with self.uow as uow:
+            user = await uow.users.update(user_filter, update_data)
+            await uow.commit()
+        # Только после коммита: иначе параллельное чтение вернёт в кеш старый профиль.
+        await self.cache_client.delete(self.profile_key(user.id))  # type: ignore
+        return user
+
+    async def delete(self, user_filter: UserFilter) -> bool:
+        async with self.uow as uow:
+            user = await uow.users.get_user(user_filter)
+            if user is None:
+                return False
+            res = await uow.users.delete(UserFilter(id=user.id))
+            await uow.commit()
+        await self.cache_client.delete(self.profile_key(user.id))  # type: ignore
+        return res
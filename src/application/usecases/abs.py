@@ -1,7 +1,10 @@
 from abc import ABC, abstractmethod
-
 from src.application.interfaces.services.auth import AbstractAuthService
 from src.application.interfaces.unit_of_work import AbstractUnitOfWork
+from src.application.services.users import UsersService
+from src.domain.entities.user import Author
+from src.domain.filters.users import UserFilter
+from src.domain.value_objects.auth import AuthorizationContext
 
 
 class AbstractUseCase(ABC):
@@ -9,10 +12,37 @@ class AbstractUseCase(ABC):
         self,
         auth: AbstractAuthService,
         uow: AbstractUnitOfWork,
+        users: UsersService | None = None,
     ):
         self.auth = auth
         self.uow = uow
+        self.users = users
 
+    # Реализации оборачивают __call__ в @timed("use_case"): выполнение use case
+    # целиком — спан в Server-Timing и метриках.
     @abstractmethod
     async def __call__(self, *args, **kwargs):  # type: ignore
         raise NotImplementedError
+
+    async def get_author(self, context: AuthorizationContext) -> Author | None:
+        """
+        Автор текущего пользователя. Если токен несёт claims автора — берём их
+        (отзыв токена уже проверил guard маршрута); иначе — из кеша профилей
+        (или из БД).
+        """
+        if context.user_id is None:
+            return None
+        if context.author is not None:
+            return context.author
+        if self.users is not None:
+            return await self.users.get_author(context.user_id)
+        async with self.uow as uow:
+            user = await uow.users.get_user(UserFilter(id=context.user_id))
+        if user is None:
+            return None
+        return Author(
+            id=user.id,  # type: ignore
+            name=user.username,
+            email=user.email,
+            photo_url="Coming soon...",
+        )
@@ -3,6 +3,8 @@ from src.application.interfaces.unit_of_work import AbstractUnitOfWork
 from src.application.services.posts import PostsService, HasNext
 from src.application.usecases.abs import AbstractUseCase
 from src.domain.entities.post import Comment
+from src.domain.value_objects.auth import AuthorizationContext
+from src.timing import timed
 
 
 class GetCommentsUseCase(AbstractUseCase):
@@ -12,10 +14,18 @@ class GetCommentsUseCase(AbstractUseCase):
         super().__init__(auth=auth, uow=uow)
         self.posts = posts
 
+    @timed("use_case")
     async def __call__(
-        self, post_id: str, last_id: str | None = None, limit: int = 20
+        self,
+        post_id: str,
+        context: AuthorizationContext,
+        last_id: str | None = None,
+        limit: int = 20,
     ) -> tuple[list[Comment], HasNext] | None:
         async with self.posts:
             return await self.posts.get_comments(
-                post_id=post_id, last_id=last_id, limit=limit
+                post_id=post_id,
+                last_id=last_id,
+                limit=limit,
+                stale_ok=context.user_id is None,
             )
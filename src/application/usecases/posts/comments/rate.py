@@ -3,19 +3,25 @@ from typing import Literal
 from src.application.interfaces.services.auth import AbstractAuthService
 from src.application.interfaces.unit_of_work import AbstractUnitOfWork
 from src.application.services.posts import PostsService
+from src.application.services.users import UsersService
 from src.application.usecases.abs import AbstractUseCase
 from src.domain.exceptions.auth import AccessDeniedError, SubjectNotFoundError
-from src.domain.filters.users import UserFilter
 from src.domain.value_objects.auth import AuthorizationContext
+from src.timing import timed
 
 
 class RateCommentUseCase(AbstractUseCase):
     def __init__(
-        self, auth: AbstractAuthService, uow: AbstractUnitOfWork, posts: PostsService
+        self,
+        auth: AbstractAuthService,
+        uow: AbstractUnitOfWork,
+        posts: PostsService,
+        users: UsersService,
     ):
-        super().__init__(auth=auth, uow=uow)
+        super().__init__(auth=auth, uow=uow, users=users)
         self.posts = posts
 
+    @timed("use_case")
     async def __call__(
         self,
         mode: Literal["like", "dislike"],
@@ -25,9 +31,7 @@ class RateCommentUseCase(AbstractUseCase):
     ) -> bool:
         if context.user_id is None:
             raise AccessDeniedError("You must be logged in to rate a post")
-        async with self.uow as uow:
-            user = await uow.users.get_user(UserFilter(id=context.user_id))
-        if user is None:
+        if await self.get_author(context) is None:
             raise SubjectNotFoundError("User not found")
 
         async with self.posts:
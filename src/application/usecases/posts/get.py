@@ -1,8 +1,12 @@
+from typing import Any
+
 from src.application.interfaces.services.auth import AbstractAuthService
 from src.application.interfaces.unit_of_work import AbstractUnitOfWork
 from src.application.services.posts import PostsService, HasNext
 from src.application.usecases.abs import AbstractUseCase
 from src.domain.entities.post import Post
+from src.domain.value_objects.auth import AuthorizationContext
+from src.timing import timed
 
 
 class GetPostsUseCase(AbstractUseCase):
@@ -12,8 +16,39 @@ class GetPostsUseCase(AbstractUseCase):
         super().__init__(auth=auth, uow=uow)
         self.posts = posts
 
+    @timed("use_case")
+    async def __call__(
+        self,
+        context: AuthorizationContext,
+        last_id: str | None = None,
+        limit: int = 20,
+        fields: frozenset[str] | None = None,
+    ) -> tuple[list[Post], HasNext] | tuple[list[dict[str, Any]], HasNext] | None:
+        """fields — выбранные поля поста; None — посты целиком."""
+        async with self.posts:
+            # Гостям допустимо слегка устаревшее чтение с реплик.
+            stale_ok = context.user_id is None
+            if fields is not None:
+                return await self.posts.get_sparse_posts(
+                    fields=fields, last_id=last_id, limit=limit, stale_ok=stale_ok
+                )
+            return await self.posts.get_posts(
+                last_id=last_id, limit=limit, stale_ok=stale_ok
+            )
+
+
+class GetPostUseCase(AbstractUseCase):
+    def __init__(
+        self, auth: AbstractAuthService, uow: AbstractUnitOfWork, posts: PostsService
+    ):
+        super().__init__(auth=auth, uow=uow)
+        self.posts = posts
+
+    @timed("use_case")
     async def __call__(
-        self, last_id: str | None = None, limit: int = 20
-    ) -> tuple[list[Post], HasNext] | None:
+        self, context: AuthorizationContext, post_id: str
+    ) -> Post | None:
         async with self.posts:
-            return await self.posts.get_posts(last_id=last_id, limit=limit)
+            return await self.posts.get_post(
+                post_id=post_id, stale_ok=context.user_id is None
+            )
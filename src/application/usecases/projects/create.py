@@ -7,6 +7,7 @@ from src.domain.entities.user import Author
 from src.domain.exceptions.auth import SubjectNotFoundError
 from src.domain.filters.users import UserFilter
 from src.domain.value_objects.auth import AuthorizationContext
+from src.timing import timed
 
 
 class CreateProjectUseCase(AbstractUseCase):
@@ -19,6 +20,7 @@ class CreateProjectUseCase(AbstractUseCase):
         super().__init__(auth=auth, uow=uow)
         self.projects = projects
 
+    @timed("use_case")
     async def __call__(
         self, project: Project, context: AuthorizationContext
     ) -> Project:
@@ -3,6 +3,7 @@ from src.application.interfaces.unit_of_work import AbstractUnitOfWork
 from src.application.services.projects import ProjectsService
 from src.application.usecases.abs import AbstractUseCase
 from src.domain.entities.project import Project
+from src.timing import timed
 
 
 class GetProjectsUseCase(AbstractUseCase):
@@ -15,6 +16,7 @@ class GetProjectsUseCase(AbstractUseCase):
         super().__init__(auth=auth, uow=uow)
         self.projects = projects
 
+    @timed("use_case")
     async def __call__(
         self, offset: int = 0, limit: int = 10
     ) -> tuple[list[Project], bool]:
@@ -0,0 +1,24 @@
+from src.application.usecases.abs import AbstractUseCase
+from src.domain.exceptions.auth import AuthError
+from src.domain.filters.users import UserFilter
+from src.domain.value_objects.auth import AuthorizationContext
+from src.timing import timed
+
+
+class ChangePasswordUseCase(AbstractUseCase):
+    @timed("use_case")
+    async def __call__(
+        self, context: AuthorizationContext, password: str, new_password: str
+    ) -> None:
+        async with self.uow as uow:
+            user = await uow.users.get_user(UserFilter(id=context.user_id))
+            # Соединение не держим на время bcrypt (guard держит единицу работы).
+            await uow.rollback()
+        if user is None or not await self.auth.check_password(user.password, password):
+            raise AuthError()
+        await self.users.update(  # type: ignore[union-attr]
+            UserFilter(id=user.id),
+            {"password": await self.auth.hash_password(new_password)},
+        )
+        # Токены, выданные под старым паролем, больше не принимаются.
+        await self.auth.revoke(user.id)  # type: ignore[arg-type]
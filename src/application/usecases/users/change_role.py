@@ -0,0 +1,18 @@
+from src.application.usecases.abs import AbstractUseCase
+from src.domain.entities.user import RolesEnum, User
+from src.domain.exceptions.auth import SubjectNotFoundError
+from src.domain.filters.users import UserFilter
+from src.timing import timed
+
+
+class ChangeRoleUseCase(AbstractUseCase):
+    @timed("use_case")
+    async def __call__(self, user_id: int, role: RolesEnum) -> User:
+        async with self.uow as uow:
+            user = await uow.users.set_role(UserFilter(id=user_id), role)
+            if user is None:
+                raise SubjectNotFoundError("User not found")
+            await uow.commit()
+        # Роль зашита в access токен: старые токены несут прежнюю.
+        await self.auth.revoke(user_id)
+        return user
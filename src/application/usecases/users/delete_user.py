@@ -0,0 +1,13 @@
+from src.application.usecases.abs import AbstractUseCase
+from src.domain.exceptions.auth import SubjectNotFoundError
+from src.domain.filters.users import UserFilter
+from src.timing import timed
+
+
+class DeleteUserUseCase(AbstractUseCase):
+    @timed("use_case")
+    async def __call__(self, user_id: int) -> None:
+        # Коммит и сброс профиля из кеша — в UsersService.
+        if not await self.users.delete(UserFilter(id=user_id)):  # type: ignore[union-attr]
+            raise SubjectNotFoundError("User not found")
+        await self.auth.revoke(user_id)
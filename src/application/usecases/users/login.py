@@ -1,9 +1,11 @@
 from src.application.interfaces.credentials import Credentials
 from src.application.usecases.abs import AbstractUseCase
 from src.domain.filters.users import UserFilter
+from src.timing import timed
 
 
 class LoginUseCase(AbstractUseCase):
+    @timed("use_case")
     async def __call__(
         self,
         email: str,
@@ -14,6 +16,16 @@ class LoginUseCase(AbstractUseCase):
     ) -> Credentials:
         async with self.uow as uow:
             user = await uow.users.get_user(UserFilter(email=email))
-            return await self.auth.authenticate(
+            # Закрываем транзакцию чтения: на время bcrypt соединение
+            # возвращается в пул, а не простаивает в запросе.
+            await uow.rollback()
+            credentials = await self.auth.authenticate(
                 email=email, password=password, user=user, device_id=device_id
             )
+            # Пароль верный — пересчитываем хеш, если cost factor поменялся.
+            if user is not None and self.auth.needs_rehash(user.password):
+                await self.users.update(  # type: ignore[union-attr]
+                    UserFilter(id=user.id),
+                    {"password": await self.auth.hash_password(password)},
+                )
+            return credentials
@@ -5,9 +5,11 @@ from src.application.usecases.abs import AbstractUseCase
 from src.domain.entities.user import User, RolesEnum
 from src.domain.exceptions.auth import UserAlreadyExistsError
 from src.domain.filters.users import UserFilter
+from src.timing import timed
 
 
 class RegisterUserUseCase(AbstractUseCase):
+    @timed("use_case")
     async def __call__(
         self,
         username: str,
@@ -23,7 +25,7 @@ class RegisterUserUseCase(AbstractUseCase):
             user = User(
                 username=username,
                 email=email,
-                password=self.auth.hash_password(password),
+                password=await self.auth.hash_password(password),
                 id=None,
                 created_at=datetime.now(UTC),
                 role=RolesEnum.USER,
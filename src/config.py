@@ -1,8 +1,36 @@
+from ipaddress import ip_network
 from pathlib import Path
+from typing import Literal
 
-from pydantic import Field
+from pydantic import BaseModel, Field, IPvAnyNetwork, model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+ReadPreferenceMode = Literal[
+    "primary", "primaryPreferred", "secondary", "secondaryPreferred", "nearest"
+]
+
+
+# Классы операций записи в Mongo: неизвестное имя уровня — ошибка конфига при
+# старте, а не при первой записи.
+WriteConcernTierName = Literal["votes", "comments", "posts"]
+
+
+class WriteConcernTier(BaseModel):
+    w: int | str = "majority"
+    j: bool | None = None
+    wtimeout: int | None = Field(default=None, ge=0)
+
+    @model_validator(mode="after")
+    def check_acknowledged(self) -> "WriteConcernTier":
+        if self.w == 0 and self.j:
+            raise ValueError("j=True requires an acknowledged write (w != 0)")
+        return self
+
+
+class RateLimitPolicy(BaseModel):
+    limit: int  # запросов
+    period: int  # за столько секунд
+
 
 class Config(BaseSettings):
     DEV_DATABASE_URL: str = "sqlite+aiosqlite:///dev_db.db"
@@ -11,6 +39,12 @@ class Config(BaseSettings):
     ADMIN_PASSWORD: str = Field(min_length=8)
     JWT_PRIVATE_KEY: Path = Path(__file__).parent.parent / "jwt_private_key.pem"
     JWT_PUBLIC_KEY: Path = Path(__file__).parent.parent / "jwt_public_key.pem"
+    # Публичные ключи, которые ещё принимаются при проверке (ротация ключей).
+    JWT_VERIFICATION_KEYS: list[Path] = []
+    JWT_KEYS_CHECK_INTERVAL_SECONDS: int = 30
+    # Алгоритм подписи задаётся типом приватного ключа (RSA, EC P-256, Ed25519);
+    # если указан явно — ключ проверяется на соответствие при загрузке.
+    JWT_ALGORITHM: Literal["RS256", "ES256", "EdDSA"] | None = None
     model_config = SettingsConfigDict(env_file=".env")
 
     POSTGRES_USER: str
@@ -23,26 +57,107 @@ class Config(BaseSettings):
     MONGO_PASSWORD: str
     MONGO_HOST: str
     MONGO_PORT: int
+    MONGO_REPLICA_SET: str | None = None
+    # Read preference для чтений, которым допустима небольшая задержка (гости).
+    # Запись и чтение после собственной записи всегда идут в primary.
+    MONGO_READ_PREFERENCES: dict[str, ReadPreferenceMode] = {
+        "get_posts": "secondaryPreferred",
+        "get_post": "secondaryPreferred",
+        "get_comments": "secondaryPreferred",
+        "get_answers": "secondaryPreferred",
+    }
+    MONGO_MAX_STALENESS_SECONDS: int = Field(default=90, ge=90)
+    # Срок кеша чтений с вторичных узлов (ключи stale:). Отставший узел может
+    # вернуть данные до сброса кеша и записать их уже после него — такая запись
+    # живёт не дольше этого срока. 0 — чтения с вторичных узлов не кешируются.
+    STALE_CACHE_EXPIRE_SECONDS: int = Field(default=5, ge=0)
+    # Уровни write concern по классам операций: дешёвые массовые операции
+    # (голоса) подтверждаются одним узлом, создание контента — большинством.
+    MONGO_WRITE_CONCERNS: dict[WriteConcernTierName, WriteConcernTier] = {
+        "votes": WriteConcernTier(w=1, j=False),
+        "comments": WriteConcernTier(w="majority", wtimeout=5000),
+        "posts": WriteConcernTier(w="majority", j=True, wtimeout=5000),
+    }
 
     REFRESH_TOKEN_EXPIRE_SECONDS: int
     ACCESS_TOKEN_EXPIRE_SECONDS: int
+    BCRYPT_ROUNDS: int = Field(default=12, ge=4, le=31)
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_QUEUE_TIMEOUT_SECONDS: float = 5
+
+    # Имя и email автора в access токене: запись не ходит за автором в Postgres.
+    ACCESS_TOKEN_AUTHOR_CLAIMS: bool = True
+    ACCESS_TOKEN_CACHE_SIZE: int = 10_000  # 0 — отключить кеш проверенных токенов
+    # Ротация refresh токена: параллельные запросы ждут под блокировкой и в течение
+    # grace окна получают уже выпущенную пару вместо 403.
+    REFRESH_ROTATION_LOCK_SECONDS: float = 5
+    REFRESH_ROTATION_GRACE_SECONDS: int = 30
 
     POSTS_CACHE_EXPIRE_SECONDS: int
+    # Длина анонса поста (?excerpt=true), считается при создании поста.
+    POST_EXCERPT_LENGTH: int = 280
     COMMENTS_CACHE_EXPIRE_SECONDS: int
     PROJECTS_CACHE_EXPIRE_SECONDS: int
+    PROFILE_CACHE_EXPIRE_SECONDS: int = 3600
+
+    # Сжатие списков (лент): не меньше порога в байтах; сжатые варианты
+    # одинаковых страниц хранятся в LRU на воркер (0 — без кеша).
+    RESPONSE_COMPRESSION_MIN_SIZE: int = 1024
+    RESPONSE_COMPRESSION_CACHE_SIZE: int = 128
 
-    RATE_LIMIT_LIMIT: int = 10
+    # Доля ответов с заголовком Server-Timing (0 — только по X-Server-Timing).
+    SERVER_TIMING_SAMPLE_RATE: float = Field(default=0, ge=0, le=1)
+    # Сети, которым открыты /metrics и Server-Timing по X-Server-Timing
+    # (адрес клиента — после SERVER_FORWARDED_ALLOW_IPS); пусто — никому.
+    METRICS_ALLOWED_NETWORKS: list[IPvAnyNetwork] = [
+        ip_network("127.0.0.0/8"),
+        ip_network("::1/128"),
+    ]
+
+    # Общий потолок на IP для всех запросов; строгие лимиты — в политиках маршрутов.
+    RATE_LIMIT_LIMIT: int = 100
     RATE_LIMIT_EXPIRE_SECONDS: int = 5
+    # Квота арендуется у Redis пачками и расходуется в воркере локально;
+    # 1 — каждый запрос проверяется в Redis.
+    RATE_LIMIT_LEASE_SIZE: int = 1
+    # Политики маршрутов: проверяются в UseCaseGuard по id пользователя,
+    # а для гостей — по IP.
+    RATE_LIMIT_POLICIES: dict[str, RateLimitPolicy] = {
+        "auth": RateLimitPolicy(limit=10, period=60),
+        "feed": RateLimitPolicy(limit=300, period=60),
+        "vote": RateLimitPolicy(limit=60, period=60),
+        "comment": RateLimitPolicy(limit=10, period=60),
+    }
+
+    # POST /batch: подзапросов в пакете и сколько из них выполняется одновременно.
+    BATCH_MAX_REQUESTS: int = 10
+    BATCH_CONCURRENCY: int = 4
+    # Префиксы путей, доступных в пакете: только GET маршруты API.
+    BATCH_ALLOWED_PREFIXES: tuple[str, ...] = ("/posts", "/projects")
 
     BLOG_DB_NAME: str = "blog"
 
+    # python -m src.serve
+    SERVER_HOST: str = "0.0.0.0"
+    SERVER_PORT: int = 8000
+    SERVER_WORKERS: int | None = None  # None — по числу доступных CPU
+    SERVER_BACKLOG: int = 2048
+    SERVER_KEEPALIVE_SECONDS: int = 75
+    SERVER_GRACEFUL_TIMEOUT_SECONDS: int = 30
+    SERVER_MAX_REQUESTS: int = 0  # перезапуск воркера после N запросов; 0 — нет
+    SERVER_FORWARDED_ALLOW_IPS: str = "127.0.0.1"
+    SERVER_ACCESS_LOG: bool = False
+
     @property
     def DATABASE_URL(self) -> str:
         return f"postgresql+asyncpg://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.POSTGRES_HOST}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
 
     @property
     def MONGO_URL(self) -> str:
-        return f"mongodb://{self.MONGO_USER}:{self.MONGO_PASSWORD}@{self.MONGO_HOST}:{self.MONGO_PORT}/admin"
+        url = f"mongodb://{self.MONGO_USER}:{self.MONGO_PASSWORD}@{self.MONGO_HOST}:{self.MONGO_PORT}/admin"
+        if self.MONGO_REPLICA_SET:
+            url += f"?replicaSet={self.MONGO_REPLICA_SET}"
+        return url
 
 
 CONFIG = Config()
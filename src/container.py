@@ -1,5 +1,3 @@
-from functools import partial
-
 from dependency_injector import containers, providers
 from motor.motor_asyncio import AsyncIOMotorClient
 from redis.asyncio import Redis, ConnectionPool
@@ -8,16 +6,20 @@ from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from src.application.authorize import UseCaseGuard
 from src.application.services.posts import PostsService
 from src.application.services.projects import ProjectsService
+from src.application.services.users import UsersService
 from src.application.usecases.posts.comments.answers.create import CreateAnswerUseCase
 from src.application.usecases.posts.comments.answers.get import GetAnswersUseCase
 from src.application.usecases.posts.comments.create import CreateCommentUseCase
 from src.application.usecases.posts.comments.get import GetCommentsUseCase
 from src.application.usecases.posts.comments.rate import RateCommentUseCase
 from src.application.usecases.posts.create import CreatePostUseCase
-from src.application.usecases.posts.get import GetPostsUseCase
+from src.application.usecases.posts.get import GetPostUseCase, GetPostsUseCase
 from src.application.usecases.posts.rate import RatePostUseCase
 from src.application.usecases.projects.create import CreateProjectUseCase
 from src.application.usecases.projects.get import GetProjectsUseCase
+from src.application.usecases.users.change_password import ChangePasswordUseCase
+from src.application.usecases.users.change_role import ChangeRoleUseCase
+from src.application.usecases.users.delete_user import DeleteUserUseCase
 from src.application.usecases.users.login import LoginUseCase
 from src.application.usecases.users.register_user import RegisterUserUseCase
 from src.config import CONFIG
@@ -25,8 +27,12 @@ from src.domain.entities.user import RolesEnum
 from src.domain.value_objects.auth import AuthorizationContext
 from src.infrastructure.clients.cache import RedisCacheClient
 from src.infrastructure.credentials import JwtCredentials
+from src.infrastructure.hashing import BcryptHasher
+from src.infrastructure.keys import JwtKeyManager
+from src.infrastructure.rate_limit import LeasedRateLimiter, RedisRateLimiter
 from src.infrastructure.repositories.tokens import JWTRedisAuthRepository
 from src.infrastructure.services.auth import JwtAuthService
+from src.infrastructure.token_cache import VerifiedTokenCache
 from src.infrastructure.unit_of_work import UnitOfWork
 
 
@@ -37,13 +43,24 @@ async def init_redis(redis: Redis) -> Redis:
     return redis
 
 
+def rate_limit_policy(
+    name: str, redis_client: providers.Provider[Redis]
+) -> providers.Singleton[RedisRateLimiter]:
+    """Лимитер для политики маршрута из CONFIG.RATE_LIMIT_POLICIES."""
+    policy = CONFIG.RATE_LIMIT_POLICIES[name]
+    return providers.Singleton(
+        RedisRateLimiter,
+        redis_client=redis_client,
+        limit=policy.limit,
+        period=policy.period,
+        name=name,
+    )
+
+
 class Container(containers.DeclarativeContainer):
     # region Base depends
 
-    mongo_factory = partial(
-        AsyncIOMotorClient,
-        CONFIG.MONGO_URL,
-    )
+    mongo_client = providers.Singleton(AsyncIOMotorClient, CONFIG.MONGO_URL)
 
     engine = providers.Singleton(create_async_engine, url=CONFIG.DATABASE_URL)
 
@@ -57,22 +74,62 @@ class Container(containers.DeclarativeContainer):
         decode_responses=True,
     )
 
-    redis = providers.Resource(
-        init_redis,
-        redis=providers.Singleton(Redis, connection_pool=redis_pool),
-    )
+    redis_client = providers.Singleton(Redis, connection_pool=redis_pool)
+    redis = providers.Resource(init_redis, redis=redis_client)
 
-    auth_repo = providers.Factory(JWTRedisAuthRepository, redis_client=redis)
-    auth_service = providers.Factory(JwtAuthService, auth_repo=auth_repo)
-    cache_client = providers.Singleton(RedisCacheClient, redis_client=redis)
+    # Зависимости берут клиент, а не Resource, чтобы граф собирался синхронно
+    # при старте (см. build_singletons в main).
+    auth_repo = providers.Singleton(JWTRedisAuthRepository, redis_client=redis_client)
+    jwt_keys = providers.Singleton(
+        JwtKeyManager,
+        private_key_path=CONFIG.JWT_PRIVATE_KEY,
+        public_key_paths=[CONFIG.JWT_PUBLIC_KEY, *CONFIG.JWT_VERIFICATION_KEYS],
+        check_interval=CONFIG.JWT_KEYS_CHECK_INTERVAL_SECONDS,
+        algorithm=CONFIG.JWT_ALGORITHM,
+    )
+    token_cache = providers.Singleton(
+        VerifiedTokenCache, maxsize=CONFIG.ACCESS_TOKEN_CACHE_SIZE
+    )
+    hasher = providers.Singleton(
+        BcryptHasher,
+        rounds=CONFIG.BCRYPT_ROUNDS,
+        max_workers=CONFIG.PASSWORD_HASH_WORKERS,
+        queue_timeout=CONFIG.PASSWORD_HASH_QUEUE_TIMEOUT_SECONDS,
+    )
+    auth_service = providers.Singleton(
+        JwtAuthService,
+        auth_repo=auth_repo,
+        keys=jwt_keys,
+        token_cache=token_cache,
+        hasher=hasher,
+    )
+    cache_client = providers.Singleton(RedisCacheClient, redis_client=redis_client)
+    rate_limiter = providers.Singleton(
+        LeasedRateLimiter,
+        limiter=providers.Singleton(
+            RedisRateLimiter,
+            redis_client=redis_client,
+            limit=CONFIG.RATE_LIMIT_LIMIT,
+            period=CONFIG.RATE_LIMIT_EXPIRE_SECONDS,
+        ),
+        lease_size=CONFIG.RATE_LIMIT_LEASE_SIZE,
+    )
+    auth_rate_limit = rate_limit_policy("auth", redis_client)
+    feed_rate_limit = rate_limit_policy("feed", redis_client)
+    vote_rate_limit = rate_limit_policy("vote", redis_client)
+    comment_rate_limit = rate_limit_policy("comment", redis_client)
 
-    uow = providers.Factory(
+    # Единица работы одна на приложение, сессии запроса живут в её contextvar:
+    # guard, use case и сервисы делят одни сессии. Поэтому всё, что ниже,
+    # тоже без состояния запроса и собирается один раз.
+    uow = providers.Singleton(
         UnitOfWork,
         sql_session_factory=session_factory,
-        mongo_client_factory=mongo_factory,
+        mongo_client=mongo_client,
     )
-    posts = providers.Factory(PostsService, uow=uow, cache_client=cache_client)
-    projects = providers.Factory(ProjectsService, uow=uow, cache_client=cache_client)
+    posts = providers.Singleton(PostsService, uow=uow, cache_client=cache_client)
+    projects = providers.Singleton(ProjectsService, uow=uow, cache_client=cache_client)
+    users = providers.Singleton(UsersService, uow=uow, cache_client=cache_client)
 
     # endregion
 
@@ -91,76 +148,118 @@ class Container(containers.DeclarativeContainer):
     # endregion
 
     # region Use cases without auth
-    _register_use_case = providers.Factory(
+    _register_use_case = providers.Singleton(
         RegisterUserUseCase,
         uow=uow,
         auth=auth_service,
     )
-    _login_use_case = providers.Factory(
+    _login_use_case = providers.Singleton(
         LoginUseCase,
         uow=uow,
         auth=auth_service,
+        users=users,
+    )
+    _change_password_use_case = providers.Singleton(
+        ChangePasswordUseCase, uow=uow, auth=auth_service, users=users
     )
-    _create_project_use_case = providers.Factory(
-        CreateProjectUseCase, uow=uow, auth=auth_service, posts=posts
+    _change_role_use_case = providers.Singleton(
+        ChangeRoleUseCase, uow=uow, auth=auth_service
+    )
+    _delete_user_use_case = providers.Singleton(
+        DeleteUserUseCase, uow=uow, auth=auth_service, users=users
+    )
+    _create_project_use_case = providers.Singleton(
+        CreateProjectUseCase, uow=uow, auth=auth_service, projects=projects
     )
 
-    _create_post_use_case = providers.Factory(
-        CreatePostUseCase, uow=uow, auth=auth_service, posts=posts
+    _create_post_use_case = providers.Singleton(
+        CreatePostUseCase, uow=uow, auth=auth_service, posts=posts, users=users
     )
-    _get_posts_use_case = providers.Factory(
+    _get_posts_use_case = providers.Singleton(
         GetPostsUseCase, uow=uow, auth=auth_service, posts=posts
     )
-    _rate_post_use_case = providers.Factory(
+    _get_post_use_case = providers.Singleton(
+        GetPostUseCase, uow=uow, auth=auth_service, posts=posts
+    )
+    _rate_post_use_case = providers.Singleton(
         RatePostUseCase,
         uow=uow,
         auth=auth_service,
         posts=posts,
+        users=users,
     )
-    _create_comment_use_case = providers.Factory(
+    _create_comment_use_case = providers.Singleton(
         CreateCommentUseCase,
         uow=uow,
         auth=auth_service,
         posts=posts,
+        users=users,
     )
-    _get_comments_use_case = providers.Factory(
+    _get_comments_use_case = providers.Singleton(
         GetCommentsUseCase,
         uow=uow,
         auth=auth_service,
         posts=posts,
     )
-    _create_answer_use_case = providers.Factory(
-        CreateAnswerUseCase, uow=uow, auth=auth_service, posts=posts
+    _create_answer_use_case = providers.Singleton(
+        CreateAnswerUseCase, uow=uow, auth=auth_service, posts=posts, users=users
     )
-    _get_answers_use_case = providers.Factory(
+    _get_answers_use_case = providers.Singleton(
         GetAnswersUseCase, uow=uow, auth=auth_service, posts=posts
     )
-    _rate_comment_use_case = providers.Factory(
-        RateCommentUseCase, uow=uow, auth=auth_service, posts=posts
+    _rate_comment_use_case = providers.Singleton(
+        RateCommentUseCase, uow=uow, auth=auth_service, posts=posts, users=users
     )
-    _get_projects_use_case = providers.Factory(
+    _get_projects_use_case = providers.Singleton(
         GetProjectsUseCase, uow=uow, auth=auth_service, projects=projects
     )
     # endregion
 
     # region Use cases with auth
-    register_use_case = providers.Factory(
+    register_use_case = providers.Singleton(
         UseCaseGuard,
         required_role=RolesEnum.GUEST,
         auth_service=auth_service,
         use_case=_register_use_case,
         uow=uow,
         default_context=default_context,
+        rate_limiter=auth_rate_limit,
     )
-    login_use_case = providers.Factory(
+    login_use_case = providers.Singleton(
         UseCaseGuard,
         required_role=RolesEnum.GUEST,
         auth_service=auth_service,
         use_case=_login_use_case,
         uow=uow,
         default_context=default_context,
+        rate_limiter=auth_rate_limit,
     )
-    create_project_use_case: CreateProjectUseCase = providers.Factory(
+    change_password_use_case = providers.Singleton(
+        UseCaseGuard,
+        required_role=RolesEnum.USER,
+        auth_service=auth_service,
+        use_case=_change_password_use_case,
+        uow=uow,
+        default_context=default_context,
+        rate_limiter=auth_rate_limit,
+    )
+    change_role_use_case = providers.Singleton(
+        UseCaseGuard,
+        required_role=RolesEnum.ADMIN,
+        auth_service=auth_service,
+        use_case=_change_role_use_case,
+        uow=uow,
+        default_context=default_context,
+    )
+    delete_user_use_case = providers.Singleton(
+        UseCaseGuard,
+        required_role=RolesEnum.ADMIN,
+        auth_service=auth_service,
+        use_case=_delete_user_use_case,
+        uow=uow,
+        default_context=default_context,
+    )
+    create_project_use_case = providers.Singleton(
         UseCaseGuard,
         required_role=RolesEnum.ADMIN,
         auth_service=auth_service,
@@ -168,7 +267,7 @@ class Container(containers.DeclarativeContainer):
         uow=uow,
         default_context=default_context,
     )
-    create_post_use_case = providers.Factory(
+    create_post_use_case = providers.Singleton(
         UseCaseGuard,
         required_role=RolesEnum.ADMIN,
         auth_service=auth_service,
@@ -176,69 +275,102 @@ class Container(containers.DeclarativeContainer):
         uow=uow,
         default_context=default_context,
     )
-    get_posts_use_case = providers.Factory(
+    get_posts_use_case = providers.Singleton(
         UseCaseGuard,
         required_role=RolesEnum.GUEST,
         auth_service=auth_service,
         use_case=_get_posts_use_case,
         uow=uow,
         default_context=default_context,
+        rate_limiter=feed_rate_limit,
+        lazy=True,
+    )
+    get_post_use_case = providers.Singleton(
+        UseCaseGuard,
+        required_role=RolesEnum.GUEST,
+        auth_service=auth_service,
+        use_case=_get_post_use_case,
+        uow=uow,
+        default_context=default_context,
+        rate_limiter=feed_rate_limit,
+        lazy=True,
     )
-    rate_post_use_case = providers.Factory(
+    rate_post_use_case = providers.Singleton(
         UseCaseGuard,
         required_role=RolesEnum.USER,
         auth_service=auth_service,
         use_case=_rate_post_use_case,
         uow=uow,
         default_context=default_context,
+        rate_limiter=vote_rate_limit,
     )
-    create_comment_use_case = providers.Factory(
+    create_comment_use_case = providers.Singleton(
         UseCaseGuard,
         required_role=RolesEnum.USER,
         auth_service=auth_service,
         use_case=_create_comment_use_case,
         uow=uow,
         default_context=default_context,
+        rate_limiter=comment_rate_limit,
     )
-    get_comments_use_case = providers.Factory(
+    get_comments_use_case = providers.Singleton(
         UseCaseGuard,
         required_role=RolesEnum.GUEST,
         auth_service=auth_service,
         use_case=_get_comments_use_case,
         uow=uow,
         default_context=default_context,
+        rate_limiter=feed_rate_limit,
+        lazy=True,
     )
-    create_answer_use_case = providers.Factory(
+    create_answer_use_case = providers.Singleton(
         UseCaseGuard,
         required_role=RolesEnum.USER,
         auth_service=auth_service,
         use_case=_create_answer_use_case,
         uow=uow,
         default_context=default_context,
+        rate_limiter=comment_rate_limit,
     )
-    get_answers_use_case = providers.Factory(
+    get_answers_use_case = providers.Singleton(
         UseCaseGuard,
         required_role=RolesEnum.GUEST,
         auth_service=auth_service,
         use_case=_get_answers_use_case,
         uow=uow,
         default_context=default_context,
+        rate_limiter=feed_rate_limit,
+        lazy=True,
     )
-    rate_comment_use_case = providers.Factory(
+    rate_comment_use_case = providers.Singleton(
         UseCaseGuard,
         required_role=RolesEnum.USER,
         auth_service=auth_service,
         use_case=_rate_comment_use_case,
         uow=uow,
         default_context=default_context,
+        rate_limiter=vote_rate_limit,
     )
-    get_projects_use_case = providers.Factory(
+    get_projects_use_case = providers.Singleton(
         UseCaseGuard,
         required_role=RolesEnum.GUEST,
         auth_service=auth_service,
         use_case=_get_projects_use_case,
         uow=uow,
         default_context=default_context,
+        rate_limiter=feed_rate_limit,
+        lazy=True,
+    )
+    # Пакет GET запросов: авторизация один раз на пакет, лимиты — у guard'ов
+    # маршрутов подзапросов.
+    batch_guard = providers.Singleton(
+        UseCaseGuard,
+        required_role=RolesEnum.GUEST,
+        auth_service=auth_service,
+        use_case=None,
+        uow=uow,
+        default_context=default_context,
+        lazy=True,
     )
     # endregion
 
@@ -1,6 +1,9 @@
 from src.application.interfaces.credentials import Credentials
+from src.domain.value_objects.auth import AuthorizationContext
 
 
 class CredentialsHolder:
     def __init__(self) -> None:
         self.credentials: Credentials | None = None
+        # Контекст, уже проверенный для всего запроса (подзапросы /batch).
+        self.context: AuthorizationContext | None = None
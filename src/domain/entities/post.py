@@ -4,6 +4,31 @@ from typing import Any
 
 from src.domain.entities.user import Author
 
+# Поля поста, которые можно выбрать в ленте (?fields=); id отдаётся всегда.
+POST_FIELDS = frozenset(
+    {
+        "title",
+        "content",
+        "excerpt",
+        "author",
+        "likes",
+        "dislikes",
+        "created_at",
+        "comments_count",
+        "recent_comments",
+    }
+)
+
+
+def make_excerpt(content: str, length: int) -> str:
+    """Начало текста не длиннее length символов, обрезанное по границе слова."""
+    if len(content) <= length:
+        return content
+    head = content[: length - 1]
+    if not content[length - 1].isspace() and (space := head.rfind(" ")) > 0:
+        head = head[:space]
+    return head.rstrip() + "…"
+
 
 @dataclass
 class Comment:
@@ -59,6 +84,7 @@ class Post:
     created_at: datetime
     comments_count: int
     recent_comments: list[Comment]
+    excerpt: str | None = None
 
     def to_dict(self) -> dict[str, Any]:
         if not isinstance(self.author, Author):
@@ -75,6 +101,7 @@ class Post:
             "recent_comments": [
                 Comment.to_dict(comment) for comment in self.recent_comments
             ],
+            "excerpt": self.excerpt,
         }
 
     @classmethod
@@ -92,4 +119,5 @@ class Post:
             recent_comments=[
                 Comment.from_dict(comment) for comment in data["recent_comments"]
             ],
+            excerpt=data.get("excerpt"),
         )
@@ -1,3 +1,19 @@
 class ConflictException(Exception):
     def __init__(self, msg: str = "Already exists") -> None:
         super().__init__(msg)
+
+
+class ServiceBusyError(Exception):
+    def __init__(self, msg: str = "Service is busy") -> None:
+        super().__init__(msg)
+        self.msg = msg
+
+
+class RateLimitExceededError(Exception):
+    def __init__(
+        self, msg: str = "Too many requests", limit: int = 0, retry_after: float = 1
+    ) -> None:
+        super().__init__(msg)
+        self.msg = msg
+        self.limit = limit
+        self.retry_after = retry_after
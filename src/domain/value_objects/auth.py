@@ -1,9 +1,11 @@
 from dataclasses import dataclass
 
-from src.domain.entities.user import RolesEnum
+from src.domain.entities.user import RolesEnum, Author
 
 
 @dataclass(frozen=True)
 class AuthorizationContext:
     user_id: int | None
     role: RolesEnum
+    author: Author | None = None  # из claims токена, если они там есть
+    issued_at: float | None = None
@@ -4,8 +4,10 @@ from typing import Any, Mapping, Sequence
 from redis.asyncio import Redis
 
 from src.application.interfaces.clients.cache import AbstractCacheClient, cache
+from src.timing import timed_methods
 
 
+@timed_methods("cache")
 class RedisCacheClient(AbstractCacheClient):
     def __init__(self, redis_client: Redis):
         self.redis_client = redis_client
@@ -26,10 +28,33 @@ class RedisCacheClient(AbstractCacheClient):
             return json.loads(data)  # type: ignore
         return None
 
+    async def get_many(self, *keys: str) -> list[dict[str, Any] | None]:
+        if not keys:
+            return []
+        return [
+            json.loads(data) if data else None
+            for data in await self.redis_client.mget(keys)
+        ]
+
+    async def set_many(
+        self, items: dict[str, dict[str, Any]], expiration: int | None = None
+    ) -> None:
+        if not items:
+            return None
+        async with self.redis_client.pipeline(transaction=False) as pipe:
+            for key, data in items.items():
+                pipe.set(
+                    name=key, value=json.dumps(data, ensure_ascii=False), ex=expiration
+                )
+            await pipe.execute()
+
     async def delete(self, *keys: str) -> None:
         if not keys:
             return None
         return await self.redis_client.delete(*keys)  # type: ignore
 
     async def keys(self, pattern: str) -> list[str]:
-        return await self.redis_client.keys(pattern)  # type: ignore
+        # SCAN порциями, а не KEYS: обход не блокирует Redis на время прохода.
+        return [
+            key async for key in self.redis_client.scan_iter(match=pattern, count=1000)
+        ]
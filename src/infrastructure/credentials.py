@@ -15,6 +15,11 @@ class AccessTokenPayload:
     role: int
     exp: int
     type: TokenType
+    # Дробные секунды: отзыв сравнивается с точностью до микросекунд.
+    iat: float = 0
+    # Отображаемые поля автора, чтобы запись не ходила за ним в Postgres.
+    name: str | None = None
+    email: str | None = None
 
 
 @dataclass(frozen=True)
@@ -0,0 +1,78 @@
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Callable, TypeVar
+
+from src.domain.exceptions.base import ServiceBusyError
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class BcryptHasher:
+    """
+    Хеширование паролей вне event loop.
+
+    bcrypt отпускает GIL, поэтому выполняется в отдельном пуле потоков. Число
+    одновременных операций ограничено max_workers, а ожидание свободного слота —
+    queue_timeout секундами, после чего запрос отклоняется (ServiceBusyError).
+    Сам bcrypt импортируется при первой операции: на старте воркера он не нужен.
+    """
+
+    def __init__(
+        self, rounds: int = 12, max_workers: int = 2, queue_timeout: float = 5
+    ):
+        self.rounds = rounds
+        self.queue_timeout = queue_timeout
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="bcrypt"
+        )
+        self._slots = asyncio.Semaphore(max_workers)
+        self._dummy_hash: bytes | None = None
+
+    async def hash(self, password: str) -> bytes:
+        import bcrypt
+
+        return await self._run(
+            lambda: bcrypt.hashpw(password.encode(), bcrypt.gensalt(self.rounds))
+        )
+
+    async def verify(self, password: str, hashed: bytes | None) -> bool:
+        """
+        Проверка пароля. Для несуществующего пользователя (hashed=None) сверяемся
+        с фиктивным хешем, чтобы время ответа не выдавало наличие email.
+        """
+        import bcrypt
+
+        if hashed is None:
+            await self._run(lambda: bcrypt.checkpw(password.encode(), self._dummy()))
+            return False
+        return await self._run(partial(bcrypt.checkpw, password.encode(), hashed))
+
+    def needs_rehash(self, hashed: bytes) -> bool:
+        """Хеш посчитан с другим cost factor, чем настроен сейчас."""
+        try:
+            return int(hashed.split(b"$")[2]) != self.rounds
+        except (IndexError, ValueError):
+            return True
+
+    def _dummy(self) -> bytes:
+        if self._dummy_hash is None:
+            import bcrypt
+
+            self._dummy_hash = bcrypt.hashpw(b"dummy", bcrypt.gensalt(self.rounds))
+        return self._dummy_hash
+
+    async def _run(self, fn: Callable[[], T]) -> T:
+        try:
+            await asyncio.wait_for(self._slots.acquire(), timeout=self.queue_timeout)
+        except TimeoutError:
+            logger.warning("Password hashing queue timeout")
+            raise ServiceBusyError("Too many concurrent logins, try again later")
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, fn)
+        finally:
+            self._slots.release()
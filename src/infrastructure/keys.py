@@ -0,0 +1,178 @@
+import asyncio
+import hashlib
+import logging
+import signal
+from dataclasses import dataclass
+from pathlib import Path
+from time import monotonic
+from typing import Callable, Literal, Sequence
+
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
+from cryptography.hazmat.primitives.asymmetric.types import (
+    PrivateKeyTypes,
+    PublicKeyTypes,
+)
+from cryptography.hazmat.primitives.serialization import (
+    Encoding,
+    PublicFormat,
+    load_pem_private_key,
+    load_pem_public_key,
+)
+
+logger = logging.getLogger(__name__)
+
+JwtAlgorithm = Literal["RS256", "ES256", "EdDSA"]
+
+
+@dataclass(frozen=True)
+class SigningKey:
+    kid: str
+    key: PrivateKeyTypes
+    algorithm: JwtAlgorithm
+
+
+@dataclass(frozen=True)
+class VerificationKey:
+    kid: str
+    key: PublicKeyTypes
+    algorithm: JwtAlgorithm
+
+
+def key_algorithm(public_key: PublicKeyTypes) -> JwtAlgorithm:
+    """Алгоритм подписи определяется типом ключа."""
+    if isinstance(public_key, rsa.RSAPublicKey):
+        return "RS256"
+    if isinstance(public_key, ec.EllipticCurvePublicKey) and isinstance(
+        public_key.curve, ec.SECP256R1
+    ):
+        return "ES256"
+    if isinstance(public_key, ed25519.Ed25519PublicKey):
+        return "EdDSA"
+    raise ValueError(f"Unsupported JWT key type: {type(public_key).__name__}")
+
+
+def key_id(public_key: PublicKeyTypes) -> str:
+    """Идентификатор ключа (kid) — отпечаток публичного ключа, одинаковый на всех воркерах."""
+    der = public_key.public_bytes(Encoding.DER, PublicFormat.SubjectPublicKeyInfo)
+    return hashlib.sha256(der).hexdigest()[:16]
+
+
+class JwtKeyManager:
+    """
+    Хранит распарсенные JWT ключи в памяти.
+
+    Подписывает текущим приватным ключом, проверяет любым из активных публичных
+    ключей по заголовку kid — каждым строго в его алгоритме (RS256, ES256 или
+    EdDSA), так что на время миграции принимаются токены разных алгоритмов.
+    Файлы ключей перечитываются при изменении (mtime проверяется не чаще раза
+    в check_interval секунд) или по сигналу; после перечитывания вызываются
+    подписчики on_reload.
+    """
+
+    def __init__(
+        self,
+        private_key_path: Path,
+        public_key_paths: Sequence[Path],
+        check_interval: float = 30,
+        algorithm: JwtAlgorithm | None = None,
+    ) -> None:
+        self.private_key_path = private_key_path
+        self.public_key_paths = list(public_key_paths)
+        self.check_interval = check_interval
+        self.algorithm = algorithm
+        self._signing_key: SigningKey | None = None
+        self._verification_keys: dict[str, VerificationKey] = {}
+        self._mtimes: dict[Path, float] = {}
+        self._checked_at = 0.0
+        self._reload_callbacks: list[Callable[[], None]] = []
+        self.reload()
+
+    @property
+    def signing_key(self) -> SigningKey:
+        self.maybe_reload()
+        if self._signing_key is None:
+            raise RuntimeError("JWT signing key is not loaded")
+        return self._signing_key
+
+    def verification_key(self, kid: str | None) -> VerificationKey | None:
+        """Публичный ключ по kid; токены без kid проверяются ключом подписи."""
+        self.maybe_reload()
+        if kid is None:
+            kid = self.signing_key.kid
+        return self._verification_keys.get(kid)
+
+    def on_reload(self, callback: Callable[[], None]) -> None:
+        """Вызывать callback после каждого перечитывания ключей."""
+        self._reload_callbacks.append(callback)
+
+    def reload(self) -> None:
+        private_key = load_pem_private_key(
+            self.private_key_path.read_bytes(), password=None
+        )
+        verification_keys = {
+            key.kid: key
+            for key in (
+                self._verification_key(load_pem_public_key(path.read_bytes()))
+                for path in self.public_key_paths
+            )
+        }
+        signing_public = self._verification_key(private_key.public_key())  # type: ignore[arg-type]
+        if self.algorithm and signing_public.algorithm != self.algorithm:
+            raise ValueError(
+                f"JWT private key is {signing_public.algorithm}, "
+                f"but {self.algorithm} is configured"
+            )
+        signing_key = SigningKey(
+            kid=signing_public.kid,
+            key=private_key,
+            algorithm=signing_public.algorithm,
+        )
+        verification_keys.setdefault(signing_key.kid, signing_public)
+
+        # Подменяем ссылки целиком, чтобы параллельные чтения видели согласованный набор.
+        self._signing_key = signing_key
+        self._verification_keys = verification_keys
+        self._mtimes = self._stat()
+        self._checked_at = monotonic()
+        for callback in self._reload_callbacks:
+            callback()
+        logger.info(
+            f"JWT keys loaded: signing kid={signing_key.kid} ({signing_key.algorithm}), "
+            f"verification kids={list(verification_keys)}"
+        )
+
+    def install_reload_signal(self, signum: int = signal.SIGHUP) -> None:
+        """Перечитывать ключи по сигналу (вызывать внутри запущенного event loop)."""
+        try:
+            asyncio.get_running_loop().add_signal_handler(signum, self._reload_safe)
+        except (NotImplementedError, RuntimeError):
+            logger.warning(f"Signal {signum} handler for JWT keys is not supported")
+
+    @staticmethod
+    def _verification_key(public_key: PublicKeyTypes) -> VerificationKey:
+        return VerificationKey(
+            kid=key_id(public_key), key=public_key, algorithm=key_algorithm(public_key)
+        )
+
+    def _reload_safe(self) -> None:
+        try:
+            self.reload()
+        except (OSError, ValueError) as e:
+            logger.error("JWT keys reload failed, keeping old keys", exc_info=e)
+
+    def _stat(self) -> dict[Path, float]:
+        paths = [self.private_key_path, *self.public_key_paths]
+        return {path: path.stat().st_mtime for path in paths}
+
+    def maybe_reload(self) -> None:
+        """Перечитать ключи, если файлы изменились (не чаще check_interval)."""
+        if monotonic() - self._checked_at < self.check_interval:
+            return
+        self._checked_at = monotonic()
+        try:
+            changed = self._stat() != self._mtimes
+        except OSError as e:
+            logger.error("JWT keys stat failed, keeping old keys", exc_info=e)
+            return
+        if changed:
+            self._reload_safe()
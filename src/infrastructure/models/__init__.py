@@ -1,3 +1,5 @@
+# project.py импортирует UserModel из пакета: user должен быть загружен раньше.
+from .user import UserModel, RoleModel
 from .project import (
     ProjectModel,
     TagModel,
@@ -5,7 +7,6 @@ from .project import (
     ProjectToTagModel,
     ProjectToTechnologyModel,
 )
-from .user import UserModel, RoleModel
 
 __all__ = [
     "UserModel",
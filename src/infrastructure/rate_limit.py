@@ -0,0 +1,191 @@
+import asyncio
+import logging
+from dataclasses import dataclass
+from time import monotonic
+
+from redis import RedisError
+from redis.asyncio import Redis
+
+from src.application.interfaces.clients.rate_limit import (
+    AbstractRateLimiter,
+    RateLimitResult,
+)
+
+logger = logging.getLogger(__name__)
+
+# GCRA: в ключе хранится TAT (theoretical arrival time) — момент, когда ведро
+# снова станет пустым. Проверка и обновление — один EVALSHA, время берём у Redis,
+# чтобы воркеры с расходящимися часами считали одинаково.
+# KEYS[1] — ключ клиента; ARGV: limit, period (с), cost.
+# Ответ: {allowed, remaining, retry_after, reset_after}, дроби — строками.
+GCRA_SCRIPT = """
+local limit = tonumber(ARGV[1])
+local period = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local interval = period / limit
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local tat = tonumber(redis.call('GET', KEYS[1])) or now
+if tat < now then
+    tat = now
+end
+local new_tat = tat + cost * interval
+local allow_at = new_tat - period
+if allow_at > now then
+    return {0, 0, tostring(allow_at - now), tostring(tat - now)}
+end
+redis.call('SET', KEYS[1], tostring(new_tat), 'PX', math.ceil((new_tat - now) * 1000))
+local remaining = math.floor((now - allow_at) / interval)
+return {1, remaining, '0', tostring(new_tat - now)}
+"""
+
+
+# Пока Redis недоступен, предупреждение пишется не чаще раза за столько секунд,
+# с числом пропущенных без проверки запросов.
+FAIL_OPEN_LOG_INTERVAL = 10.0
+
+
+class RedisRateLimiter(AbstractRateLimiter):
+    """
+    Лимит limit запросов за period секунд на ключ (GCRA, без всплесков на
+    границе окна). При недоступности Redis запросы пропускаются (fail open)
+    с предупреждением в логе.
+    """
+
+    def __init__(
+        self, redis_client: Redis, limit: int, period: float, name: str = "global"
+    ) -> None:
+        self.limit = limit
+        self.period = period
+        self.name = name
+        self._script = redis_client.register_script(GCRA_SCRIPT)
+        self._failed_open = 0
+        self._failed_logged_at: float | None = None
+
+    async def hit(self, key: str, cost: int = 1) -> RateLimitResult:
+        try:
+            allowed, remaining, retry_after, reset_after = await self._script(
+                keys=[f"rate_limit:{self.name}:{key}"],
+                args=[self.limit, self.period, cost],
+            )
+        except RedisError as e:
+            self._fail_open(e)
+            return RateLimitResult(True, self.limit, self.limit, 0, 0)
+        if self._failed_logged_at is not None:
+            logger.info(
+                "Rate limiter %s is available again, %d requests were allowed unchecked",
+                self.name,
+                self._failed_open,
+            )
+            self._failed_open = 0
+            self._failed_logged_at = None
+        return RateLimitResult(
+            allowed=bool(allowed),
+            limit=self.limit,
+            remaining=int(remaining),
+            retry_after=float(retry_after),
+            reset_after=float(reset_after),
+        )
+
+    def _fail_open(self, error: RedisError) -> None:
+        self._failed_open += 1
+        now = monotonic()
+        if (
+            self._failed_logged_at is not None
+            and now - self._failed_logged_at < FAIL_OPEN_LOG_INTERVAL
+        ):
+            return
+        self._failed_logged_at = now
+        logger.warning(
+            "Rate limiter %s is unavailable, %d requests allowed unchecked",
+            self.name,
+            self._failed_open,
+            exc_info=error,
+        )
+
+
+@dataclass
+class _Lease:
+    tokens: int  # сколько запросов ещё можно пропустить локально
+    expires_at: float  # monotonic
+    remaining: int  # глобальный остаток на момент аренды
+    reset_at: float  # monotonic
+
+
+class LeasedRateLimiter(AbstractRateLimiter):
+    """
+    Двухуровневый лимитер: квота арендуется у Redis пачками по lease_size
+    запросов и расходуется локально, так что обычный пропущенный запрос не
+    ходит в Redis.
+
+    Пачка живёт не дольше period, неизрасходованный остаток сгорает. Глобальный
+    лимит может быть превышен не больше чем на одну пачку на воркер; когда
+    целой пачки уже нет, лимитер переходит на поштучную проверку в Redis.
+    """
+
+    def __init__(
+        self, limiter: RedisRateLimiter, lease_size: int, max_keys: int = 10_000
+    ) -> None:
+        self.limiter = limiter
+        self.limit = limiter.limit
+        self.lease_size = max(1, lease_size)
+        self.lease_ttl = limiter.period
+        self.max_keys = max_keys
+        self._leases: dict[str, _Lease] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+
+    async def hit(self, key: str, cost: int = 1) -> RateLimitResult:
+        if (result := self._take(key, cost)) is not None:
+            return result
+        # Одновременные промахи по одному ключу арендуют одну пачку, а не по пачке на запрос.
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            if (result := self._take(key, cost)) is not None:
+                return result
+            return await self._lease(key, cost)
+
+    def _take(self, key: str, cost: int) -> RateLimitResult | None:
+        lease = self._leases.get(key)
+        now = monotonic()
+        if lease is None or lease.expires_at <= now or lease.tokens < cost:
+            return None
+        lease.tokens -= cost
+        return RateLimitResult(
+            allowed=True,
+            limit=self.limit,
+            remaining=lease.remaining + lease.tokens,
+            retry_after=0,
+            reset_after=max(0.0, lease.reset_at - now),
+        )
+
+    async def _lease(self, key: str, cost: int) -> RateLimitResult:
+        size = max(self.lease_size, cost)
+        result = await self.limiter.hit(key, cost=size)
+        if not result.allowed and size > cost:
+            # Целой пачки не осталось — проверяем запрос поштучно.
+            return await self.limiter.hit(key, cost=cost)
+        if not result.allowed:
+            return result
+        now = monotonic()
+        self._evict(now)
+        self._leases[key] = _Lease(
+            tokens=size - cost,
+            expires_at=now + self.lease_ttl,
+            remaining=result.remaining,
+            reset_at=now + result.reset_after,
+        )
+        return RateLimitResult(
+            allowed=True,
+            limit=self.limit,
+            remaining=result.remaining + size - cost,
+            retry_after=0,
+            reset_after=result.reset_after,
+        )
+
+    def _evict(self, now: float) -> None:
+        if len(self._leases) < self.max_keys and len(self._locks) < self.max_keys:
+            return
+        self._leases = {k: v for k, v in self._leases.items() if v.expires_at > now}
+        self._locks = {k: v for k, v in self._locks.items() if v.locked()}
+        while len(self._leases) >= self.max_keys:
+            del self._leases[next(iter(self._leases))]
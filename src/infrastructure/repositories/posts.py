@@ -1,25 +1,121 @@
 import logging
-from typing import Literal
+from functools import cache
+from typing import Any, Literal
 
 from bson import ObjectId
-from motor.motor_asyncio import AsyncIOMotorClient
+from motor.motor_asyncio import (
+    AsyncIOMotorClient,
+    AsyncIOMotorClientSession,
+    AsyncIOMotorCollection,
+)
+from pymongo import WriteConcern
+from pymongo.read_preferences import (
+    Nearest,
+    Primary,
+    PrimaryPreferred,
+    Secondary,
+    SecondaryPreferred,
+)
 
 from src.application.interfaces.repositories.posts import AbstractPostsRepository
-from src.config import CONFIG
+from src.config import CONFIG, WriteConcernTierName
 from src.domain.entities.post import Post, Comment
 from src.domain.exceptions.auth import SubjectNotFoundError
+from src.timing import timed_methods
 
 
+_READ_PREFERENCES = {
+    "primaryPreferred": PrimaryPreferred,
+    "secondary": Secondary,
+    "secondaryPreferred": SecondaryPreferred,
+    "nearest": Nearest,
+}
+
+
+@cache
+def read_preference(
+    method: str,
+) -> Primary | PrimaryPreferred | Secondary | SecondaryPreferred | Nearest:
+    """Read preference метода репозитория из конфига (по умолчанию primary)."""
+    mode = CONFIG.MONGO_READ_PREFERENCES.get(method, "primary")
+    if mode == "primary":
+        return Primary()
+    return _READ_PREFERENCES[mode](max_staleness=CONFIG.MONGO_MAX_STALENESS_SECONDS)
+
+
+@cache
+def write_concern(tier: WriteConcernTierName) -> WriteConcern:
+    """Write concern уровня из конфига (по умолчанию — настройки клиента)."""
+    if (config := CONFIG.MONGO_WRITE_CONCERNS.get(tier)) is None:
+        return WriteConcern()
+    return WriteConcern(**config.model_dump(exclude_none=True))
+
+
+# Выражения $project для выбираемых полей ленты: лайки — сразу числом, анонс
+# старых постов без сохранённого excerpt — началом content.
+_SPARSE_PROJECTIONS: dict[str, Any] = {
+    "title": "$title",
+    "content": "$content",
+    "excerpt": {
+        "$ifNull": [
+            "$excerpt",
+            {"$substrCP": ["$content", 0, CONFIG.POST_EXCERPT_LENGTH]},
+        ]
+    },
+    "author": "$author",
+    "likes": {"$size": "$likes"},
+    "dislikes": {"$size": "$dislikes"},
+    "created_at": "$created_at",
+    "comments_count": "$comments_count",
+}
+
+
+def _recent_comments_lookup() -> dict[str, Any]:
+    return {
+        "$lookup": {
+            "from": "comments",
+            "localField": "_id",
+            "foreignField": "post_id",
+            "as": "recent_comments",
+            "pipeline": [
+                {"$match": {"parent_id": None}},  # только корневые комментарии
+                {"$sort": {"_id": -1}},
+                {"$limit": 5},
+            ],
+        }
+    }
+
+
+@timed_methods("mongo")
 class MongoPostsRepository(AbstractPostsRepository):
-    def __init__(self, mongo_client: AsyncIOMotorClient):
+    def __init__(
+        self,
+        mongo_client: AsyncIOMotorClient,
+        session: AsyncIOMotorClientSession | None = None,
+    ):
         self.mongo_client = mongo_client
+        self.session = session
         self.db = self.mongo_client[CONFIG.BLOG_DB_NAME]
 
+    def _read_collection(
+        self, name: str, method: str, stale_ok: bool
+    ) -> AsyncIOMotorCollection:
+        """Коллекция для чтения: реплики только если вызывающий допускает отставание."""
+        if not stale_ok:
+            return self.db[name]
+        return self.db[name].with_options(read_preference=read_preference(method))
+
+    def _write_collection(
+        self, name: str, tier: WriteConcernTierName
+    ) -> AsyncIOMotorCollection:
+        return self.db[name].with_options(write_concern=write_concern(tier))
+
     async def get_posts(
         self,
         last_id: str | None = None,
         limit: int = 20,
         sort: Literal["asc", "desc"] = "desc",
+        stale_ok: bool = False,
     ) -> tuple[list[Post], bool]:
         pipline = [
             {
@@ -37,51 +133,97 @@ class MongoPostsRepository(AbstractPostsRepository):
             },
             {"$sort": {"_id": -1 if sort == "desc" else 1}},
             {"$limit": limit + 1},
+            _recent_comments_lookup(),
+        ]
+        collection = self._read_collection("posts", "get_posts", stale_ok)
+        cursor = collection.aggregate(pipline, session=self.session)
+        result = [Post.from_dict(post) async for post in cursor]
+        has_next = len(result) > limit
+        return result[:limit], has_next
+
+    async def get_sparse_posts(
+        self,
+        fields: frozenset[str],
+        last_id: str | None = None,
+        limit: int = 20,
+        stale_ok: bool = False,
+    ) -> tuple[list[dict[str, Any]], bool]:
+        """
+        Лента только с выбранными полями: Mongo отдаёт проекцию, а комментарии
+        подтягиваются, только если выбраны. Документы сразу в виде для JSON.
+        """
+        pipeline: list[dict[str, Any]] = [
+            {"$match": {"_id": {"$lt": ObjectId(last_id)}} if last_id else {}},
+            {"$sort": {"_id": -1}},
+            {"$limit": limit + 1},
             {
-                "$lookup": {
-                    "from": "comments",
-                    "localField": "_id",
-                    "foreignField": "post_id",
-                    "as": "recent_comments",
-                    "pipeline": [
-                        {"$match": {"parent_id": None}},  # только корневые комментарии
-                        {"$sort": {"_id": -1}},
-                        {"$limit": 5},
-                    ],
+                "$project": {
+                    field: expression
+                    for field, expression in _SPARSE_PROJECTIONS.items()
+                    if field in fields
                 }
             },
         ]
-        cursor = self.db["posts"].aggregate(pipline)
-        result = [Post.from_dict(post) async for post in cursor]
+        if "recent_comments" in fields:
+            pipeline.append(_recent_comments_lookup())
+        collection = self._read_collection("posts", "get_posts", stale_ok)
+        result = []
+        async for post in collection.aggregate(pipeline, session=self.session):
+            post["id"] = str(post.pop("_id"))
+            if "recent_comments" in post:
+                post["recent_comments"] = [
+                    Comment.from_dict(comment).to_dict()
+                    for comment in post["recent_comments"]
+                ]
+            result.append(post)
         has_next = len(result) > limit
         return result[:limit], has_next
 
+    async def get_post(self, post_id: str, stale_ok: bool = False) -> Post | None:
+        """Один пост по _id (индекс) с последними комментариями, как в ленте."""
+        if not ObjectId.is_valid(post_id):
+            return None
+        pipeline = [
+            {"$match": {"_id": ObjectId(post_id)}},
+            {"$limit": 1},
+            _recent_comments_lookup(),
+        ]
+        collection = self._read_collection("posts", "get_post", stale_ok)
+        async for post in collection.aggregate(pipeline, session=self.session):
+            return Post.from_dict(post)
+        return None
+
     async def create_post(self, post: Post) -> Post:
-        res = await self.db["posts"].insert_one(
+        res = await self._write_collection("posts", "posts").insert_one(
             {
                 "title": post.title,
                 "content": post.content,
+                "excerpt": post.excerpt,
                 "author": post.author.to_dict(),  # type: ignore
                 "dislikes": [],
                 "likes": [],
                 "created_at": post.created_at.isoformat(),
                 "comments_count": 0,
-            }
+            },
+            session=self.session,
         )
         post.id = str(res.inserted_id)
         return post
 
     async def like_post(self, post_id: str, user_id: int) -> bool:
-        if not await self.db["posts"].find_one({"_id": ObjectId(post_id)}):
+        if not await self.db["posts"].find_one(
+            {"_id": ObjectId(post_id)}, session=self.session
+        ):
             logging.error(f"Post with id {post_id} not found")
             raise SubjectNotFoundError("Post not found")
 
-        res = await self.db["posts"].update_one(
+        res = await self._write_collection("posts", "votes").update_one(
             {"_id": ObjectId(post_id)},
             {
                 "$addToSet": {"likes": user_id},
                 "$pull": {"dislikes": user_id},
             },
+            session=self.session,
         )
         return bool(res.modified_count)
 
@@ -91,6 +233,7 @@ class MongoPostsRepository(AbstractPostsRepository):
         last_id: str | None = None,
         limit: int = 10,
         sort: Literal["asc", "desc"] = "desc",
+        stale_ok: bool = False,
     ) -> tuple[list[Comment], bool]:
         pipline = [
             {
@@ -111,33 +254,39 @@ class MongoPostsRepository(AbstractPostsRepository):
             {"$sort": {"_id": -1 if sort == "desc" else 1}},
             {"$limit": limit + 1},
         ]
+        collection = self._read_collection("comments", "get_comments", stale_ok)
         comments = [
             Comment.from_dict(comment)
-            async for comment in self.db["comments"].aggregate(pipline)
+            async for comment in collection.aggregate(pipline, session=self.session)
         ]
         has_next = len(comments) > limit
         return comments[:limit], has_next
 
     async def dislike_post(self, post_id: str, user_id: int) -> bool:
-        if not await self.db["posts"].find_one({"_id": ObjectId(post_id)}):
+        if not await self.db["posts"].find_one(
+            {"_id": ObjectId(post_id)}, session=self.session
+        ):
             logging.error(f"Post with id {post_id} not found")
             raise SubjectNotFoundError("Post not found")
 
-        res = await self.db["posts"].update_one(
+        res = await self._write_collection("posts", "votes").update_one(
             {"_id": ObjectId(post_id)},
             {
                 "$addToSet": {"dislikes": user_id},
                 "$pull": {"likes": user_id},
             },
+            session=self.session,
         )
         return bool(res.modified_count)
 
     async def create_comment(self, comment: Comment) -> Comment:
-        if not await self.db["posts"].find_one({"_id": ObjectId(comment.post_id)}):
+        if not await self.db["posts"].find_one(
+            {"_id": ObjectId(comment.post_id)}, session=self.session
+        ):
             logging.error(f"Post with id {comment.post_id} not found")
             raise SubjectNotFoundError("Post not found")
 
-        res = await self.db["comments"].insert_one(
+        res = await self._write_collection("comments", "comments").insert_one(
             {
                 "text": comment.text,
                 "author": comment.author.to_dict(),  # type: ignore
@@ -147,14 +296,16 @@ class MongoPostsRepository(AbstractPostsRepository):
                 "likes": [],
                 "answers_count": 0,
                 "created_at": comment.created_at.isoformat(),
-            }
+            },
+            session=self.session,
         )
         comments_count = await self.db["comments"].count_documents(
-            {"post_id": ObjectId(comment.post_id)}
+            {"post_id": ObjectId(comment.post_id)}, session=self.session
         )
-        await self.db["posts"].update_one(
+        await self._write_collection("posts", "comments").update_one(
             {"_id": ObjectId(comment.post_id)},
             {"$set": {"comments_count": comments_count}},
+            session=self.session,
         )
 
         comment.id = str(res.inserted_id)
@@ -166,6 +317,7 @@ class MongoPostsRepository(AbstractPostsRepository):
         last_id: str | None = None,
         limit: int = 10,
         sort: Literal["asc", "desc"] = "desc",
+        stale_ok: bool = False,
     ) -> tuple[list[Comment], bool]:
         pipeline = [
             {
@@ -185,23 +337,28 @@ class MongoPostsRepository(AbstractPostsRepository):
             {"$sort": {"_id": -1 if sort == "desc" else 1}},
             {"$limit": limit + 1},
         ]
+        collection = self._read_collection("comments", "get_answers", stale_ok)
         comments = [
             Comment.from_dict(comment)
-            async for comment in self.db["comments"].aggregate(pipeline)
+            async for comment in collection.aggregate(pipeline, session=self.session)
         ]
         has_next = len(comments) > limit
         return comments[:limit], has_next
 
     async def create_answer(self, answer: Comment, comment_id: str) -> Comment:
-        if not await self.db["comments"].find_one({"_id": ObjectId(comment_id)}):
+        if not await self.db["comments"].find_one(
+            {"_id": ObjectId(comment_id)}, session=self.session
+        ):
             logging.error(f"Comment with id {comment_id} not found")
             raise SubjectNotFoundError("Comment not found")
 
-        if not await self.db["posts"].find_one({"_id": ObjectId(answer.post_id)}):
+        if not await self.db["posts"].find_one(
+            {"_id": ObjectId(answer.post_id)}, session=self.session
+        ):
             logging.error(f"Post with id {answer.post_id} not found")
             raise SubjectNotFoundError("Post not found")
 
-        res = await self.db["comments"].insert_one(
+        res = await self._write_collection("comments", "comments").insert_one(
             {
                 "text": answer.text,
                 "author": answer.author.to_dict(),  # type: ignore
@@ -211,41 +368,50 @@ class MongoPostsRepository(AbstractPostsRepository):
                 "likes": [],
                 "answers_count": 0,
                 "created_at": answer.created_at.isoformat(),
-            }
+            },
+            session=self.session,
         )
         answers_count = await self.db["comments"].count_documents(
-            {"parent_id": ObjectId(comment_id)}
+            {"parent_id": ObjectId(comment_id)}, session=self.session
         )
-        await self.db["comments"].update_one(
-            {"_id": ObjectId(comment_id)}, {"$set": {"answers_count": answers_count}}
+        await self._write_collection("comments", "comments").update_one(
+            {"_id": ObjectId(comment_id)},
+            {"$set": {"answers_count": answers_count}},
+            session=self.session,
         )
         answer.id = str(res.inserted_id)
         return answer
 
     async def like_comment(self, comment_id: str, user_id: int) -> bool:
-        if not await self.db["comments"].find_one({"_id": ObjectId(comment_id)}):
+        if not await self.db["comments"].find_one(
+            {"_id": ObjectId(comment_id)}, session=self.session
+        ):
             logging.error(f"Comment with id {comment_id} not found")
             raise SubjectNotFoundError("Comment not found")
 
-        res = await self.db["comments"].update_one(
+        res = await self._write_collection("comments", "votes").update_one(
             {"_id": ObjectId(comment_id)},
             {
                 "$addToSet": {"likes": user_id},
                 "$pull": {"dislikes": user_id},
             },
+            session=self.session,
         )
         return bool(res.modified_count)
 
     async def dislike_comment(self, comment_id: str, user_id: int) -> bool:
-        if not await self.db["comments"].find_one({"_id": ObjectId(comment_id)}):
+        if not await self.db["comments"].find_one(
+            {"_id": ObjectId(comment_id)}, session=self.session
+        ):
             logging.error(f"Comment with id {comment_id} not found")
             raise SubjectNotFoundError("Comment not found")
 
-        res = await self.db["comments"].update_one(
+        res = await self._write_collection("comments", "votes").update_one(
             {"_id": ObjectId(comment_id)},
             {
                 "$addToSet": {"dislikes": user_id},
                 "$pull": {"likes": user_id},
             },
+            session=self.session,
         )
         return bool(res.modified_count)
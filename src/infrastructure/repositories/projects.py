@@ -12,8 +12,10 @@ from src.domain.filters.projects import ProjectFilter
 from src.infrastructure.models.mapping import to_model
 from src.infrastructure.models.project import ProjectModel, TagModel, TechnologyModel
 from src.infrastructure.repositories.alchemy_mixin import SQLAlchemyMixin
+from src.timing import timed_methods
 
 
+@timed_methods("sql")
 class SQLProjectsRepository(AbstractProjectsRepository, SQLAlchemyMixin):
     model = ProjectModel
 
@@ -1,17 +1,89 @@
 import logging
+from time import time
+from uuid import uuid4
 
 from redis import ResponseError
 from redis.asyncio import Redis
 
 from src.application.interfaces.repositories.auth import AbstractAuthRepository
 from src.infrastructure.models.auth import AuthMetaData, Payload
+from src.timing import timed_methods
 
 logger = logging.getLogger(__name__)
 
+# Сессии пользователя индексируются в хеше sessions:{sub}: поле "{jti}:{device}",
+# значение — exp токена. Логин, логаут и список устройств стоят O(сессий
+# пользователя), а не KEYS по всей базе. Регистрация меняет ключ токена и индекс
+# одним скриптом; удаление — это чтение индекса и скрипт (см. DELETE_SESSIONS_SCRIPT).
 
+# KEYS[1] — ключ токена, KEYS[2] — индекс; ARGV: токен, exp, поле индекса, now.
+REGISTER_SESSION_SCRIPT = """
+redis.call('SET', KEYS[1], ARGV[1], 'EXAT', ARGV[2])
+redis.call('HSET', KEYS[2], ARGV[3], ARGV[2])
+local now = tonumber(ARGV[4])
+local max_exp = tonumber(ARGV[2])
+local entries = redis.call('HGETALL', KEYS[2])
+for i = 1, #entries, 2 do
+    local exp = tonumber(entries[i + 1])
+    if exp <= now then
+        redis.call('HDEL', KEYS[2], entries[i])
+    elseif exp > max_exp then
+        max_exp = exp
+    end
+end
+redis.call('EXPIREAT', KEYS[2], max_exp)
+return 1
+"""
+
+# Удаление в два шага: поля индекса читаются HGETALL, а скрипт получает все
+# ключи токенов явно в KEYS — внутри скрипта имена ключей не собираются.
+# Атомарен только скрипт: сессия, зарегистрированная между чтением индекса и
+# скриптом, не удаляется — она выдана уже после логаута.
+# KEYS[1] — индекс, KEYS[2..] — ключи токенов; ARGV — поля индекса на удаление
+# (удаляемые сессии и уже истёкшие).
+DELETE_SESSIONS_SCRIPT = """
+local deleted = 0
+if #KEYS > 1 then
+    deleted = redis.call('DEL', unpack(KEYS, 2))
+end
+if #ARGV > 0 then
+    redis.call('HDEL', KEYS[1], unpack(ARGV))
+end
+return deleted
+"""
+
+# Добавить в индекс сессию, созданную до его появления, и продлить индекс до её exp.
+# KEYS[1] — индекс; ARGV: поле, exp, now.
+INDEX_SESSION_SCRIPT = """
+redis.call('HSETNX', KEYS[1], ARGV[1], ARGV[2])
+if redis.call('TTL', KEYS[1]) < tonumber(ARGV[2]) - tonumber(ARGV[3]) then
+    redis.call('EXPIREAT', KEYS[1], ARGV[2])
+end
+return 1
+"""
+# Снять блокировку ротации, только если она всё ещё наша: после истечения PX
+# её мог захватить другой запрос. KEYS[1] — блокировка; ARGV[1] — токен владельца.
+UNLOCK_ROTATION_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+# Флаг выполненной миграции индекса и блокировка на время её прохода: флаг
+# ставится только после полного SCAN, а блокировка упавшего воркера истекает.
+SESSIONS_INDEXED_KEY = "sessions:indexed"
+SESSIONS_INDEXING_LOCK_KEY = "sessions:indexing"
+SESSIONS_INDEXING_LOCK_SECONDS = 600
+
+
+@timed_methods("auth_repo")
 class JWTRedisAuthRepository(AbstractAuthRepository):
     def __init__(self, redis_client: Redis):
         self.redis_client = redis_client
+        self._register_session = redis_client.register_script(REGISTER_SESSION_SCRIPT)
+        self._delete_sessions = redis_client.register_script(DELETE_SESSIONS_SCRIPT)
+        self._index_session = redis_client.register_script(INDEX_SESSION_SCRIPT)
+        self._unlock_rotation = redis_client.register_script(UNLOCK_ROTATION_SCRIPT)
 
     async def __aenter__(self) -> "JWTRedisAuthRepository":
         await self.redis_client.__aenter__()
@@ -39,27 +111,101 @@ class JWTRedisAuthRepository(AbstractAuthRepository):
     async def get_active_all(  # type: ignore
         self, subject: str = "*", credentials_id: str = "*", device_id: str = "*"
     ) -> list[AuthMetaData]:
-        keys: list[str] = await self.redis_client.keys(
-            self.make_key(subject, credentials_id, device_id)
+        if subject == "*":
+            return await self._scan_all(credentials_id, device_id)
+
+        index: dict[str, str] = await self.redis_client.hgetall(
+            self.make_index_key(subject)
         )
-        res = [
-            AuthMetaData(key=k, payload=Payload(**await self.redis_client.hgetall(k)))
-            for k in keys
-        ]
+        now = int(time())
+        sessions: list[Payload] = []
+        for field, expiration in index.items():
+            jti, _, device = field.partition(":")
+            if int(expiration) <= now:
+                continue
+            if credentials_id not in ("*", jti) or device_id not in ("*", device):
+                continue
+            payload = Payload(
+                sub=subject, expiration=int(expiration), device_id=device, token=jti
+            )
+            sessions.append(payload)
+        if not sessions:
+            return []
+
+        keys = [self.make_key(subject, s.token, s.device_id) for s in sessions]
+        tokens = await self.redis_client.mget(keys)
+        res = []
+        for key, session, token in zip(keys, sessions, tokens):
+            if token is None:
+                continue
+            session.token = token
+            res.append(AuthMetaData(key=key, payload=session))
         return res
 
     async def delete(self, subject_id: str, device_id: str) -> bool:
-        keys: list[str] = await self.redis_client.keys(
-            self.make_key(subject=subject_id, credentials_id="*", device_id=device_id)
-        )
-        if not keys:
+        """Удалить все сессии субъекта на устройстве ("*" — на всех устройствах)."""
+        index_key = self.make_index_key(subject_id)
+        now = int(time())
+        keys, fields = [], []
+        for field, expiration in (await self.redis_client.hgetall(index_key)).items():
+            device = field.partition(":")[2]
+            if device_id in ("*", device):
+                keys.append(self.make_prefix(subject_id) + field)
+                fields.append(field)
+            elif int(expiration) <= now:
+                fields.append(field)
+        if not fields:
             return False
         try:
-            await self.redis_client.delete(*keys)
+            deleted = await self._delete_sessions(keys=[index_key, *keys], args=fields)
         except ResponseError as e:
-            logger.warning(f"Redis delete failed: {keys}", exc_info=e)
+            logger.warning(f"Redis delete failed: {subject_id}:{device_id}", exc_info=e)
             return False
-        return True
+        return bool(deleted)
+
+    async def index_legacy_sessions(self) -> int:
+        """
+        Разовая миграция: сессии, созданные до индекса sessions:{sub}, попадают
+        в него, чтобы логаут и отзыв токенов их видели. Проходит SCAN по ключам
+        токенов, пока на базе нет флага SESSIONS_INDEXED_KEY; прерванный проход
+        повторяется при следующем старте (HSETNX делает повтор безопасным).
+        """
+        if await self.redis_client.exists(SESSIONS_INDEXED_KEY):
+            return 0
+        locked = await self.redis_client.set(
+            SESSIONS_INDEXING_LOCK_KEY, 1, ex=SESSIONS_INDEXING_LOCK_SECONDS, nx=True
+        )
+        if not locked:
+            return 0  # миграцию уже выполняет другой воркер
+        indexed = 0
+        try:
+            pattern = self.make_prefix("*") + "*"
+            async for key in self.redis_client.scan_iter(match=pattern):
+                ttl = await self.redis_client.ttl(key)
+                if ttl <= 0:
+                    continue
+                subject, _, field = key.removeprefix("tokens:").partition(":")
+                now = int(time())
+                await self._index_session(
+                    keys=[self.make_index_key(subject)], args=[field, now + ttl, now]
+                )
+                indexed += 1
+            await self.redis_client.set(SESSIONS_INDEXED_KEY, int(time()))
+        finally:
+            await self.redis_client.delete(SESSIONS_INDEXING_LOCK_KEY)
+        if indexed:
+            logger.info(f"Indexed {indexed} sessions created before the index")
+        return indexed
+
+    async def delete_one(
+        self, subject: str, credentials_id: str, device_id: str
+    ) -> bool:
+        key = self.make_key(subject, credentials_id, device_id)
+        async with self.redis_client.pipeline(transaction=True) as pipe:
+            pipe.delete(key)
+            pipe.hdel(self.make_index_key(subject), f"{credentials_id}:{device_id}")
+            deleted, _ = await pipe.execute()
+        return bool(deleted)
 
     async def register(
         self,
@@ -69,12 +215,110 @@ class JWTRedisAuthRepository(AbstractAuthRepository):
         credentials: str,
         device_id: str,
     ) -> bool:
+        """expiration — абсолютное время истечения (unix timestamp, как exp в JWT)."""
         key = self.make_key(
             subject=subject, credentials_id=credentials_id, device_id=device_id
         )
-        res = await self.redis_client.set(name=key, value=credentials, ex=expiration)
+        res = await self._register_session(
+            keys=[key, self.make_index_key(subject)],
+            args=[
+                credentials,
+                expiration,
+                f"{credentials_id}:{device_id}",
+                int(time()),
+            ],
+        )
         return bool(res)
 
+    async def lock_rotation(
+        self, subject: str, credentials_id: str, timeout: float
+    ) -> str | None:
+        key = self.make_rotation_lock_key(subject, credentials_id)
+        token = uuid4().hex
+        locked = await self.redis_client.set(
+            key, token, px=int(timeout * 1000), nx=True
+        )
+        return token if locked else None
+
+    async def unlock_rotation(
+        self, subject: str, credentials_id: str, token: str
+    ) -> None:
+        await self._unlock_rotation(
+            keys=[self.make_rotation_lock_key(subject, credentials_id)], args=[token]
+        )
+
+    async def is_rotation_locked(self, subject: str, credentials_id: str) -> bool:
+        return bool(
+            await self.redis_client.exists(
+                self.make_rotation_lock_key(subject, credentials_id)
+            )
+        )
+
+    async def save_rotated(
+        self,
+        subject: str,
+        credentials_id: str,
+        device_id: str,
+        credentials: str,
+        expiration: int,
+    ) -> None:
+        key = self.make_rotated_key(subject, credentials_id, device_id)
+        await self.redis_client.set(key, credentials, ex=expiration)
+
+    async def get_rotated(
+        self, subject: str, credentials_id: str, device_id: str
+    ) -> str | None:
+        return await self.redis_client.get(  # type: ignore
+            self.make_rotated_key(subject, credentials_id, device_id)
+        )
+
+    async def revoke(self, subject: str, revoked_at: float, expiration: int) -> None:
+        await self.redis_client.set(
+            self.make_revoked_key(subject), revoked_at, ex=expiration
+        )
+
+    async def revoked_at(self, subject: str) -> float | None:
+        value = await self.redis_client.get(self.make_revoked_key(subject))
+        return float(value) if value is not None else None
+
+    async def _scan_all(
+        self, credentials_id: str, device_id: str
+    ) -> list[AuthMetaData]:
+        """Сессии всех пользователей: индекса для этого нет, поэтому SCAN вместо KEYS."""
+        pattern = self.make_key("*", credentials_id, device_id)
+        keys = [key async for key in self.redis_client.scan_iter(match=pattern)]
+        if not keys:
+            return []
+        tokens = await self.redis_client.mget(keys)
+        res = []
+        for key, token in zip(keys, tokens):
+            if token is None:
+                continue
+            _, sub, _, device = key.split(":", 3)
+            payload = Payload(sub=sub, expiration=0, device_id=device, token=token)
+            res.append(AuthMetaData(key=key, payload=payload))
+        return res
+
+    @staticmethod
+    def make_revoked_key(subject: str) -> str:
+        return f"revoked:{subject}"
+
+    @staticmethod
+    def make_rotation_lock_key(subject: str, credentials_id: str) -> str:
+        return f"rotation:{subject}:{credentials_id}"
+
     @staticmethod
-    def make_key(subject: str, credentials_id: str, device_id: str) -> str:
-        return f"tokens:{subject}:{credentials_id}:{device_id}"
+    def make_rotated_key(subject: str, credentials_id: str, device_id: str) -> str:
+        return f"rotated:{subject}:{credentials_id}:{device_id}"
+
+    @staticmethod
+    def make_index_key(subject: str) -> str:
+        return f"sessions:{subject}"
+
+    @staticmethod
+    def make_prefix(subject: str) -> str:
+        return f"tokens:{subject}:"
+
+    @classmethod
+    def make_key(cls, subject: str, credentials_id: str, device_id: str) -> str:
+        return f"{cls.make_prefix(subject)}{credentials_id}:{device_id}"
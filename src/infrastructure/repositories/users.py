@@ -1,26 +1,34 @@
+from typing import Sequence
+
 from sqlalchemy import Delete, Update, select
 
 from src.application.interfaces.repositories.users import AbstractUsersRepository
-from src.domain.entities.user import User
+from src.domain.entities.user import User, Author, RolesEnum
 from src.domain.filters.users import UserFilter
 from src.infrastructure.models.user import UserModel, RoleModel
 from src.infrastructure.repositories.alchemy_mixin import SQLAlchemyMixin
+from src.timing import timed_methods
 
 
+@timed_methods("sql")
 class SQLUsersRepository(AbstractUsersRepository, SQLAlchemyMixin):
     model = UserModel
 
-    async def register(self, user: User) -> User:
+    async def _ensure_role(self, role: RolesEnum) -> RoleModel:
         # Проверяем, существует ли роль в базе по id
-        stmt = select(RoleModel).where(RoleModel.id == user.role.value)
+        stmt = select(RoleModel).where(RoleModel.id == role.value)
         result = await self.session.execute(stmt)
-        role = result.scalar_one_or_none()
+        role_model = result.scalar_one_or_none()
 
-        if not role:
+        if not role_model:
             # Если роли нет, создаём новую
-            role = RoleModel(id=user.role.value, name=user.role.name)
-            self.session.add(role)
+            role_model = RoleModel(id=role.value, name=role.name)
+            self.session.add(role_model)
             await self.session.flush()  # Сохраняем роль, чтобы получить её id
+        return role_model
+
+    async def register(self, user: User) -> User:
+        role = await self._ensure_role(user.role)
 
         # Создаём пользователя с привязкой к роли
         user_model = UserModel(
@@ -48,6 +56,22 @@ class SQLUsersRepository(AbstractUsersRepository, SQLAlchemyMixin):
             return None
         return user.to_domain()  # type: ignore
 
+    async def get_authors(self, user_ids: Sequence[int]) -> dict[int, Author]:
+        # Только нужные колонки: хеш пароля и роль не тянем.
+        query = select(self.model.id, self.model.username, self.model.email).where(
+            self.model.id.in_(user_ids)
+        )
+        res = await self.session.execute(query)
+        return {
+            row.id: Author(
+                id=row.id,
+                name=row.username,
+                email=row.email,
+                photo_url="Coming soon...",
+            )
+            for row in res
+        }
+
     async def delete(self, user_filter: UserFilter) -> bool:
         stmt = Delete(self.model)
         if user_filter.email:
@@ -72,3 +96,16 @@ class SQLUsersRepository(AbstractUsersRepository, SQLAlchemyMixin):
             stmt = stmt.where(self.model.id == user_filter.id)
         res = await self.session.execute(stmt)
         return res.scalars().one().to_domain()  # type: ignore
+
+    async def set_role(self, user_filter: UserFilter, role: RolesEnum) -> User | None:
+        await self._ensure_role(role)
+        stmt = Update(self.model).values(role_id=role.value).returning(self.model)
+        if user_filter.email:
+            stmt = stmt.where(self.model.email == user_filter.email)
+        if user_filter.username:
+            stmt = stmt.where(self.model.username == user_filter.username)
+        if user_filter.id:
+            stmt = stmt.where(self.model.id == user_filter.id)
+        res = await self.session.execute(stmt)
+        model = res.scalars().one_or_none()
+        return model.to_domain() if model is not None else None
@@ -0,0 +1,46 @@
+from typing import Any
+from urllib.parse import urlsplit
+
+from pydantic import BaseModel, Field, field_validator
+
+from src.config import CONFIG
+
+
+class BatchItemSchema(BaseModel):
+    id: str | None = Field(default=None, max_length=64)
+    path: str = Field(max_length=2048, examples=["/posts/?limit=10"])
+
+    @field_validator("path", mode="after")
+    def validate_path(cls, value: str) -> str:
+        # Только путь этого же приложения: без схемы и хоста.
+        url = urlsplit(value)
+        if url.scheme or url.netloc or not url.path.startswith("/"):
+            raise ValueError("Path must be an absolute path of this API")
+        # Служебные маршруты (/metrics, /auth, сам /batch) в пакет не попадают.
+        segments = url.path.split("/")
+        if (
+            "." in segments
+            or ".." in segments
+            or not any(
+                url.path == prefix or url.path.startswith(prefix + "/")
+                for prefix in CONFIG.BATCH_ALLOWED_PREFIXES
+            )
+        ):
+            raise ValueError("Path is not available in a batch")
+        return value
+
+
+class BatchRequestSchema(BaseModel):
+    requests: list[BatchItemSchema] = Field(
+        min_length=1, max_length=CONFIG.BATCH_MAX_REQUESTS
+    )
+
+
+class BatchItemResponseSchema(BaseModel):
+    id: str | None
+    status: int
+    body: Any
+
+
+class BatchResponseSchema(BaseModel):
+    responses: list[BatchItemResponseSchema]
@@ -3,7 +3,7 @@ from typing import Any
 
 from pydantic import BaseModel, model_validator, field_validator
 
-from src.domain.entities.post import Post, Comment
+from src.domain.entities.post import POST_FIELDS, Post, Comment
 from src.infrastructure.schemas.user import Author
 
 
@@ -135,6 +135,73 @@ class ReadPostSchema(CreatePostSchema):
         return data
 
 
+class SparsePostSchema(BaseModel):
+    """
+    Пост с выбранными полями (?fields=, ?excerpt=true). Сериализуется с
+    exclude_unset: в ответ попадают только выбранные поля и id.
+    """
+
+    id: str
+    title: str | None = None
+    content: str | None = None
+    excerpt: str | None = None
+    author: Author | None = None
+    dislikes: int | None = None
+    likes: int | None = None
+    created_at: datetime | None = None
+    comments_count: int | None = None
+    recent_comments: CommentsResponseSchema | None = None
+
+    @model_validator(mode="before")
+    def validate_recent_comments(cls, data: dict[str, Any]) -> dict[str, Any]:
+        if "recent_comments" not in data:
+            return data
+        comments = data["recent_comments"]
+        return {
+            **data,
+            "recent_comments": {
+                "comments": comments,
+                "last_id": comments[-1]["id"] if comments else None,
+                "has_next": data.get("comments_count", len(comments)) > len(comments),
+            },
+        }
+
+
+def select_post_fields(fields: str | None, excerpt: bool) -> frozenset[str] | None:
+    """
+    Поля поста из ?fields=title,author&excerpt=true. None — пост целиком.
+    excerpt заменяет content анонсом; recent_comments тянет за собой
+    comments_count (нужен для has_next).
+    """
+    if fields is None and not excerpt:
+        return None
+    if fields is None:
+        selected = set(POST_FIELDS - {"excerpt"})
+    else:
+        selected = {field.strip() for field in fields.split(",") if field.strip()}
+    if unknown := selected - POST_FIELDS:
+        raise ValueError(f"Unknown post fields: {', '.join(sorted(unknown))}")
+    if not selected:
+        raise ValueError("At least one post field must be selected")
+    if excerpt and "content" in selected:
+        selected = (selected - {"content"}) | {"excerpt"}
+    if "recent_comments" in selected:
+        selected.add("comments_count")
+    return frozenset(selected)
+
+
+class SparsePostsResponseSchema(BaseModel):
+    posts: list[SparsePostSchema]
+    last_id: str | None
+    has_next: bool
+
+    @model_validator(mode="before")
+    def set_last_id(cls, values: dict[str, Any]) -> dict[str, Any]:
+        posts = values["posts"]
+        values["last_id"] = posts[-1]["id"] if posts else None
+        return values
+
+
 class PostsResponseSchema(BaseModel):
     posts: list[ReadPostSchema]
     last_id: str | None
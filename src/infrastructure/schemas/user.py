@@ -3,6 +3,20 @@ from typing import Annotated
 from fastapi import Form
 from pydantic import BaseModel, EmailStr, field_validator
 
+from src.domain.entities.user import RolesEnum
+
+
+def check_password_strength(value: str) -> str:
+    if len(value) < 8:
+        raise ValueError("Password must be at least 8 characters long")
+    if not any(char.isupper() for char in value):
+        raise ValueError("Password must contain at least one uppercase letter")
+    if not any(char.islower() for char in value):
+        raise ValueError("Password must contain at least one lowercase letter")
+    if not any(char.isdigit() for char in value):
+        raise ValueError("Password must contain at least one digit")
+    return value
+
 
 class LoginUserSchema(BaseModel):
     email: Annotated[EmailStr, Form()]
@@ -14,15 +28,20 @@ class RegisterUserSchema(LoginUserSchema):
 
     @field_validator("password")
     def validate_password(cls, value: str) -> str:
-        if len(value) < 8:
-            raise ValueError("Password must be at least 8 characters long")
-        if not any(char.isupper() for char in value):
-            raise ValueError("Password must contain at least one uppercase letter")
-        if not any(char.islower() for char in value):
-            raise ValueError("Password must contain at least one lowercase letter")
-        if not any(char.isdigit() for char in value):
-            raise ValueError("Password must contain at least one digit")
-        return value
+        return check_password_strength(value)
+
+
+class ChangePasswordSchema(BaseModel):
+    password: str
+    new_password: str
+
+    @field_validator("new_password")
+    def validate_new_password(cls, value: str) -> str:
+        return check_password_strength(value)
+
+
+class ChangeRoleSchema(BaseModel):
+    role: RolesEnum
 
 
 class Author(BaseModel):
@@ -1,15 +1,17 @@
+import asyncio
+import json
 import logging
 import uuid
 from datetime import datetime, UTC, timedelta
-from typing import Any
+from typing import Any, Awaitable, Callable
 
-import bcrypt
 import jwt
 
 from src.application.interfaces.credentials import Credentials
+from src.application.interfaces.repositories.auth import AbstractAuthRepository
 from src.application.interfaces.services.auth import AbstractAuthService
 from src.config import CONFIG
-from src.domain.entities.user import User, RolesEnum
+from src.domain.entities.user import User, RolesEnum, Author
 from src.domain.exceptions.auth import TokenError, AuthError
 from src.domain.utils import safe_as_dict
 from src.domain.value_objects.auth import AuthorizationContext
@@ -21,16 +23,33 @@ from src.infrastructure.credentials import (
     Refresh,
     Access,
 )
+from src.infrastructure.hashing import BcryptHasher
+from src.infrastructure.keys import JwtKeyManager
+from src.infrastructure.token_cache import VerifiedTokenCache
 
 logger = logging.getLogger("auth_service")
 
 
 class JwtAuthService(AbstractAuthService):
+    def __init__(
+        self,
+        auth_repo: AbstractAuthRepository,
+        keys: JwtKeyManager,
+        token_cache: VerifiedTokenCache,
+        hasher: BcryptHasher,
+    ):
+        super().__init__(auth_repo=auth_repo)
+        self.keys = keys
+        self.token_cache = token_cache
+        self.hasher = hasher
+        # Токены, проверенные снятым с ротации ключом, не должны жить в кеше.
+        keys.on_reload(token_cache.clear)
+
     async def authenticate(
         self, email: str, password: str, user: User | None, device_id: str
     ) -> Credentials:
-        user_password = user.password if user is not None else uuid.uuid4().bytes
-        if self.check_password(user_password, password) and user is not None:
+        user_password = user.password if user is not None else None
+        if await self.check_password(user_password, password) and user is not None:
             await self.auth_repo.delete(str(user.id), device_id)
             access = self.create_access_token(user)
             new_refresh = self.create_refresh_token(user)
@@ -50,52 +69,121 @@ class JwtAuthService(AbstractAuthService):
     ) -> AuthorizationContext:
         if credentials is None:
             return AuthorizationContext(user_id=None, role=RolesEnum.GUEST)
-        payload = self.decode_token(credentials.get_authorize())
-        if not payload or payload.type != TokenType.ACCESS:
+        token = credentials.get_authorize()
+        if not isinstance(token, str):
             raise TokenError()
-        if not isinstance(payload, AccessTokenPayload):
-            raise TokenError("Invalid token type")
+        # Повторно предъявленный токен уже проверен — не гоняем RS256 заново.
+        # Смена файлов ключей замечается и при попаданиях в кеш.
+        self.keys.maybe_reload()
+        if (payload := self.token_cache.get(token)) is None:
+            payload = self.validate_access_token(token)
+            self.token_cache.put(token, payload)
+        author = None
+        if payload.name is not None and payload.email is not None:
+            author = Author(
+                id=int(payload.sub),
+                name=payload.name,
+                email=payload.email,
+                photo_url="Coming soon...",
+            )
         return AuthorizationContext(
-            user_id=int(payload.sub), role=RolesEnum(payload.role)
+            user_id=int(payload.sub),
+            role=RolesEnum(payload.role),
+            author=author,
+            # У токенов, выпущенных до появления iat, время выпуска выводится из exp.
+            issued_at=payload.iat or payload.exp - CONFIG.ACCESS_TOKEN_EXPIRE_SECONDS,
         )
 
     async def renew_credentials(
-        self, credentials: Credentials, user: User, device_id: str
+        self,
+        credentials: Credentials,
+        device_id: str,
+        get_user: Callable[[int], Awaitable[User | None]],
     ) -> Credentials:
-        payload = self.decode_token(credentials.get_authenticate())
-        if not payload or not isinstance(payload, RefreshTokenPayload):
-            raise TokenError()
-        token = await self.auth_repo.get_active_one(
-            str(payload.sub), payload.jti, device_id=device_id
-        )
-        if token is None:
-            raise TokenError("Unknown token")
-        if payload.sub is None:
-            raise TokenError("Unknown user")
-
-        await self.auth_repo.delete(str(payload.sub), payload.jti)
-
-        access = self.create_access_token(user)
-        refresh = self.create_refresh_token(user)
-
-        await self.auth_repo.register(
-            subject=str(refresh.payload.sub),
-            credentials_id=refresh.payload.jti,
-            expiration=refresh.payload.exp,
-            credentials=refresh.token,
-            device_id=device_id,
-        )
+        payload = self.validate_refresh_token(credentials.get_authenticate())
+        subject, jti = str(payload.sub), payload.jti
+        # Браузер шлёт несколько запросов с одним истёкшим access токеном:
+        # ротацию выполняет один, остальные получают выпущенную им пару.
+        if (renewed := await self._get_rotated(subject, jti, device_id)) is not None:
+            return renewed
+        timeout = CONFIG.REFRESH_ROTATION_LOCK_SECONDS
+        lock = await self.auth_repo.lock_rotation(subject, jti, timeout)
+        if lock is None:
+            return await self._wait_rotated(subject, jti, device_id, timeout)
+        try:
+            # Ротация могла завершиться между проверкой и захватом блокировки.
+            if (
+                renewed := await self._get_rotated(subject, jti, device_id)
+            ) is not None:
+                return renewed
+            if not await self.auth_repo.is_active(subject, jti, device_id):
+                raise TokenError("Unknown token")
+            user = await get_user(int(subject))
+            if user is None:
+                raise TokenError("User not found")
 
+            access = self.create_access_token(user)
+            refresh = self.create_refresh_token(user)
+            await self.auth_repo.register(
+                subject=str(refresh.payload.sub),
+                credentials_id=refresh.payload.jti,
+                expiration=refresh.payload.exp,
+                credentials=refresh.token,
+                device_id=device_id,
+            )
+            renewed = JwtCredentials(authorize=access.token, authenticate=refresh.token)
+            # Сначала сохраняем новую пару, потом удаляем старый токен, чтобы
+            # опоздавшие запросы не попали в окно, где нет ни того, ни другого.
+            await self.auth_repo.save_rotated(
+                subject=subject,
+                credentials_id=jti,
+                device_id=device_id,
+                credentials=json.dumps(renewed.get_raw_data()),
+                expiration=CONFIG.REFRESH_ROTATION_GRACE_SECONDS,
+            )
+            await self.auth_repo.delete_one(subject, jti, device_id)
+            return renewed
+        finally:
+            await self.auth_repo.unlock_rotation(subject, jti, lock)
+
+    async def _get_rotated(
+        self, subject: str, jti: str, device_id: str
+    ) -> JwtCredentials | None:
+        raw = await self.auth_repo.get_rotated(subject, jti, device_id)
+        if raw is None:
+            return None
+        data = json.loads(raw)
         return JwtCredentials(
-            authorize=access.token,
-            authenticate=refresh.token,
+            authorize=data["access_token"], authenticate=data["refresh_token"]
         )
 
-    @staticmethod
-    def check_password(user_password: bytes, plain_password: str) -> bool:
-        return bcrypt.checkpw(plain_password.encode(), user_password)  # type: ignore
+    async def _wait_rotated(
+        self, subject: str, jti: str, device_id: str, timeout: float
+    ) -> JwtCredentials:
+        deadline = asyncio.get_running_loop().time() + timeout
+        while asyncio.get_running_loop().time() < deadline:
+            await asyncio.sleep(0.05)
+            if (
+                renewed := await self._get_rotated(subject, jti, device_id)
+            ) is not None:
+                return renewed
+            # Блокировки нет, а пары нет: ротация завершилась ошибкой
+            # (например, токен уже отозван) — ждать до таймаута незачем.
+            if not await self.auth_repo.is_rotation_locked(subject, jti):
+                if (
+                    renewed := await self._get_rotated(subject, jti, device_id)
+                ) is not None:
+                    return renewed
+                raise TokenError("Token rotation failed")
+        raise TokenError("Token rotation timeout")
+
+    async def check_password(
+        self, user_password: bytes | None, plain_password: str
+    ) -> bool:
+        return await self.hasher.verify(plain_password, user_password)
 
     def create_access_token(self, user: User) -> Access:
+        with_claims = CONFIG.ACCESS_TOKEN_AUTHOR_CLAIMS
         payload = AccessTokenPayload(
             iss="portfolio_backend",
             sub=str(user.id),
@@ -107,6 +195,9 @@ class JwtAuthService(AbstractAuthService):
                 ).timestamp()
             ),
             type=TokenType.ACCESS,
+            iat=datetime.now(UTC).timestamp(),
+            name=user.username if with_claims else None,
+            email=user.email if with_claims else None,
         )
         return Access(token=self._create_token(payload), payload=payload)
 
@@ -127,29 +218,38 @@ class JwtAuthService(AbstractAuthService):
         )
         return Refresh(token=self._create_token(payload), payload=payload)
 
-    @staticmethod
-    def hash_password(password: str) -> bytes:
-        hash_pass: bytes = bcrypt.hashpw(password.encode(), bcrypt.gensalt())
-        return hash_pass
+    async def hash_password(self, password: str) -> bytes:
+        return await self.hasher.hash(password)
 
-    @staticmethod
-    def _create_token(payload: RefreshTokenPayload | AccessTokenPayload) -> str:
+    def needs_rehash(self, password_hash: bytes) -> bool:
+        return self.hasher.needs_rehash(password_hash)
+
+    def _create_token(self, payload: RefreshTokenPayload | AccessTokenPayload) -> str:
+        signing_key = self.keys.signing_key
         token: str = jwt.encode(
             payload=safe_as_dict(payload),
-            key=CONFIG.JWT_PRIVATE_KEY.read_text(encoding="utf-8"),
-            algorithm="RS256",
+            key=signing_key.key,  # type: ignore[arg-type]
+            algorithm=signing_key.algorithm,
+            headers={"kid": signing_key.kid},
         )
         return token
 
-    @staticmethod
-    def decode_token(token: str) -> RefreshTokenPayload | AccessTokenPayload | None:
+    def decode_token(
+        self, token: str
+    ) -> RefreshTokenPayload | AccessTokenPayload | None:
         try:
             if not isinstance(token, str):
                 return None
+            kid = jwt.get_unverified_header(token).get("kid")
+            key = self.keys.verification_key(kid)
+            if key is None:
+                logger.warning(f"Unknown JWT key id: {kid}")
+                return None
+            # Алгоритм берём из ключа, а не из заголовка токена.
             payload: dict[str, Any] = jwt.decode(
                 token,
-                key=CONFIG.JWT_PUBLIC_KEY.read_text(encoding="utf-8"),
-                algorithms=["RS256"],
+                key=key.key,  # type: ignore[arg-type]
+                algorithms=[key.algorithm],
             )
             match payload["type"]:
                 case TokenType.ACCESS:
@@ -183,6 +283,24 @@ class JwtAuthService(AbstractAuthService):
             raise TokenError("Invalid token type")
         return payload
 
+    async def revoke(self, user_id: int) -> None:
+        await self.auth_repo.revoke(
+            subject=str(user_id),
+            revoked_at=datetime.now(UTC).timestamp(),
+            expiration=CONFIG.ACCESS_TOKEN_EXPIRE_SECONDS,
+        )
+        await self.auth_repo.delete(str(user_id), "*")
+
+    async def is_revoked(self, context: AuthorizationContext) -> bool:
+        if context.user_id is None:
+            return True
+        revoked_at = await self.auth_repo.revoked_at(str(context.user_id))
+        if revoked_at is None:
+            return False
+        # Строго раньше отзыва: токен, выпущенный сразу после него (новый вход
+        # после смены пароля), остаётся действительным.
+        return context.issued_at is None or context.issued_at < revoked_at
+
     def get_subject_id(self, credentials: Credentials) -> int:
         try:
             return int(self.decode_token(credentials.get_authenticate()).sub)  # type: ignore
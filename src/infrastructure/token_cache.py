@@ -0,0 +1,78 @@
+import hashlib
+from collections import OrderedDict
+from time import time
+
+from src.infrastructure.credentials import AccessTokenPayload
+
+
+class VerifiedTokenCache:
+    """
+    LRU кеш уже проверенных access токенов.
+
+    Ключ — sha256 от токена (сам токен в памяти не храним), значение — payload,
+    который живёт до своего exp. maxsize=0 отключает кеш.
+    """
+
+    def __init__(self, maxsize: int = 10_000) -> None:
+        self.maxsize = maxsize
+        self._items: OrderedDict[bytes, AccessTokenPayload] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> AccessTokenPayload | None:
+        if not self.maxsize:
+            return None
+        key = self._key(token)
+        payload = self._items.get(key)
+        if payload is None:
+            self.misses += 1
+            return None
+        if payload.exp <= time():
+            del self._items[key]
+            self.expired += 1
+            self.misses += 1
+            return None
+        self._items.move_to_end(key)
+        self.hits += 1
+        return payload
+
+    def put(self, token: str, payload: AccessTokenPayload) -> None:
+        if not self.maxsize:
+            return
+        key = self._key(token)
+        self._items[key] = payload
+        self._items.move_to_end(key)
+        if len(self._items) > self.maxsize:
+            self._items.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        self._items.clear()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "size": len(self._items),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "expired": self.expired,
+            "evictions": self.evictions,
+        }
+
+    def render(self) -> str:
+        """stats() в формате экспозиции Prometheus."""
+        lines = []
+        for name, value in self.stats().items():
+            kind = "gauge" if name in ("size", "maxsize") else "counter"
+            metric = f"access_token_cache_{name}" + (
+                "_total" if kind == "counter" else ""
+            )
+            lines.append(f"# TYPE {metric} {kind}")
+            lines.append(f"{metric} {value}")
+        return "\n".join(lines) + "\n"
@@ -1,6 +1,9 @@
-from typing import Callable
+import asyncio
+from collections.abc import Callable
+from contextvars import ContextVar, Token
+from dataclasses import dataclass, field
 
-from motor.motor_asyncio import AsyncIOMotorClient
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorClientSession
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.application.interfaces.unit_of_work import AbstractUnitOfWork
@@ -9,54 +12,98 @@ from src.infrastructure.repositories.projects import SQLProjectsRepository
 from src.infrastructure.repositories.users import SQLUsersRepository
 
 
+@dataclass
+class _Sessions:
+    mongo: AsyncIOMotorClientSession
+    # Задача, открывшая сессии: дочерние задачи наследуют contextvar, но
+    # делить с ними сессии нельзя — они открывают свои.
+    owner: asyncio.Task[object] | None
+    token: Token["_Sessions | None"] | None = None
+    sql: AsyncSession | None = field(default=None)
+    depth: int = 1
+
+
 class UnitOfWork(AbstractUnitOfWork):
+    """
+    Единица работы в рамках одного запроса.
+
+    Один объект на приложение: сессии текущего запроса хранятся в contextvar,
+    поэтому у каждой задачи (запроса) они свои. Повторный вход (guard -> use
+    case -> service) не открывает новых сессий: Mongo сессия создаётся на
+    внешнем входе, SQL сессия — при первом обращении к users или projects,
+    и обе закрываются на внешнем выходе. Маршруты без SQL не держат сессию
+    SQLAlchemy вовсе.
+    """
+
     def __init__(
         self,
         sql_session_factory: Callable[[], AsyncSession],
-        mongo_client_factory: Callable[[], AsyncIOMotorClient],
+        mongo_client: AsyncIOMotorClient,
     ) -> None:
         self.sql_session_factory = sql_session_factory
-        self.mongo_client_factory = mongo_client_factory
-        self._mongo_client: AsyncIOMotorClient | None = None
-        self._sql_session: AsyncSession | None = None
+        self._mongo_client = mongo_client
+        self._sessions: ContextVar[_Sessions | None] = ContextVar(
+            f"uow_sessions_{id(self)}", default=None
+        )
 
     @property
     def posts(self) -> MongoPostsRepository:
-        if self._mongo_client is None:
+        if (sessions := self._sessions.get()) is None:
             raise RuntimeError("Mongo is not connected")
-        return MongoPostsRepository(mongo_client=self._mongo_client)
+        return MongoPostsRepository(
+            mongo_client=self._mongo_client, session=sessions.mongo
+        )
 
     @property
     def users(self) -> SQLUsersRepository:
-        if self._sql_session is None:
-            raise RuntimeError("Redis is not connected")
-        return SQLUsersRepository(session=self._sql_session)
+        return SQLUsersRepository(session=self._sql_session())
 
     @property
     def projects(self) -> SQLProjectsRepository:
-        if self._sql_session is None:
-            raise RuntimeError("Redis is not connected")
-        return SQLProjectsRepository(session=self._sql_session)
+        return SQLProjectsRepository(session=self._sql_session())
+
+    def _sql_session(self) -> AsyncSession:
+        if (sessions := self._sessions.get()) is None:
+            raise RuntimeError("SQL session is not opened")
+        if sessions.sql is None:
+            # Соединение из пула сессия берёт ещё позже — на первом запросе.
+            sessions.sql = self.sql_session_factory()
+        return sessions.sql
 
     async def __aenter__(self) -> "UnitOfWork":
-        self._mongo_client = self.mongo_client_factory()
-        self._sql_session = self.sql_session_factory()
-        await self._sql_session.__aenter__()
+        sessions = self._sessions.get()
+        if sessions is not None and sessions.owner is asyncio.current_task():
+            sessions.depth += 1
+            return self
+        mongo_session = await self._mongo_client.start_session()
+        sessions = _Sessions(mongo=mongo_session, owner=asyncio.current_task())
+        sessions.token = self._sessions.set(sessions)
         return self
 
     async def commit(self) -> None:
-        if self._sql_session is None:
+        if (sessions := self._sessions.get()) is None:
             raise RuntimeError("No connection")
-        await self._sql_session.commit()
+        if sessions.sql is not None:
+            await sessions.sql.commit()
 
     async def rollback(self) -> None:
-        if self._sql_session is None:
+        if (sessions := self._sessions.get()) is None:
             raise RuntimeError("No connection")
-        await self._sql_session.rollback()
+        if sessions.sql is not None:
+            await sessions.sql.rollback()
 
     async def __aexit__(self, exc_type, exc_value, traceback) -> None:  # type: ignore
-        if exc_type is not None:
-            await self.rollback()
-        if self._sql_session is not None:
-            await self._sql_session.__aexit__(exc_type, exc_value, traceback)
-        self._sql_session = None
+        if (sessions := self._sessions.get()) is None:
+            return
+        if exc_type is not None and sessions.sql is not None:
+            await sessions.sql.rollback()
+        sessions.depth -= 1
+        if sessions.depth > 0:
+            return
+        # reset, а не set(None): в дочерней задаче восстанавливается сессия
+        # родителя, а не затирается его состояние.
+        if sessions.token is not None:
+            self._sessions.reset(sessions.token)
+        if sessions.sql is not None:
+            await sessions.sql.close()
+        await sessions.mongo.end_session()
@@ -1,27 +1,48 @@
+import math
+import signal
 from contextlib import asynccontextmanager
-from time import time
-from typing import Awaitable, Callable
 
+from dependency_injector import providers
 from dependency_injector.wiring import Provide, inject
 from fastapi import FastAPI, HTTPException
-from redis.asyncio import Redis
+from fastapi.responses import ORJSONResponse
+from motor.motor_asyncio import AsyncIOMotorClient
+from redis.asyncio import ConnectionPool, Redis
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
 from starlette import status
 from starlette.requests import Request
-from starlette.responses import Response
+from starlette.responses import JSONResponse, PlainTextResponse, Response
 
 from src.config import CONFIG
 from src.container import container
-from src.context import CredentialsHolder
 from src.domain.exceptions.auth import AccessDeniedError
+from src.domain.exceptions.base import RateLimitExceededError, ServiceBusyError
 from src.presentation.http.auth.router import router as auth_router
+from src.presentation.http.batch.router import router as batch_router
+from src.presentation.http.middlewares import (
+    CredentialsMiddleware,
+    RateLimitMiddleware,
+    TimingMiddleware,
+    is_internal_client,
+)
 from src.presentation.http.projects.router import router as projects_router
 from src.presentation.http.posts.router import router as posts_router
+from src.timing import latency_registry
 
 
 @asynccontextmanager
 async def life_span(app: FastAPI):  # type: ignore
+    # Пулы открываются в каждом воркере после fork, до первого запроса.
     await initialize_redis()
+    await open_pools()
+    build_singletons()
+    # Сессии, выданные до индекса sessions:{sub}, — в индекс (один раз на базу).
+    await container.auth_repo().index_legacy_sessions()
+    # kill -HUP <pid> перечитывает JWT ключи без рестарта воркера.
+    container.jwt_keys().install_reload_signal(signal.SIGHUP)
     yield
+    await close_pools()
 
 
 app = FastAPI(
@@ -29,11 +50,14 @@ app = FastAPI(
     version="0.0.1",
     description="API for my portfolio website and blog.",
     lifespan=life_span,
+    # orjson для ответов-словарей; схемы сериализуются через schema_response.
+    default_response_class=ORJSONResponse,
 )
 
 app.include_router(auth_router)
 app.include_router(projects_router)
 app.include_router(posts_router)
+app.include_router(batch_router)
 
 
 # Инициализация при первом использовании
@@ -44,81 +68,62 @@ async def initialize_redis(redis: Redis = Provide["redis"]) -> Redis:
     return redis
 
 
+def build_singletons() -> None:
+    """Guard'ы, use case'ы и сервисы собираются один раз до первого запроса."""
+    for provider in container.traverse(types=[providers.Singleton]):
+        provider()
+
+
+@inject
+async def open_pools(
+    mongo_client: AsyncIOMotorClient = Provide["mongo_client"],
+    engine: AsyncEngine = Provide["engine"],
+) -> None:
+    await mongo_client.admin.command("ping")
+    async with engine.connect() as connection:
+        await connection.execute(text("SELECT 1"))
+
+
+@inject
+async def close_pools(
+    mongo_client: AsyncIOMotorClient = Provide["mongo_client"],
+    engine: AsyncEngine = Provide["engine"],
+    redis_pool: ConnectionPool = Provide["redis_pool"],
+) -> None:
+    mongo_client.close()
+    await engine.dispose()
+    await redis_pool.disconnect()
+
+
 @app.exception_handler(AccessDeniedError)
 async def my_custom_exception_handler(request: Request, exc: AccessDeniedError) -> None:
     raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(exc))
 
 
-@app.middleware("http")
-async def credentials_middleware(
-    request: Request,
-    call_next: Callable[[Request], Awaitable[Response]],
-) -> Response:
-    creds_holder = CredentialsHolder()  # Ящик для новый кредов.
-    request.state.creds_holder = creds_holder
-    response: Response = await call_next(request)
-    creds = request.state.creds_holder.credentials
-    if creds:
-        response.set_cookie(
-            "access_token",
-            creds.get_authorize(),
-            httponly=True,
-            max_age=CONFIG.ACCESS_TOKEN_EXPIRE_SECONDS,
-        )
-        response.set_cookie(
-            "refresh_token",
-            creds.get_authenticate(),
-            httponly=True,
-            max_age=CONFIG.REFRESH_TOKEN_EXPIRE_SECONDS,
-            secure=True,
-        )
-    return response
-
-
-async def rate_limit_middleware(
-    request: Request,
-    call_next: Callable[[Request], Awaitable[Response]],
-    redis: Redis = Provide["redis"],
+@app.exception_handler(RateLimitExceededError)
+async def rate_limit_exception_handler(
+    request: Request, exc: RateLimitExceededError
 ) -> Response:
-    """Базовая реализация лимитирования запросов через алгоритм Фиксированного окна."""
-    async with redis:
-        async with redis.pipeline(transaction=True) as pipe:
-            key = f"rate_limit:{request.client.host}"
-            await pipe.exists(key)
-            await pipe.get(key)
-            await pipe.ttl(key)
-            exist, count, ttl = await pipe.execute()
-            count = int(count) if count is not None else CONFIG.RATE_LIMIT_LIMIT
-            if exist:
-                if count <= 0:
-                    return Response(
-                        status_code=429,
-                        headers={
-                            "X-Rate-Limit": str(CONFIG.RATE_LIMIT_LIMIT),
-                            "X-Rate-Limit-Remaining": "0",
-                            "X-Rate-Limit-Reset": str(int(time() + ttl)),
-                            "Retry-After": str(ttl),
-                        },
-                    )
-                await pipe.decr(key)
-                await pipe.execute()
-            else:
-                await pipe.set(
-                    key,
-                    CONFIG.RATE_LIMIT_LIMIT - 1,
-                    ex=CONFIG.RATE_LIMIT_EXPIRE_SECONDS,
-                )
-                await pipe.execute()
-
-    response = await call_next(request)
-    response.headers["X-Rate-Limit"] = str(CONFIG.RATE_LIMIT_LIMIT)
-    response.headers["X-Rate-Limit-Remaining"] = (
-        str(count - 1) if count else CONFIG.RATE_LIMIT_LIMIT
+    return JSONResponse(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        content={"detail": exc.msg},
+        headers={
+            "Retry-After": str(math.ceil(exc.retry_after)),
+            "X-Rate-Limit-Limit": str(exc.limit),
+            "X-Rate-Limit-Remaining": "0",
+        },
     )
-    response.headers["X-Rate-Limit-Reset"] = str(
-        int(time() + ttl if ttl else CONFIG.RATE_LIMIT_EXPIRE_SECONDS)
+
+
+@app.exception_handler(ServiceBusyError)
+async def service_busy_exception_handler(
+    request: Request, exc: ServiceBusyError
+) -> Response:
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": exc.msg},
+        headers={"Retry-After": "1"},
     )
-    return response
 
 
 @app.get("/")
@@ -126,4 +131,38 @@ async def root() -> dict[str, str]:
     return {"message": "Hello World!"}
 
 
-container.wire(modules=[__name__])
+@app.get("/metrics", include_in_schema=False)
+async def metrics(request: Request) -> PlainTextResponse:
+    """
+    Гистограммы задержек и счётчики кеша токенов этого воркера (Prometheus).
+    Только для METRICS_ALLOWED_NETWORKS, остальным маршрута как будто нет.
+    """
+    if not is_internal_client(request.scope):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+    return PlainTextResponse(
+        latency_registry.render() + container.token_cache().render(),
+        media_type="text/plain; version=0.0.4",
+    )
+
+
+# Лимитер — снаружи остальных слоёв: отклонённый запрос не доходит до них.
+# Тайминги — самый внешний слой, чтобы total включал всё.
+app.add_middleware(CredentialsMiddleware)
+app.add_middleware(RateLimitMiddleware, limiter=container.rate_limiter())
+app.add_middleware(
+    TimingMiddleware,
+    registry=latency_registry,
+    sample_rate=CONFIG.SERVER_TIMING_SAMPLE_RATE,
+)
+
+# Единственное место связывания контейнера: модули с @inject перечислены явно,
+# без обхода пакетов, а роутеры сами контейнер не связывают.
+container.wire(
+    modules=[
+        __name__,
+        "src.presentation.http.auth.router",
+        "src.presentation.http.batch.router",
+        "src.presentation.http.posts.router",
+        "src.presentation.http.projects.router",
+    ]
+)
@@ -2,17 +2,29 @@ from dependency_injector.wiring import inject, Provide
 from fastapi import APIRouter, Depends, HTTPException
 from starlette import status
 from starlette.requests import Request
-from starlette.responses import JSONResponse
+from starlette.responses import JSONResponse, Response
 
 from src.application.authorize import UseCaseGuard
 from src.application.interfaces.credentials import Credentials
+from src.application.usecases.users.change_password import ChangePasswordUseCase
+from src.application.usecases.users.change_role import ChangeRoleUseCase
+from src.application.usecases.users.delete_user import DeleteUserUseCase
 from src.application.usecases.users.login import LoginUseCase
 from src.application.usecases.users.register_user import RegisterUserUseCase
 from src.container import container
 from src.context import CredentialsHolder
-from src.domain.exceptions.auth import UserAlreadyExistsError, AuthError
+from src.domain.exceptions.auth import (
+    UserAlreadyExistsError,
+    AuthError,
+    SubjectNotFoundError,
+)
 from src.domain.value_objects.auth import AuthorizationContext  # noqa: F401
-from src.infrastructure.schemas.user import LoginUserSchema, RegisterUserSchema
+from src.infrastructure.schemas.user import (
+    LoginUserSchema,
+    RegisterUserSchema,
+    ChangePasswordSchema,
+    ChangeRoleSchema,
+)
 from src.presentation.http.dependencies import credentials_schema, get_creds_holder
 
 router = APIRouter(prefix="/auth", tags=["auth"])
@@ -28,12 +40,11 @@ async def register(
     guard: UseCaseGuard[RegisterUserUseCase] = Depends(Provide["register_use_case"]),
 ) -> dict[str, str | int | None]:
     try:
-        guard.configure(
+        async with guard(
             credentials=credentials,
             creds_holder=creds_holder,
             device_id=str(request.client.host),
-        )
-        async with guard as (use_case, _, _):  # type: RegisterUserUseCase # type: ignore[no-redef]
+        ) as (use_case, _, _):  # type: RegisterUserUseCase # type: ignore[no-redef]
             user = await use_case(
                 username=form_data.username,
                 email=str(form_data.email),
@@ -56,12 +67,11 @@ async def login(  # type: ignore
     credentials: Credentials = Depends(credentials_schema),
 ):
     try:
-        guard.configure(
+        async with guard(
             credentials=credentials,
             creds_holder=creds_holder,
             device_id=str(request.client.host),
-        )
-        async with guard as (use_case, _, _):  # type: LoginUseCase # type: ignore[no-redef]
+        ) as (use_case, _, _):  # type: LoginUseCase # type: ignore[no-redef]
             creds = await use_case(
                 credentials=credentials,
                 email=str(form_data.email),
@@ -88,6 +98,80 @@ async def login(  # type: ignore
     return response
 
 
+@router.post("/password", status_code=204)
+@inject
+async def change_password(
+    form_data: ChangePasswordSchema,
+    request: Request,
+    creds_holder: CredentialsHolder = Depends(get_creds_holder),
+    credentials: Credentials = Depends(credentials_schema),
+    guard: UseCaseGuard[ChangePasswordUseCase] = Depends(
+        Provide["change_password_use_case"]
+    ),
+) -> Response:
+    """Смена пароля отзывает все токены пользователя: нужен повторный вход."""
+    try:
+        async with guard(
+            credentials=credentials,
+            creds_holder=creds_holder,
+            device_id=str(request.client.host),
+        ) as (use_case, context, _):  # type: (ChangePasswordUseCase, AuthorizationContext, Credentials)
+            await use_case(
+                context=context,
+                password=form_data.password,
+                new_password=form_data.new_password,
+            )
+    except AuthError as e:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=str(e))
+    response = Response(status_code=204)
+    response.delete_cookie("access_token")
+    response.delete_cookie("refresh_token")
+    return response
+
+
+@router.put("/users/{user_id}/role", status_code=200)
+@inject
+async def change_role(
+    user_id: int,
+    form_data: ChangeRoleSchema,
+    request: Request,
+    creds_holder: CredentialsHolder = Depends(get_creds_holder),
+    credentials: Credentials = Depends(credentials_schema),
+    guard: UseCaseGuard[ChangeRoleUseCase] = Depends(Provide["change_role_use_case"]),
+) -> dict[str, str | int]:
+    try:
+        async with guard(
+            credentials=credentials,
+            creds_holder=creds_holder,
+            device_id=str(request.client.host),
+        ) as (use_case, _, _):  # type: ChangeRoleUseCase # type: ignore[no-redef]
+            user = await use_case(user_id=user_id, role=form_data.role)
+    except SubjectNotFoundError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=e.msg)
+    return {"user_id": user_id, "role": user.role.name}
+
+
+@router.delete("/users/{user_id}", status_code=204)
+@inject
+async def delete_user(
+    user_id: int,
+    request: Request,
+    creds_holder: CredentialsHolder = Depends(get_creds_holder),
+    credentials: Credentials = Depends(credentials_schema),
+    guard: UseCaseGuard[DeleteUserUseCase] = Depends(Provide["delete_user_use_case"]),
+) -> Response:
+    try:
+        async with guard(
+            credentials=credentials,
+            creds_holder=creds_holder,
+            device_id=str(request.client.host),
+        ) as (use_case, _, _):  # type: DeleteUserUseCase # type: ignore[no-redef]
+            await use_case(user_id=user_id)
+    except SubjectNotFoundError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=e.msg)
+    return Response(status_code=204)
+
+
 # @router.post("/update_token", status_code=200)
 # async def update_token(  # type: ignore
 #     refresh_token: Annotated[str, Depends(refresh_token_bearer)],
@@ -112,6 +196,3 @@ async def login(  # type: ignore
 #         httponly=True,
 #     )
 #     return response
-
-
-container.wire(modules=[__name__])  # должен быть внизу.
@@ -0,0 +1,149 @@
+import asyncio
+import json
+import logging
+from dataclasses import dataclass
+from urllib.parse import urlsplit
+
+from dependency_injector.wiring import Provide, inject
+from fastapi import APIRouter, Depends, FastAPI
+from starlette.middleware.exceptions import ExceptionMiddleware
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Scope
+
+from src.application.authorize import UseCaseGuard
+from src.application.interfaces.credentials import Credentials
+from src.config import CONFIG
+from src.context import CredentialsHolder
+from src.infrastructure.schemas.batch import BatchRequestSchema, BatchResponseSchema
+from src.presentation.http.dependencies import credentials_schema, get_creds_holder
+from src.presentation.http.responses import CompressibleJSONResponse
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/batch", tags=["batch"])
+
+# Заголовки запроса-пакета, которые не переходят в подзапросы: тела у них нет,
+# а ответы встраиваются в общий JSON несжатыми.
+SKIPPED_HEADERS = {b"content-length", b"content-type", b"accept-encoding"}
+# Ключи scope, которые проставил роутинг самого /batch.
+ROUTING_KEYS = {"endpoint", "path_params", "route"}
+INTERNAL_ERROR = b'{"detail":"Internal Server Error"}'
+
+
+@dataclass
+class SubResponse:
+    status_code: int
+    body: bytes
+    is_json: bool
+
+
+async def dispatch(
+    app: ASGIApp, scope: Scope, path: str, creds_holder: CredentialsHolder
+) -> SubResponse:
+    """
+    GET подзапрос в app (роутер приложения за обработчиками исключений, см.
+    handled_router). Middleware не повторяются: они уже отработали на пакете.
+    """
+    url = urlsplit(path)
+    sub_scope = {key: value for key, value in scope.items() if key not in ROUTING_KEYS}
+    sub_scope.update(
+        method="GET",
+        path=url.path,
+        raw_path=url.path.encode(),
+        query_string=url.query.encode(),
+        headers=[(k, v) for k, v in scope["headers"] if k not in SKIPPED_HEADERS],
+        state={**scope.get("state", {}), "creds_holder": creds_holder},
+    )
+    response = SubResponse(500, b"", is_json=False)
+    chunks: list[bytes] = []
+
+    async def receive() -> Message:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: Message) -> None:
+        if message["type"] == "http.response.start":
+            response.status_code = message["status"]
+            response.is_json = any(
+                k == b"content-type" and v.startswith(b"application/json")
+                for k, v in message.get("headers", [])
+            )
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    try:
+        await app(sub_scope, receive, send)
+    except Exception:
+        logger.exception("Batch sub-request %s failed", url.path)
+        return SubResponse(500, INTERNAL_ERROR, is_json=True)
+    response.body = b"".join(chunks)
+    return response
+
+
+def handled_router(app: FastAPI) -> ASGIApp:
+    """
+    Роутер приложения за его обработчиками исключений, как в стеке самого
+    приложения: доменные ошибки (AccessDeniedError -> 403) и HTTPException из
+    обработчиков становятся ответами подзапроса, а не 500. Обработчики 500 и
+    Exception у Starlette живут в ServerErrorMiddleware — их роль здесь
+    выполняет dispatch.
+    """
+    handlers = {
+        key: handler
+        for key, handler in app.exception_handlers.items()
+        if key not in (500, Exception)
+    }
+    return ExceptionMiddleware(app.router, handlers=handlers)
+
+
+def batch_item(item_id: str | None, response: SubResponse) -> bytes:
+    """Элемент ответа; JSON тело подзапроса встраивается как есть, без разбора."""
+    if response.is_json and response.body:
+        body = response.body
+    elif response.body:
+        body = json.dumps(response.body.decode(errors="replace")).encode()
+    else:
+        body = b"null"
+    return b'{"id":%s,"status":%d,"body":%s}' % (
+        json.dumps(item_id).encode(),
+        response.status_code,
+        body,
+    )
+
+
+@router.post("/", status_code=200, response_model=BatchResponseSchema)
+@inject
+async def batch(
+    batch: BatchRequestSchema,
+    request: Request,
+    creds_holder: CredentialsHolder = Depends(get_creds_holder),
+    credentials: Credentials = Depends(credentials_schema),
+    guard: UseCaseGuard[None] = Depends(Provide["batch_guard"]),
+) -> Response:
+    """
+    Несколько GET запросов за один round trip. Токен проверяется один раз на
+    пакет, а каждый подзапрос списывается с лимита своего маршрута; подзапросы
+    выполняются конкурентно, не больше BATCH_CONCURRENCY одновременно, каждый
+    со своей единицей работы. Статус и тело — у каждого подзапроса свои.
+    """
+    async with guard(
+        credentials=credentials,
+        creds_holder=creds_holder,
+        device_id=request.client.host,
+    ) as (_, context, _):
+        pass
+    # Подзапросы стартуют вне единицы работы guard'а: у каждой задачи свои сессии.
+    sub_holder = CredentialsHolder()
+    sub_holder.context = context
+    slots = asyncio.Semaphore(CONFIG.BATCH_CONCURRENCY)
+    app = handled_router(request.app)
+
+    async def run(path: str) -> SubResponse:
+        async with slots:
+            return await dispatch(app, request.scope, path, sub_holder)
+
+    results = await asyncio.gather(*(run(item.path) for item in batch.requests))
+    content = b'{"responses":[%s]}' % b",".join(
+        batch_item(item.id, response) for item, response in zip(batch.requests, results)
+    )
+    return CompressibleJSONResponse(content=content)
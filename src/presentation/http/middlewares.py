@@ -0,0 +1,166 @@
+import math
+import random
+from ipaddress import ip_address
+from time import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.responses import JSONResponse, Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.application.interfaces.clients.rate_limit import (
+    AbstractRateLimiter,
+    RateLimitResult,
+)
+from src.application.interfaces.credentials import Credentials
+from src.config import CONFIG
+from src.context import CredentialsHolder
+from src.timing import LatencyRegistry, RequestTimings, current_timings
+
+
+def credentials_cookies(creds: Credentials) -> list[tuple[bytes, bytes]]:
+    """Заголовки Set-Cookie для новой пары токенов."""
+    response = Response()
+    response.set_cookie(
+        "access_token",
+        creds.get_authorize(),
+        httponly=True,
+        max_age=CONFIG.ACCESS_TOKEN_EXPIRE_SECONDS,
+    )
+    response.set_cookie(
+        "refresh_token",
+        creds.get_authenticate(),
+        httponly=True,
+        max_age=CONFIG.REFRESH_TOKEN_EXPIRE_SECONDS,
+        secure=True,
+    )
+    return [(k, v) for k, v in response.raw_headers if k == b"set-cookie"]
+
+
+class CredentialsMiddleware:
+    """
+    Кладёт в request.state ящик для кредов, а если guard обновил токены —
+    дописывает Set-Cookie в http.response.start. Тело ответа не буферизуется,
+    так что стриминговые ответы не ломаются.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        creds_holder = CredentialsHolder()
+        scope.setdefault("state", {})["creds_holder"] = creds_holder
+
+        async def send_with_cookies(message: Message) -> None:
+            if message["type"] == "http.response.start" and creds_holder.credentials:
+                message["headers"] = [
+                    *message.get("headers", []),
+                    *credentials_cookies(creds_holder.credentials),
+                ]
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookies)
+
+
+def rate_limit_headers(result: RateLimitResult) -> dict[str, str]:
+    return {
+        "X-Rate-Limit-Limit": str(result.limit),
+        "X-Rate-Limit-Remaining": str(result.remaining),
+        # Абсолютное время (unix), когда лимит восстановится полностью.
+        "X-Rate-Limit-Reset": str(math.ceil(time() + result.reset_after)),
+    }
+
+
+class RateLimitMiddleware:
+    """
+    Лимитирование запросов по IP клиента.
+
+    Чистый ASGI: без BaseHTTPMiddleware, который оборачивает ответ в отдельную
+    задачу и поток; заголовки дописываются в http.response.start.
+    """
+
+    def __init__(self, app: ASGIApp, limiter: AbstractRateLimiter) -> None:
+        self.app = app
+        self.limiter = limiter
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        client = scope.get("client")
+        result = await self.limiter.hit(client[0] if client else "unknown")
+        headers = rate_limit_headers(result)
+        if not result.allowed:
+            headers["Retry-After"] = str(math.ceil(result.retry_after))
+            response = JSONResponse(
+                {"detail": "Too many requests"}, status_code=429, headers=headers
+            )
+            await response(scope, receive, send)
+            return
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).update(headers)
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
+
+
+def is_internal_client(scope: Scope) -> bool:
+    """Клиент из METRICS_ALLOWED_NETWORKS: ему доступны метрики и тайминги."""
+    client = scope.get("client")
+    if not client:
+        return False
+    try:
+        address = ip_address(client[0])
+    except ValueError:
+        return False
+    return any(address in network for network in CONFIG.METRICS_ALLOWED_NETWORKS)
+
+
+class TimingMiddleware:
+    """
+    Собирает спаны запроса (guard, use case, кеш, репозитории, сериализация)
+    в гистограммы по маршрутам. Заголовок Server-Timing добавляется в долю
+    sample_rate ответов или по запросу с заголовком X-Server-Timing — только
+    от клиентов из внутренних сетей (is_internal_client).
+    """
+
+    def __init__(
+        self, app: ASGIApp, registry: LatencyRegistry, sample_rate: float = 0
+    ) -> None:
+        self.app = app
+        self.registry = registry
+        self.sample_rate = sample_rate
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings()
+        token = current_timings.set(timings)
+        expose = (self.sample_rate > 0 and random.random() < self.sample_rate) or (
+            any(name == b"x-server-timing" for name, _ in scope["headers"])
+            and is_internal_client(scope)
+        )
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start" and expose:
+                MutableHeaders(scope=message).append(
+                    "Server-Timing", timings.server_timing()
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            current_timings.reset(token)
+            route = scope.get("route")
+            self.registry.observe(
+                scope["method"], getattr(route, "path", "unmatched"), timings
+            )
@@ -3,6 +3,7 @@ from fastapi import APIRouter, Depends, HTTPException
 from fastapi.params import Query
 from starlette import status
 from starlette.requests import Request
+from starlette.responses import Response
 
 from src.application.authorize import UseCaseGuard
 from src.application.interfaces.credentials import Credentials
@@ -12,9 +13,8 @@ from src.application.usecases.posts.comments.create import CreateCommentUseCase
 from src.application.usecases.posts.comments.get import GetCommentsUseCase
 from src.application.usecases.posts.comments.rate import RateCommentUseCase
 from src.application.usecases.posts.create import CreatePostUseCase
-from src.application.usecases.posts.get import GetPostsUseCase
+from src.application.usecases.posts.get import GetPostUseCase, GetPostsUseCase
 from src.application.usecases.posts.rate import RatePostUseCase
-from src.container import container
 from src.context import CredentialsHolder
 from src.domain.exceptions.auth import SubjectNotFoundError
 from src.domain.value_objects.auth import AuthorizationContext  # noqa: F401
@@ -22,6 +22,8 @@ from src.infrastructure.schemas.post import (
     CreatePostSchema,
     ReadPostSchema,
     PostsResponseSchema,
+    SparsePostsResponseSchema,
+    select_post_fields,
     CreateCommentSchema,
     ReadCommentSchema,
     CommentsResponseSchema,
@@ -30,6 +32,7 @@ from src.infrastructure.schemas.post import (
     AnswersResponseSchema,
 )
 from src.presentation.http.dependencies import credentials_schema, get_creds_holder
+from src.presentation.http.responses import schema_response
 
 router = APIRouter(prefix="/posts", tags=["posts"])
 
@@ -37,7 +40,7 @@ router = APIRouter(prefix="/posts", tags=["posts"])
 # region Posts
 
 
-@router.post("/", status_code=201)
+@router.post("/", status_code=201, response_model=ReadPostSchema)
 @inject
 async def create_post(
     post: CreatePostSchema,
@@ -45,43 +48,89 @@ async def create_post(
     creds_holder: CredentialsHolder = Depends(get_creds_holder),
     credentials: Credentials = Depends(credentials_schema),
     guard: UseCaseGuard[CreatePostUseCase] = Depends(Provide["create_post_use_case"]),
-) -> ReadPostSchema:
-    guard.configure(
+) -> Response:
+    async with guard(
         credentials=credentials,
         creds_holder=creds_holder,
         device_id=request.client.host,
-    )
-    async with guard as (use_case, context, creds):  # type: (CreatePostUseCase, AuthorizationContext, Credentials)
+    ) as (use_case, context, creds):  # type: (CreatePostUseCase, AuthorizationContext, Credentials)
         res = await use_case(post=post.to_domain(), context=context)
-        return ReadPostSchema.model_validate(res, from_attributes=True)
+        return schema_response(ReadPostSchema, res, status_code=201)
 
 
-@router.get("/", status_code=200)
+@router.get(
+    "/",
+    status_code=200,
+    response_model=PostsResponseSchema | SparsePostsResponseSchema,
+)
 @inject
 async def get_posts(
     request: Request,
     last_id: str | None = None,
     limit: int = Query(default=20, le=40, gt=0),
+    fields: str | None = Query(
+        default=None,
+        description="Поля поста через запятую, например title,author,likes",
+    ),
+    excerpt: bool = Query(default=False, description="Анонс вместо content"),
     creds_holder: CredentialsHolder = Depends(get_creds_holder),
     credentials: Credentials = Depends(credentials_schema),
     guard: UseCaseGuard[GetPostsUseCase] = Depends(Provide["get_posts_use_case"]),
-) -> PostsResponseSchema:
-    guard.configure(
+) -> Response:
+    try:
+        selected = select_post_fields(fields, excerpt)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e)
+        )
+    async with guard(
         credentials=credentials,
         creds_holder=creds_holder,
         device_id=request.client.host,
-    )
-    async with guard as (use_case, context, creds):  # type: (GetPostsUseCase, AuthorizationContext, Credentials)
-        posts = await use_case(last_id=last_id, limit=limit)
+    ) as (use_case, context, creds):  # type: (GetPostsUseCase, AuthorizationContext, Credentials)
+        posts = await use_case(
+            last_id=last_id, limit=limit, fields=selected, context=context
+        )
         if not posts or not posts[0]:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Posts not found"
             )
-        return PostsResponseSchema.model_validate(
-            {"posts": posts[0], "has_next": posts[1]}, from_attributes=True
+        if selected is not None:
+            return schema_response(
+                SparsePostsResponseSchema,
+                {"posts": posts[0], "has_next": posts[1]},
+                compress=True,
+                exclude_unset=True,
+            )
+        return schema_response(
+            PostsResponseSchema,
+            {"posts": posts[0], "has_next": posts[1]},
+            compress=True,
         )
 
 
+@router.get("/{post_id}", status_code=200, response_model=ReadPostSchema)
+@inject
+async def get_post(
+    request: Request,
+    post_id: str,
+    creds_holder: CredentialsHolder = Depends(get_creds_holder),
+    credentials: Credentials = Depends(credentials_schema),
+    guard: UseCaseGuard[GetPostUseCase] = Depends(Provide["get_post_use_case"]),
+) -> Response:
+    async with guard(
+        credentials=credentials,
+        creds_holder=creds_holder,
+        device_id=request.client.host,
+    ) as (use_case, context, creds):  # type: (GetPostUseCase, AuthorizationContext, Credentials)
+        post = await use_case(post_id=post_id, context=context)
+        if post is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Post not found"
+            )
+        return schema_response(ReadPostSchema, post)
+
+
 @router.post("/{post_id}/like", status_code=201)
 @inject
 async def like_post(
@@ -91,12 +140,11 @@ async def like_post(
     credentials: Credentials = Depends(credentials_schema),
     guard: UseCaseGuard[RatePostUseCase] = Depends(Provide["rate_post_use_case"]),
 ) -> dict[str, str | int]:
-    guard.configure(
+    async with guard(
         credentials=credentials,
         creds_holder=creds_holder,
         device_id=request.client.host,
-    )
-    async with guard as (use_case, context, creds):  # type: (RatePostUseCase, AuthorizationContext, Credentials)
+    ) as (use_case, context, creds):  # type: (RatePostUseCase, AuthorizationContext, Credentials)
         try:
             res = await use_case(mode="like", post_id=post_id, context=context)
         except SubjectNotFoundError as e:
@@ -117,12 +165,11 @@ async def dislike_post(
     credentials: Credentials = Depends(credentials_schema),
     guard: UseCaseGuard[RatePostUseCase] = Depends(Provide["rate_post_use_case"]),
 ) -> dict[str, str | int]:
-    guard.configure(
+    async with guard(
         credentials=credentials,
         creds_holder=creds_holder,
         device_id=request.client.host,
-    )
-    async with guard as (use_case, context, creds):  # type: (RatePostUseCase, AuthorizationContext, Credentials)
+    ) as (use_case, context, creds):  # type: (RatePostUseCase, AuthorizationContext, Credentials)
         try:
             res = await use_case(mode="dislike", post_id=post_id, context=context)
         except SubjectNotFoundError as e:
@@ -143,7 +190,7 @@ async def dislike_post(
 
 
 # region Comments
-@router.post("/{post_id}/comments", status_code=201)
+@router.post("/{post_id}/comments", status_code=201, response_model=ReadCommentSchema)
 @inject
 async def create_comment(
     request: Request,
@@ -154,23 +201,24 @@ async def create_comment(
     guard: UseCaseGuard[CreateCommentUseCase] = Depends(
         Provide["create_comment_use_case"]
     ),
-) -> ReadCommentSchema:
-    guard.configure(
+) -> Response:
+    async with guard(
         credentials=credentials,
         creds_holder=creds_holder,
         device_id=request.client.host,
-    )
-    async with guard as (use_case, context, creds):  # type: (CreateCommentUseCase, AuthorizationContext, Credentials)
+    ) as (use_case, context, creds):  # type: (CreateCommentUseCase, AuthorizationContext, Credentials)
         try:
             res = await use_case(
                 post_id=post_id, comment=comment.to_domain(post_id), context=context
             )
         except SubjectNotFoundError as e:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
-        return ReadCommentSchema.model_validate(res, from_attributes=True)
+        return schema_response(ReadCommentSchema, res, status_code=201)
 
 
-@router.get("/{post_id}/comments", status_code=200)
+@router.get(
+    "/{post_id}/comments", status_code=200, response_model=CommentsResponseSchema
+)
 @inject
 async def get_comments(
     request: Request,
@@ -180,24 +228,26 @@ async def get_comments(
     creds_holder: CredentialsHolder = Depends(get_creds_holder),
     credentials: Credentials = Depends(credentials_schema),
     guard: UseCaseGuard[GetCommentsUseCase] = Depends(Provide["get_comments_use_case"]),
-) -> CommentsResponseSchema:
-    guard.configure(
+) -> Response:
+    async with guard(
         credentials=credentials,
         creds_holder=creds_holder,
         device_id=request.client.host,
-    )
-    async with guard as (use_case, context, creds):  # type: (GetCommentsUseCase, AuthorizationContext, Credentials)
+    ) as (use_case, context, creds):  # type: (GetCommentsUseCase, AuthorizationContext, Credentials)
         comments = await use_case(
             post_id=post_id,
             last_id=last_id,
             limit=limit,
+            context=context,
         )
         if not comments or not comments[0]:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Comments not found"
             )
-        return CommentsResponseSchema.model_validate(
-            {"comments": comments[0], "has_next": comments[1]}, from_attributes=True
+        return schema_response(
+            CommentsResponseSchema,
+            {"comments": comments[0], "has_next": comments[1]},
+            compress=True,
         )
 
 
@@ -211,12 +261,11 @@ async def like_comment(
     credentials: Credentials = Depends(credentials_schema),
     guard: UseCaseGuard[RateCommentUseCase] = Depends(Provide["rate_comment_use_case"]),
 ) -> dict[str, str | int]:
-    guard.configure(
+    async with guard(
         credentials=credentials,
         creds_holder=creds_holder,
         device_id=request.client.host,
-    )
-    async with guard as (use_case, context, creds):  # type: (RateCommentUseCase, AuthorizationContext, Credentials)
+    ) as (use_case, context, creds):  # type: (RateCommentUseCase, AuthorizationContext, Credentials)
         try:
             res = await use_case(
                 mode="like", post_id=post_id, context=context, comment_id=comment_id
@@ -245,12 +294,11 @@ async def dislike_comment(
     credentials: Credentials = Depends(credentials_schema),
     guard: UseCaseGuard[RateCommentUseCase] = Depends(Provide["rate_comment_use_case"]),
 ) -> dict[str, str | int]:
-    guard.configure(
+    async with guard(
         credentials=credentials,
         creds_holder=creds_holder,
         device_id=request.client.host,
-    )
-    async with guard as (use_case, context, creds):  # type: (RateCommentUseCase, AuthorizationContext, Credentials)
+    ) as (use_case, context, creds):  # type: (RateCommentUseCase, AuthorizationContext, Credentials)
         try:
             res = await use_case(
                 mode="dislike", post_id=post_id, context=context, comment_id=comment_id
@@ -274,7 +322,11 @@ async def dislike_comment(
 # region Answers
 
 
-@router.post("/{post_id}/comments/{comment_id}/replies", status_code=201)
+@router.post(
+    "/{post_id}/comments/{comment_id}/replies",
+    status_code=201,
+    response_model=ReadAnswerSchema,
+)
 @inject
 async def create_answer(
     post_id: str,
@@ -286,13 +338,12 @@ async def create_answer(
     guard: UseCaseGuard[CreateAnswerUseCase] = Depends(
         Provide["create_answer_use_case"]
     ),
-) -> ReadAnswerSchema:
-    guard.configure(
+) -> Response:
+    async with guard(
         credentials=credentials,
         creds_holder=creds_holder,
         device_id=request.client.host,
-    )
-    async with guard as (use_case, context, creds):  # type: (CreateAnswerUseCase, AuthorizationContext, Credentials)
+    ) as (use_case, context, creds):  # type: (CreateAnswerUseCase, AuthorizationContext, Credentials)
         try:
             res = await use_case(
                 post_id=post_id,
@@ -303,10 +354,14 @@ async def create_answer(
         except SubjectNotFoundError as e:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
 
-        return ReadAnswerSchema.model_validate(res, from_attributes=True)
+        return schema_response(ReadAnswerSchema, res, status_code=201)
 
 
-@router.get("/{post_id}/comments/{comment_id}/replies", status_code=200)
+@router.get(
+    "/{post_id}/comments/{comment_id}/replies",
+    status_code=200,
+    response_model=AnswersResponseSchema,
+)
 @inject
 async def get_answers(
     request: Request,
@@ -317,25 +372,27 @@ async def get_answers(
     creds_holder: CredentialsHolder = Depends(get_creds_holder),
     credentials: Credentials = Depends(credentials_schema),
     guard: UseCaseGuard[GetAnswersUseCase] = Depends(Provide["get_answers_use_case"]),
-) -> AnswersResponseSchema:
+) -> Response:
     _ = post_id  # он тут не нужен, но должен быть по REST
-    guard.configure(
+    async with guard(
         credentials=credentials,
         creds_holder=creds_holder,
         device_id=request.client.host,
-    )
-    async with guard as (use_case, context, creds):  # type: (GetAnswersUseCase, AuthorizationContext, Credentials)
+    ) as (use_case, context, creds):  # type: (GetAnswersUseCase, AuthorizationContext, Credentials)
         answers = await use_case(
             comment_id=comment_id,
             last_id=last_id,
             limit=limit,
+            context=context,
         )
         if not answers or not answers[0]:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Answers not found"
             )
-        return AnswersResponseSchema.model_validate(
-            {"answers": answers[0], "has_next": answers[1]}, from_attributes=True
+        return schema_response(
+            AnswersResponseSchema,
+            {"answers": answers[0], "has_next": answers[1]},
+            compress=True,
         )
 
 
@@ -353,12 +410,11 @@ async def like_answer(
     guard: UseCaseGuard[RateCommentUseCase] = Depends(Provide["rate_comment_use_case"]),
 ) -> dict[str, str | int]:
     _ = comment_id  # он тут не нужен, но должен быть по REST
-    guard.configure(
+    async with guard(
         credentials=credentials,
         creds_holder=creds_holder,
         device_id=request.client.host,
-    )
-    async with guard as (use_case, context, creds):  # type: (RateCommentUseCase, AuthorizationContext, Credentials)
+    ) as (use_case, context, creds):  # type: (RateCommentUseCase, AuthorizationContext, Credentials)
         try:
             res = await use_case(
                 mode="like", post_id=post_id, context=context, comment_id=answer_id
@@ -390,12 +446,11 @@ async def dislike_answer(
     guard: UseCaseGuard[RateCommentUseCase] = Depends(Provide["rate_comment_use_case"]),
 ) -> dict[str, str | int]:
     _ = comment_id  # он тут не нужен, но должен быть по REST
-    guard.configure(
+    async with guard(
         credentials=credentials,
         creds_holder=creds_holder,
         device_id=request.client.host,
-    )
-    async with guard as (use_case, context, creds):  # type: (RateCommentUseCase, AuthorizationContext, Credentials)
+    ) as (use_case, context, creds):  # type: (RateCommentUseCase, AuthorizationContext, Credentials)
         try:
             res = await use_case(
                 mode="dislike", post_id=post_id, context=context, comment_id=answer_id
@@ -415,5 +470,3 @@ async def dislike_answer(
 
 
 # endregion
-
-container.wire(modules=[__name__])
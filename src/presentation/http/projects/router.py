@@ -4,12 +4,12 @@ from dependency_injector.wiring import inject, Provide
 from fastapi import APIRouter, HTTPException, Depends, Query
 from starlette import status
 from starlette.requests import Request
+from starlette.responses import Response
 
 from src.application.authorize import UseCaseGuard
 from src.application.interfaces.credentials import Credentials  # noqa: F401
 from src.application.usecases.projects.create import CreateProjectUseCase
 from src.application.usecases.projects.get import GetProjectsUseCase
-from src.container import container
 from src.context import CredentialsHolder
 from src.domain.exceptions.base import ConflictException
 from src.domain.value_objects.auth import AuthorizationContext  # noqa: F401
@@ -19,6 +19,7 @@ from src.infrastructure.schemas.project import (
     ProjectsResponse,
 )
 from src.presentation.http.dependencies import credentials_schema, get_creds_holder
+from src.presentation.http.responses import schema_response
 
 router = APIRouter(prefix="/projects", tags=["projects"])
 
@@ -34,7 +35,7 @@ router = APIRouter(prefix="/projects", tags=["projects"])
 # ────────────────
 
 
-@router.post("/", status_code=201)
+@router.post("/", status_code=201, response_model=ReadProjectSchema)
 @inject
 async def create_project(
     project: CreateProjectSchema,
@@ -44,24 +45,23 @@ async def create_project(
     guard: UseCaseGuard[CreateProjectUseCase] = Depends(
         Provide["create_project_use_case"]
     ),
-) -> ReadProjectSchema:
+) -> Response:
     try:
-        guard.configure(
+        async with guard(
             credentials=credentials,
             creds_holder=creds_holder,
             device_id=str(request.client.host),
-        )
-        async with guard as (use_case, context, _):  # type: CreateProjectUseCase, AuthorizationContext, Credentials
+        ) as (use_case, context, _):  # type: CreateProjectUseCase, AuthorizationContext, Credentials
             res = await use_case(
                 project=project.to_domain(),
                 context=context,
             )
-            return ReadProjectSchema.model_validate(res, from_attributes=True)
+            return schema_response(ReadProjectSchema, res, status_code=201)
     except ConflictException as e:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
 
 
-@router.get("/", status_code=200)
+@router.get("/", status_code=200, response_model=ProjectsResponse)
 @inject
 async def get_projects(
     request: Request,
@@ -70,17 +70,15 @@ async def get_projects(
     credentials: Annotated[credentials_schema, Depends()],  # type: ignore
     limit: int = Query(default=20, le=40, gt=0),
     guard: UseCaseGuard[GetProjectsUseCase] = Depends(Provide["get_projects_use_case"]),
-) -> ProjectsResponse:
-    guard.configure(
+) -> Response:
+    async with guard(
         credentials=credentials,
         creds_holder=creds_holder,
         device_id=request.client.host,
-    )
-    async with guard as (use_case, context, _):  # type: GetProjectsUseCase, AuthorizationContext, Credentials
+    ) as (use_case, context, _):  # type: GetProjectsUseCase, AuthorizationContext, Credentials
         projects = await use_case(offset=offset, limit=limit)
-        return ProjectsResponse.model_validate(
-            {"projects": projects[0], "has_next": projects[1]}, from_attributes=True
+        return schema_response(
+            ProjectsResponse,
+            {"projects": projects[0], "has_next": projects[1]},
+            compress=True,
         )
-
-
-container.wire(modules=[__name__])  # должен быть внизу
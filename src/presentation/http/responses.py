@@ -0,0 +1,154 @@
+import gzip
+import hashlib
+from collections import OrderedDict
+from functools import cache, partial
+from typing import Any, Callable
+
+from pydantic import BaseModel, TypeAdapter
+from starlette.datastructures import Headers
+from starlette.responses import Response
+from starlette.types import Receive, Scope, Send
+
+from src.config import CONFIG
+from src.timing import span
+
+# Порядок выбора, если клиент принимает несколько кодировок.
+ENCODING_PREFERENCE = ("zstd", "br", "gzip")
+
+
+@cache
+def compressors() -> dict[str, Callable[[bytes], bytes]]:
+    """
+    Доступные компрессоры. brotli и zstandard необязательны и импортируются при
+    первом сжатии, а не при старте воркера.
+    """
+    available: dict[str, Callable[[bytes], bytes]] = {
+        "gzip": partial(gzip.compress, compresslevel=6, mtime=0),
+    }
+    try:
+        import brotli
+    except ImportError:  # pragma: no cover - brotli необязателен
+        pass
+    else:
+        available["br"] = partial(brotli.compress, quality=5)
+    try:
+        import zstandard
+    except ImportError:  # pragma: no cover - zstandard необязателен
+        pass
+    else:
+        available["zstd"] = zstandard.ZstdCompressor(level=3).compress
+    return available
+
+
+def accepted_encoding(scope: Scope) -> str | None:
+    """Лучшая из доступных кодировок, которые клиент перечислил в Accept-Encoding."""
+    accepted = set()
+    for part in Headers(scope=scope).get("accept-encoding", "").split(","):
+        name, _, params = part.partition(";")
+        q = params.strip().removeprefix("q=")
+        try:
+            if params and float(q) == 0:
+                continue
+        except ValueError:
+            continue
+        accepted.add(name.strip().lower())
+    available = compressors()
+    for encoding in ENCODING_PREFERENCE:
+        if encoding in available and (encoding in accepted or "*" in accepted):
+            return encoding
+    return None
+
+
+class CompressedVariants:
+    """
+    LRU сжатых вариантов тела ответа по sha1 тела и кодировке.
+
+    Страница ленты из кеша сериализуется в те же байты, поэтому повторный
+    запрос получает уже сжатый вариант — хеш заметно дешевле сжатия.
+    maxsize=0 отключает кеш.
+    """
+
+    def __init__(self, maxsize: int = 128) -> None:
+        self.maxsize = maxsize
+        self._items: OrderedDict[tuple[bytes, str], bytes] = OrderedDict()
+
+    def get(self, body: bytes, encoding: str) -> bytes:
+        if not self.maxsize:
+            return compressors()[encoding](body)
+        key = (hashlib.sha1(body, usedforsecurity=False).digest(), encoding)
+        if (compressed := self._items.get(key)) is not None:
+            self._items.move_to_end(key)
+            return compressed
+        compressed = compressors()[encoding](body)
+        self._items[key] = compressed
+        if len(self._items) > self.maxsize:
+            self._items.popitem(last=False)
+        return compressed
+
+
+compressed_variants = CompressedVariants(CONFIG.RESPONSE_COMPRESSION_CACHE_SIZE)
+
+
+class CompressibleJSONResponse(Response):
+    """
+    JSON ответ, который сжимается при отправке, если тело не меньше
+    minimum_size, а клиент принимает gzip, br или zstd.
+    """
+
+    media_type = "application/json"
+
+    def __init__(
+        self,
+        content: bytes,
+        status_code: int = 200,
+        minimum_size: int = CONFIG.RESPONSE_COMPRESSION_MIN_SIZE,
+        variants: CompressedVariants = compressed_variants,
+    ) -> None:
+        super().__init__(content=content, status_code=status_code)
+        self.minimum_size = minimum_size
+        self.variants = variants
+        if len(self.body) >= minimum_size:
+            self.headers.add_vary_header("Accept-Encoding")
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if len(self.body) >= self.minimum_size and (
+            encoding := accepted_encoding(scope)
+        ):
+            with span("compress"):
+                # bytes() от bytes возвращает тот же объект, без копии.
+                self.body = self.variants.get(bytes(self.body), encoding)
+            self.headers["content-encoding"] = encoding
+            self.headers["content-length"] = str(len(self.body))
+        await super().__call__(scope, receive, send)
+
+
+@cache
+def schema_adapter(schema: type[BaseModel]) -> TypeAdapter[Any]:
+    """TypeAdapter строится один раз на схему."""
+    return TypeAdapter(schema)
+
+
+def schema_response(
+    schema: type[BaseModel],
+    data: Any,
+    status_code: int = 200,
+    compress: bool = False,
+    exclude_unset: bool = False,
+) -> Response:
+    """
+    Валидирует данные сервиса по схеме и сразу сериализует их в JSON.
+
+    Готовый Response FastAPI отдаёт как есть: без повторной валидации по
+    response_model и без jsonable_encoder. Схема маршрута для OpenAPI задаётся
+    через response_model в декораторе. compress — для списков (лент), которые
+    бывают большими. exclude_unset — для схем с выбираемыми полями.
+    """
+    adapter = schema_adapter(schema)
+    with span("serialize"):
+        model = adapter.validate_python(data, from_attributes=True)
+        content = adapter.dump_json(model, exclude_unset=exclude_unset)
+    if compress:
+        return CompressibleJSONResponse(content=content, status_code=status_code)
+    return Response(
+        content=content, status_code=status_code, media_type="application/json"
+    )
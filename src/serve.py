@@ -0,0 +1,104 @@
+"""
+Продовый запуск: gunicorn с uvicorn воркерами на uvloop и httptools.
+
+    python -m src.serve
+
+Число воркеров — по доступным CPU с учётом affinity и квоты cgroup
+(контейнер с --cpus=2 на 32-ядерной машине получит 2 воркера), либо
+SERVER_WORKERS. Пулы Redis, Mongo и SQL открываются в lifespan каждого
+воркера, после fork.
+"""
+
+import math
+import os
+from importlib.util import find_spec
+from pathlib import Path
+from typing import Any
+
+from gunicorn.app.base import BaseApplication
+from uvicorn.workers import UvicornWorker
+
+from src.config import CONFIG
+
+
+class AppWorker(UvicornWorker):
+    CONFIG_KWARGS = {
+        "loop": "uvloop" if find_spec("uvloop") else "asyncio",
+        "http": "httptools" if find_spec("httptools") else "h11",
+        "lifespan": "on",
+    }
+
+
+CGROUP_ROOT = Path("/sys/fs/cgroup")
+
+
+def cgroup_cpu_limit(root: Path = CGROUP_ROOT) -> float | None:
+    """Квота CPU контейнера: cgroup v2 (cpu.max) или v1 (cfs_quota/cfs_period)."""
+    cpu_max = root / "cpu.max"
+    try:
+        if cpu_max.exists():
+            quota_raw, period_raw = cpu_max.read_text().split()
+            return None if quota_raw == "max" else int(quota_raw) / int(period_raw)
+        quota = int((root / "cpu" / "cpu.cfs_quota_us").read_text())
+        period = int((root / "cpu" / "cpu.cfs_period_us").read_text())
+        return quota / period if quota > 0 else None
+    except (OSError, ValueError):
+        return None
+
+
+def available_cpus() -> int:
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:  # не Linux
+        cpus = os.cpu_count() or 1
+    if (limit := cgroup_cpu_limit()) is not None:
+        cpus = min(cpus, math.ceil(limit))
+    return max(1, cpus)
+
+
+def worker_count() -> int:
+    # Асинхронный воркер сам держит тысячи соединений: один процесс на ядро.
+    return CONFIG.SERVER_WORKERS or available_cpus()
+
+
+class Server(BaseApplication):
+    def __init__(self, options: dict[str, Any]) -> None:
+        self.options = options
+        super().__init__()
+
+    def load_config(self) -> None:
+        for key, value in self.options.items():
+            self.cfg.set(key, value)
+
+    def load(self) -> Any:
+        # Приложение импортируется в воркере, а не в мастере: без preload
+        # пулы и клиенты не переживают fork.
+        from src.main import app
+
+        return app
+
+
+def options() -> dict[str, Any]:
+    return {
+        "bind": f"{CONFIG.SERVER_HOST}:{CONFIG.SERVER_PORT}",
+        "workers": worker_count(),
+        "worker_class": f"{__name__}.AppWorker",
+        "backlog": CONFIG.SERVER_BACKLOG,
+        # Больше idle timeout балансировщика, чтобы тот не получал обрыв соединения.
+        "keepalive": CONFIG.SERVER_KEEPALIVE_SECONDS,
+        "graceful_timeout": CONFIG.SERVER_GRACEFUL_TIMEOUT_SECONDS,
+        "timeout": CONFIG.SERVER_GRACEFUL_TIMEOUT_SECONDS * 2,
+        "max_requests": CONFIG.SERVER_MAX_REQUESTS,
+        "max_requests_jitter": CONFIG.SERVER_MAX_REQUESTS // 10,
+        "forwarded_allow_ips": CONFIG.SERVER_FORWARDED_ALLOW_IPS,
+        "accesslog": "-" if CONFIG.SERVER_ACCESS_LOG else None,
+        "errorlog": "-",
+    }
+
+
+def main() -> None:
+    Server(options()).run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""
+Лёгкие тайминги запроса: спаны складываются в RequestTimings текущего запроса
+(через contextvar), а по завершении запроса — в гистограммы по маршрутам.
+Вне запроса (скрипты, бенчмарки) спаны ничего не делают.
+"""
+
+import inspect
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from time import perf_counter
+from collections.abc import Awaitable, Callable, Coroutine, Iterator
+from typing import Any, ParamSpec, TypeVar
+
+P = ParamSpec("P")
+T = TypeVar("T")
+C = TypeVar("C", bound=type)
+
+# Границы бакетов гистограмм, секунды.
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+class RequestTimings:
+    def __init__(self) -> None:
+        self.started = perf_counter()
+        # Имя спана -> (суммарная длительность, число вызовов).
+        self.spans: dict[str, tuple[float, int]] = {}
+
+    def add(self, name: str, duration: float) -> None:
+        total, count = self.spans.get(name, (0.0, 0))
+        self.spans[name] = (total + duration, count + 1)
+
+    def elapsed(self) -> float:
+        return perf_counter() - self.started
+
+    def server_timing(self) -> str:
+        """Значение заголовка Server-Timing, длительности в миллисекундах."""
+        parts = [
+            f'{name};dur={total * 1000:.2f};desc="{count}x"'
+            for name, (total, count) in self.spans.items()
+        ]
+        parts.append(f"total;dur={self.elapsed() * 1000:.2f}")
+        return ", ".join(parts)
+
+
+current_timings: ContextVar[RequestTimings | None] = ContextVar(
+    "current_timings", default=None
+)
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    timings = current_timings.get()
+    if timings is None:
+        yield
+        return
+    started = perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(name, perf_counter() - started)
+
+
+def timed(
+    name: str,
+) -> Callable[[Callable[P, Awaitable[T]]], Callable[P, Coroutine[Any, Any, T]]]:
+    """Декоратор корутины: всё её выполнение — спан name."""
+
+    def decorator(fn: Callable[P, Awaitable[T]]) -> Callable[P, Coroutine[Any, Any, T]]:
+        @wraps(fn)
+        async def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+            with span(name):
+                return await fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def timed_methods(name: str) -> Callable[[C], C]:
+    """Декоратор класса: публичные корутины класса — спаны name."""
+
+    def decorator(cls: C) -> C:
+        for attr, value in list(vars(cls).items()):
+            if not attr.startswith("_") and inspect.iscoroutinefunction(value):
+                setattr(cls, attr, timed(name)(value))
+        return cls
+
+    return decorator
+
+
+class Histogram:
+    def __init__(self) -> None:
+        self.buckets = [0] * (len(BUCKETS) + 1)  # последний — +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.buckets[bisect_left(BUCKETS, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class LatencyRegistry:
+    """Гистограммы длительности запросов и спанов по маршрутам (на воркер)."""
+
+    def __init__(self) -> None:
+        self.requests: dict[tuple[str, str], Histogram] = {}
+        self.spans: dict[tuple[str, str, str], Histogram] = {}
+
+    def observe(self, method: str, route: str, timings: RequestTimings) -> None:
+        key = (method, route)
+        self.requests.setdefault(key, Histogram()).observe(timings.elapsed())
+        for name, (total, _) in timings.spans.items():
+            self.spans.setdefault((*key, name), Histogram()).observe(total)
+
+    def render(self) -> str:
+        """Формат экспозиции Prometheus."""
+        lines: list[str] = []
+        self._render(
+            lines,
+            "http_request_duration_seconds",
+            "Request latency by route",
+            {(("method", m), ("route", r)): h for (m, r), h in self.requests.items()},
+        )
+        self._render(
+            lines,
+            "http_request_span_duration_seconds",
+            "Time spent in request spans by route",
+            {
+                (("method", m), ("route", r), ("span", s)): h
+                for (m, r, s), h in self.spans.items()
+            },
+        )
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _render(
+        lines: list[str],
+        metric: str,
+        help_text: str,
+        histograms: dict[tuple[tuple[str, str], ...], Histogram],
+    ) -> None:
+        lines.append(f"# HELP {metric} {help_text}")
+        lines.append(f"# TYPE {metric} histogram")
+        for labels, histogram in histograms.items():
+            base = ",".join(f'{k}="{v}"' for k, v in labels)
+            cumulative = 0
+            for bound, count in zip((*BUCKETS, "+Inf"), histogram.buckets):
+                cumulative += count
+                lines.append(f'{metric}_bucket{{{base},le="{bound}"}} {cumulative}')
+            lines.append(f"{metric}_sum{{{base}}} {histogram.sum}")
+            lines.append(f"{metric}_count{{{base}}} {histogram.count}")
+
+
+latency_registry = LatencyRegistry()
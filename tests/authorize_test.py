@@ -0,0 +1,126 @@
+import asyncio
+from typing import Self
+
+import pytest
+
+from src.application.authorize import UseCaseGuard
+from src.context import CredentialsHolder
+from src.domain.entities.user import RolesEnum
+from src.domain.exceptions.auth import AccessDeniedError, TokenError
+from src.domain.value_objects.auth import AuthorizationContext
+
+GUEST = AuthorizationContext(user_id=None, role=RolesEnum.GUEST)
+USER = AuthorizationContext(user_id=1, role=RolesEnum.USER)
+
+
+class Credentials:
+    def __init__(self, access: str, refresh: str = "refresh") -> None:
+        self.access = access
+        self.refresh = refresh
+
+    def get_authorize(self) -> str:
+        return self.access
+
+    def get_authenticate(self) -> str:
+        return self.refresh
+
+
+class FakeAuth:
+    """Принимает только access токен "valid"; журнал вызовов — в calls."""
+
+    def __init__(self) -> None:
+        self.calls: list[str] = []
+        self.renewable = True
+
+    async def authorize(self, credentials, device_id):
+        self.calls.append("authorize")
+        if credentials.get_authorize() != "valid":
+            raise TokenError()
+        return USER
+
+    async def renew_credentials(self, credentials, device_id, get_user):
+        self.calls.append("renew")
+        if not self.renewable:
+            raise TokenError()
+        return Credentials("valid", "renewed")
+
+    async def is_revoked(self, context):
+        self.calls.append("is_revoked")
+        return False
+
+
+class NoopUnitOfWork:
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(self, *args: object) -> None:
+        pass
+
+
+def make_guard(role: RolesEnum, lazy: bool) -> tuple[UseCaseGuard[None], FakeAuth]:
+    auth = FakeAuth()
+    guard: UseCaseGuard[None] = UseCaseGuard(
+        required_role=role,
+        auth_service=auth,
+        use_case=None,
+        uow=NoopUnitOfWork(),
+        default_context=GUEST,
+        lazy=lazy,
+    )
+    return guard, auth
+
+
+def call(
+    guard: UseCaseGuard[None], access: str, holder: CredentialsHolder | None = None
+) -> AuthorizationContext:
+    async def run() -> AuthorizationContext:
+        async with guard(
+            credentials=Credentials(access),
+            creds_holder=holder or CredentialsHolder(),
+            device_id="ip",
+        ) as (_, context, _):
+            return context
+
+    return asyncio.run(run())
+
+
+def test_lazy_guest_route_serves_expired_token_as_guest_without_renewal():
+    guard, auth = make_guard(RolesEnum.GUEST, lazy=True)
+    holder = CredentialsHolder()
+    assert call(guard, "expired", holder) == GUEST
+    assert auth.calls == ["authorize"]
+    assert holder.credentials is None
+
+
+def test_lazy_guest_route_skips_revocation_check():
+    guard, auth = make_guard(RolesEnum.GUEST, lazy=True)
+    assert call(guard, "valid") == USER
+    assert auth.calls == ["authorize"]
+
+
+def test_user_route_renews_expired_token():
+    guard, auth = make_guard(RolesEnum.USER, lazy=False)
+    holder = CredentialsHolder()
+    assert call(guard, "expired", holder) == USER
+    assert auth.calls == ["authorize", "renew", "authorize", "is_revoked"]
+    assert holder.credentials.get_authenticate() == "renewed"
+
+
+def test_batch_sub_request_reuses_the_batch_context():
+    guard, auth = make_guard(RolesEnum.USER, lazy=False)
+    holder = CredentialsHolder()
+    holder.context = USER
+    assert call(guard, "expired", holder) == USER
+    assert auth.calls == []
+
+
+def test_lazy_mode_is_only_for_guest_routes():
+    with pytest.raises(ValueError):
+        make_guard(RolesEnum.USER, lazy=True)
+
+
+def test_guest_is_denied_on_user_route():
+    guard, auth = make_guard(RolesEnum.USER, lazy=False)
+    auth.renewable = False
+    with pytest.raises(AccessDeniedError):
+        call(guard, "expired")
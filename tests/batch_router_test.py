@@ -0,0 +1,99 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("httpx")
+
+from dependency_injector import providers
+from fastapi import APIRouter, FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from src.config import CONFIG
+from src.container import container
+from src.domain.entities.user import RolesEnum
+from src.domain.exceptions.auth import AccessDeniedError
+from src.domain.value_objects.auth import AuthorizationContext
+from src.main import app as main_app
+from src.presentation.http.batch import router as batch_router
+
+
+class FakeGuard:
+    @asynccontextmanager
+    async def __call__(self, *, credentials, creds_holder, device_id, cost=1):
+        yield None, AuthorizationContext(None, RolesEnum.GUEST), credentials
+
+
+class Concurrency:
+    def __init__(self) -> None:
+        self.running = 0
+        self.peak = 0
+
+
+def make_app(concurrency: Concurrency) -> FastAPI:
+    posts = APIRouter(prefix="/posts")
+
+    @posts.get("/ok")
+    async def ok() -> dict[str, bool]:
+        return {"ok": True}
+
+    @posts.get("/denied")
+    async def denied() -> None:
+        raise AccessDeniedError("Access denied")
+
+    @posts.get("/missing")
+    async def missing() -> None:
+        raise HTTPException(status_code=404, detail="Post not found")
+
+    @posts.get("/slow")
+    async def slow() -> None:
+        concurrency.running += 1
+        concurrency.peak = max(concurrency.peak, concurrency.running)
+        await asyncio.sleep(0.01)
+        concurrency.running -= 1
+
+    # Обработчики исключений — те же, что у приложения.
+    app = FastAPI(exception_handlers=main_app.exception_handlers)
+    app.include_router(posts)
+    app.include_router(batch_router.router)
+    return app
+
+
+@pytest.fixture
+def batch():
+    concurrency = Concurrency()
+    container.wire(modules=[batch_router])
+    with container.batch_guard.override(providers.Object(FakeGuard())):
+        yield TestClient(make_app(concurrency)), concurrency
+    container.unwire()
+
+
+def test_sub_responses_keep_their_status(batch):
+    client, _ = batch
+    paths = ["/posts/ok", "/posts/denied", "/posts/missing", "/posts/unknown"]
+    response = client.post(
+        "/batch/", json={"requests": [{"id": p, "path": p} for p in paths]}
+    )
+    assert response.status_code == 200
+    assert response.json()["responses"] == [
+        {"id": "/posts/ok", "status": 200, "body": {"ok": True}},
+        {"id": "/posts/denied", "status": 403, "body": {"detail": "Access denied"}},
+        {"id": "/posts/missing", "status": 404, "body": {"detail": "Post not found"}},
+        {"id": "/posts/unknown", "status": 404, "body": {"detail": "Not Found"}},
+    ]
+
+
+def test_non_api_path_is_rejected(batch):
+    client, _ = batch
+    response = client.post("/batch/", json={"requests": [{"path": "/metrics"}]})
+    assert response.status_code == 422
+
+
+def test_concurrency_is_capped(batch, monkeypatch):
+    client, concurrency = batch
+    monkeypatch.setattr(CONFIG, "BATCH_CONCURRENCY", 2)
+    requests = [{"path": "/posts/slow"}] * 6
+    response = client.post("/batch/", json={"requests": requests})
+    assert [item["status"] for item in response.json()["responses"]] == [200] * 6
+    assert concurrency.peak == 2
@@ -0,0 +1,42 @@
+import pytest
+
+pytest.importorskip("pydantic")
+
+from pydantic import ValidationError
+
+from src.config import CONFIG
+from src.infrastructure.schemas.batch import (
+    BatchItemSchema,
+    BatchRequestSchema,
+)
+
+
+@pytest.mark.parametrize(
+    "path", ["/posts/?limit=10", "/posts/1/comments/", "/projects/"]
+)
+def test_api_path_is_accepted(path):
+    assert BatchItemSchema(path=path).path == path
+
+
+@pytest.mark.parametrize(
+    "path", ["http://example.com/posts/", "//example.com/posts/", "posts/", ""]
+)
+def test_foreign_or_relative_path_is_rejected(path):
+    with pytest.raises(ValidationError):
+        BatchItemSchema(path=path)
+
+
+@pytest.mark.parametrize(
+    "path", ["/metrics", "/batch/", "/auth/password", "/postsx/", "/posts/../metrics"]
+)
+def test_service_path_is_rejected(path):
+    with pytest.raises(ValidationError):
+        BatchItemSchema(path=path)
+
+
+def test_batch_size_is_bounded():
+    with pytest.raises(ValidationError):
+        BatchRequestSchema(requests=[])
+    items = [{"path": "/posts/"}] * (CONFIG.BATCH_MAX_REQUESTS + 1)
+    with pytest.raises(ValidationError):
+        BatchRequestSchema(requests=items)
@@ -0,0 +1,21 @@
+import asyncio
+
+import pytest
+
+fakeredis = pytest.importorskip("fakeredis")
+
+from src.infrastructure.clients.cache import RedisCacheClient
+
+
+def test_keys_scans_by_pattern():
+    async def run() -> None:
+        client = RedisCacheClient(fakeredis.FakeAsyncRedis(decode_responses=True))
+        for key in ("posts:None:20", "stale:posts:None:20", "post:1"):
+            await client.set(key=key, data={})
+        assert await client.keys("posts:*:*") == ["posts:None:20"]
+        assert sorted(await client.keys("*posts:*")) == [
+            "posts:None:20",
+            "stale:posts:None:20",
+        ]
+
+    asyncio.run(run())
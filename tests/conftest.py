@@ -0,0 +1,63 @@
+import os
+from fnmatch import fnmatchcase
+from typing import Any
+
+import pytest
+
+# Обязательные поля Config: модули src читают его при импорте.
+ENV_DEFAULTS = {
+    "ADMIN_USERNAME": "test",
+    "ADMIN_PASSWORD": "test-password",
+    "POSTGRES_USER": "test",
+    "POSTGRES_PASSWORD": "test",
+    "POSTGRES_DB": "test",
+    "POSTGRES_HOST": "localhost",
+    "POSTGRES_PORT": "5432",
+    "MONGO_USER": "test",
+    "MONGO_PASSWORD": "test",
+    "MONGO_HOST": "localhost",
+    "MONGO_PORT": "27017",
+    "REFRESH_TOKEN_EXPIRE_SECONDS": "86400",
+    "ACCESS_TOKEN_EXPIRE_SECONDS": "900",
+    "POSTS_CACHE_EXPIRE_SECONDS": "60",
+    "COMMENTS_CACHE_EXPIRE_SECONDS": "60",
+    "PROJECTS_CACHE_EXPIRE_SECONDS": "60",
+}
+
+for key, value in ENV_DEFAULTS.items():
+    os.environ.setdefault(key, value)
+
+
+class MemoryCacheClient:
+    """AbstractCacheClient в памяти, шаблоны keys() — как у Redis KEYS."""
+
+    def __init__(self) -> None:
+        self.items: dict[str, Any] = {}
+        self.expirations: dict[str, int | None] = {}
+
+    async def set(self, *, key: str, data: Any, expiration: int | None = None) -> None:
+        self.items[key] = data
+        self.expirations[key] = expiration
+
+    async def get(self, key: str) -> Any:
+        return self.items.get(key)
+
+    async def get_many(self, *keys: str) -> list[Any]:
+        return [self.items.get(key) for key in keys]
+
+    async def set_many(
+        self, items: dict[str, Any], expiration: int | None = None
+    ) -> None:
+        self.items.update(items)
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            self.items.pop(key, None)
+
+    async def keys(self, pattern: str) -> list[str]:
+        return [key for key in self.items if fnmatchcase(key, pattern)]
+
+
+@pytest.fixture
+def cache_client() -> MemoryCacheClient:
+    return MemoryCacheClient()
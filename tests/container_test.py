@@ -0,0 +1,86 @@
+from collections.abc import Iterator
+from enum import Enum
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("dependency_injector")
+pytest.importorskip("motor")
+pytest.importorskip("cryptography")
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ed25519
+from dependency_injector import providers
+
+from src.application.authorize import UseCaseGuard
+from src.application.services.posts import PostsService
+from src.application.services.projects import ProjectsService
+from src.application.services.users import UsersService
+from src.application.usecases.abs import AbstractUseCase
+from src.container import container
+from src.infrastructure.keys import JwtKeyManager
+
+# Объекты, которые раньше собирались на каждый запрос.
+STATELESS = (
+    UseCaseGuard,
+    AbstractUseCase,
+    PostsService,
+    ProjectsService,
+    UsersService,
+)
+
+
+def make_keys(directory: Path) -> JwtKeyManager:
+    key = ed25519.Ed25519PrivateKey.generate()
+    private_path = directory / "private.pem"
+    public_path = directory / "public.pem"
+    private_path.write_bytes(
+        key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        )
+    )
+    public_path.write_bytes(
+        key.public_key().public_bytes(
+            serialization.Encoding.PEM,
+            serialization.PublicFormat.SubjectPublicKeyInfo,
+        )
+    )
+    return JwtKeyManager(private_key_path=private_path, public_key_paths=[public_path])
+
+
+@pytest.fixture
+def singletons(tmp_path: Path) -> Iterator[dict[providers.Singleton, object]]:
+    # Сборка графа не открывает соединений: пулы подключаются в lifespan.
+    with container.jwt_keys.override(providers.Object(make_keys(tmp_path))):
+        built = {
+            provider: provider()
+            for provider in container.traverse(types=[providers.Singleton])
+        }
+        yield built
+    container.reset_singletons()
+
+
+def test_singletons_are_built_once(
+    singletons: dict[providers.Singleton, object],
+) -> None:
+    for provider, instance in singletons.items():
+        assert provider() is instance
+    guard = container.get_posts_use_case()
+    assert guard._UseCaseGuard__use_case is container._get_posts_use_case()
+    assert guard.uow is container.uow() is container.posts().uow
+
+
+def test_singletons_hold_no_request_state(
+    singletons: dict[providers.Singleton, object],
+) -> None:
+    shared = {id(instance) for instance in singletons.values()}
+    stateless = [i for i in singletons.values() if isinstance(i, STATELESS)]
+    assert stateless
+    for instance in stateless:
+        for name, value in vars(instance).items():
+            # Только другие синглтоны и неизменяемые настройки.
+            assert id(value) in shared or isinstance(
+                value, bool | int | str | Enum | None
+            ), f"{type(instance).__name__}.{name}"
@@ -0,0 +1,69 @@
+import asyncio
+import logging
+
+import pytest
+
+fakeredis = pytest.importorskip("fakeredis")
+pytest.importorskip("lupa")
+
+from src.infrastructure.rate_limit import RedisRateLimiter
+
+
+def make_limiter(
+    limit: int, period: float
+) -> tuple[RedisRateLimiter, fakeredis.FakeServer]:
+    server = fakeredis.FakeServer()
+    redis = fakeredis.FakeAsyncRedis(server=server)
+    return RedisRateLimiter(redis, limit=limit, period=period), server
+
+
+def test_burst_up_to_limit_then_retry_after_one_interval():
+    async def run() -> None:
+        limiter, _ = make_limiter(limit=3, period=60)
+        results = [await limiter.hit("ip") for _ in range(4)]
+        assert [r.allowed for r in results] == [True, True, True, False]
+        assert [r.remaining for r in results] == [2, 1, 0, 0]
+        # Следующий запрос пройдёт через period / limit секунд.
+        assert results[-1].retry_after == pytest.approx(20, abs=0.1)
+        assert results[-1].reset_after == pytest.approx(60, abs=0.1)
+
+    asyncio.run(run())
+
+
+def test_quota_refills_by_interval():
+    async def run() -> None:
+        limiter, _ = make_limiter(limit=2, period=0.2)
+        assert (await limiter.hit("ip")).allowed
+        assert (await limiter.hit("ip")).allowed
+        assert not (await limiter.hit("ip")).allowed
+        await asyncio.sleep(0.12)
+        assert (await limiter.hit("ip")).allowed
+        assert not (await limiter.hit("ip")).allowed
+
+    asyncio.run(run())
+
+
+def test_cost_and_keys_are_counted_separately():
+    async def run() -> None:
+        limiter, _ = make_limiter(limit=5, period=60)
+        assert (await limiter.hit("a", cost=5)).remaining == 0
+        assert not (await limiter.hit("a")).allowed
+        assert (await limiter.hit("b")).remaining == 4
+
+    asyncio.run(run())
+
+
+def test_unavailable_redis_fails_open_with_one_warning(caplog):
+    async def run() -> None:
+        limiter, server = make_limiter(limit=1, period=60)
+        server.connected = False
+        with caplog.at_level(logging.INFO, logger="src.infrastructure.rate_limit"):
+            results = [await limiter.hit("ip") for _ in range(3)]
+            server.connected = True
+            assert (await limiter.hit("ip")).allowed
+        assert all(result.allowed for result in results)
+
+    asyncio.run(run())
+    levels = [record.levelname for record in caplog.records]
+    assert levels == ["WARNING", "INFO"]
+    assert "3 requests were allowed unchecked" in caplog.records[-1].getMessage()
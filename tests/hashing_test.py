@@ -0,0 +1,25 @@
+import pytest
+
+pytest.importorskip("bcrypt")
+
+from src.infrastructure.hashing import BcryptHasher
+
+
+@pytest.fixture
+def hasher():
+    hasher = BcryptHasher(rounds=12)
+    yield hasher
+    hasher._executor.shutdown()
+
+
+def test_same_cost_needs_no_rehash(hasher):
+    assert not hasher.needs_rehash(b"$2b$12$" + b"a" * 53)
+
+
+def test_other_cost_needs_rehash(hasher):
+    assert hasher.needs_rehash(b"$2b$10$" + b"a" * 53)
+
+
+def test_malformed_hash_needs_rehash(hasher):
+    assert hasher.needs_rehash(b"plain")
+    assert hasher.needs_rehash(b"$2b$xx$")
@@ -0,0 +1,70 @@
+import os
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("cryptography")
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
+
+from src.infrastructure.credentials import AccessTokenPayload, TokenType
+from src.infrastructure.keys import JwtKeyManager, key_algorithm
+from src.infrastructure.token_cache import VerifiedTokenCache
+
+
+def test_rsa_key_is_rs256():
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    assert key_algorithm(key.public_key()) == "RS256"
+
+
+def test_p256_key_is_es256():
+    key = ec.generate_private_key(ec.SECP256R1())
+    assert key_algorithm(key.public_key()) == "ES256"
+
+
+def test_ed25519_key_is_eddsa():
+    key = ed25519.Ed25519PrivateKey.generate()
+    assert key_algorithm(key.public_key()) == "EdDSA"
+
+
+def test_other_curve_is_rejected():
+    key = ec.generate_private_key(ec.SECP384R1())
+    with pytest.raises(ValueError):
+        key_algorithm(key.public_key())
+
+
+def write_keys(directory: Path) -> tuple[Path, Path]:
+    key = ec.generate_private_key(ec.SECP256R1())
+    private_path = directory / "private.pem"
+    public_path = directory / "public.pem"
+    private_path.write_bytes(
+        key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        )
+    )
+    public_path.write_bytes(
+        key.public_key().public_bytes(
+            serialization.Encoding.PEM,
+            serialization.PublicFormat.SubjectPublicKeyInfo,
+        )
+    )
+    return private_path, public_path
+
+
+def test_reload_notifies_subscribers(tmp_path):
+    private_path, public_path = write_keys(tmp_path)
+    keys = JwtKeyManager(private_path, [public_path], check_interval=0)
+    cache = VerifiedTokenCache()
+    keys.on_reload(cache.clear)
+    cache.put("token", AccessTokenPayload("test", "1", 1, 2**31, TokenType.ACCESS))
+
+    keys.maybe_reload()
+    assert cache.get("token") is not None
+
+    write_keys(tmp_path)
+    os.utime(private_path, (0, 0))
+    keys.maybe_reload()
+    assert cache.get("token") is None
@@ -0,0 +1,122 @@
+from ipaddress import ip_network
+
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("httpx")
+
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from src.application.interfaces.clients.rate_limit import RateLimitResult
+from src.config import CONFIG
+from src.presentation.http.middlewares import (
+    CredentialsMiddleware,
+    RateLimitMiddleware,
+    is_internal_client,
+)
+
+
+class Credentials:
+    def get_authorize(self) -> str:
+        return "new-access"
+
+    def get_authenticate(self) -> str:
+        return "new-refresh"
+
+
+class FixedLimiter:
+    """Пропускает первые limit обращений; запоминает ключи."""
+
+    def __init__(self, limit: int) -> None:
+        self.limit = limit
+        self.keys: list[str] = []
+
+    async def hit(self, key: str, cost: int = 1) -> RateLimitResult:
+        self.keys.append(key)
+        allowed = len(self.keys) <= self.limit
+        return RateLimitResult(
+            allowed=allowed,
+            limit=self.limit,
+            remaining=max(0, self.limit - len(self.keys)),
+            retry_after=0 if allowed else 2.5,
+            reset_after=10,
+        )
+
+
+def make_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/renewed")
+    async def renewed(request: Request) -> dict[str, str]:
+        request.state.creds_holder.credentials = Credentials()
+        return {"status": "renewed"}
+
+    @app.get("/plain")
+    async def plain() -> dict[str, str]:
+        return {"status": "ok"}
+
+    @app.get("/stream")
+    async def stream(request: Request) -> StreamingResponse:
+        request.state.creds_holder.credentials = Credentials()
+
+        async def chunks():
+            yield b"first,"
+            yield b"second"
+
+        return StreamingResponse(chunks())
+
+    return app
+
+
+def test_renewed_credentials_are_set_as_cookies():
+    app = make_app()
+    app.add_middleware(CredentialsMiddleware)
+    client = TestClient(app)
+    response = client.get("/renewed")
+    assert response.json() == {"status": "renewed"}
+    assert response.cookies["access_token"] == "new-access"
+    assert response.cookies["refresh_token"] == "new-refresh"
+    assert "set-cookie" not in client.get("/plain").headers
+
+
+def test_streaming_response_keeps_body_and_cookies():
+    app = make_app()
+    app.add_middleware(CredentialsMiddleware)
+    response = TestClient(app).get("/stream")
+    assert response.content == b"first,second"
+    assert response.cookies["access_token"] == "new-access"
+
+
+def test_rate_limit_headers_and_429():
+    app = make_app()
+    limiter = FixedLimiter(limit=1)
+    app.add_middleware(RateLimitMiddleware, limiter=limiter)
+    client = TestClient(app, client=("203.0.113.5", 50000))
+
+    allowed = client.get("/plain")
+    assert allowed.status_code == 200
+    assert allowed.headers["x-rate-limit-limit"] == "1"
+    assert allowed.headers["x-rate-limit-remaining"] == "0"
+    assert "x-rate-limit-reset" in allowed.headers
+
+    refused = client.get("/plain")
+    assert refused.status_code == 429
+    assert refused.json() == {"detail": "Too many requests"}
+    assert refused.headers["retry-after"] == "3"
+    assert limiter.keys == ["203.0.113.5", "203.0.113.5"]
+
+
+def test_internal_networks_come_from_config(monkeypatch):
+    monkeypatch.setattr(
+        CONFIG,
+        "METRICS_ALLOWED_NETWORKS",
+        [ip_network("10.0.0.0/8"), ip_network("fd00::/8")],
+    )
+    assert is_internal_client({"client": ("10.1.2.3", 1)})
+    assert is_internal_client({"client": ("fd00::1", 1)})
+    assert not is_internal_client({"client": ("127.0.0.1", 1)})
+    assert not is_internal_client({"client": None})
+    monkeypatch.setattr(CONFIG, "METRICS_ALLOWED_NETWORKS", [])
+    assert not is_internal_client({"client": ("10.1.2.3", 1)})
@@ -0,0 +1,19 @@
+from src.domain.entities.post import make_excerpt
+
+
+def test_short_content_is_kept():
+    assert make_excerpt("hello", 10) == "hello"
+
+
+def test_cut_at_word_boundary():
+    assert make_excerpt("hello world again", 10) == "hello…"
+
+
+def test_cut_before_space():
+    assert make_excerpt("hello world", 6) == "hello…"
+
+
+def test_single_long_word_is_cut_inside():
+    excerpt = make_excerpt("abcdefghij", 5)
+    assert excerpt == "abcd…"
+    assert len(excerpt) == 5
@@ -0,0 +1,39 @@
+import pytest
+
+pytest.importorskip("pydantic")
+
+from src.domain.entities.post import POST_FIELDS
+from src.infrastructure.schemas.post import SparsePostSchema, select_post_fields
+
+
+def test_full_post_by_default():
+    assert select_post_fields(None, excerpt=False) is None
+
+
+def test_selected_fields():
+    assert select_post_fields("title, author", excerpt=False) == {"title", "author"}
+
+
+def test_excerpt_replaces_content():
+    assert select_post_fields("title,content", excerpt=True) == {"title", "excerpt"}
+    assert select_post_fields(None, excerpt=True) == POST_FIELDS - {"content"}
+
+
+def test_recent_comments_bring_comments_count():
+    assert select_post_fields("recent_comments", excerpt=False) == {
+        "recent_comments",
+        "comments_count",
+    }
+
+
+@pytest.mark.parametrize("fields", ["title,password", "", " , "])
+def test_unknown_or_empty_fields_are_rejected(fields):
+    with pytest.raises(ValueError):
+        select_post_fields(fields, excerpt=False)
+
+
+def test_recent_comments_without_comments_count():
+    # Документ из старого кеша или без проекции comments_count.
+    post = SparsePostSchema.model_validate({"id": "1", "recent_comments": []})
+    assert post.recent_comments is not None
+    assert post.recent_comments.has_next is False
@@ -0,0 +1,114 @@
+from contextlib import asynccontextmanager
+from datetime import UTC, datetime
+
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("httpx")
+
+from dependency_injector import providers
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.container import container
+from src.domain.entities.post import Post
+from src.domain.entities.user import Author, RolesEnum
+from src.domain.value_objects.auth import AuthorizationContext
+from src.presentation.http.posts import router as posts_router
+
+AUTHOR = Author(id=1, name="Author", email="author@example.com", photo_url="")
+CREATED_AT = datetime(2025, 1, 1, tzinfo=UTC)
+
+
+class FakeGetPosts:
+    """Лента из одного поста; запоминает запрошенные поля."""
+
+    def __init__(self) -> None:
+        self.fields: frozenset[str] | None = None
+
+    async def __call__(self, context, last_id=None, limit=20, fields=None):
+        self.fields = fields
+        if fields is None:
+            post = Post(
+                id="1",
+                title="Title",
+                content="Long content",
+                author=AUTHOR,
+                dislikes=set(),
+                likes={2, 3},
+                created_at=CREATED_AT,
+                comments_count=0,
+                recent_comments=[],
+            )
+            return [post], False
+        document = {
+            "id": "1",
+            "title": "Title",
+            "content": "Long content",
+            "excerpt": "Long…",
+            "author": AUTHOR.to_dict(),
+            "likes": 2,
+            "dislikes": 0,
+            "created_at": CREATED_AT,
+            "comments_count": 0,
+            "recent_comments": [],
+        }
+        return [{k: v for k, v in document.items() if k == "id" or k in fields}], False
+
+
+class FakeGuard:
+    def __init__(self, use_case: FakeGetPosts) -> None:
+        self.use_case = use_case
+
+    @asynccontextmanager
+    async def __call__(self, *, credentials, creds_holder, device_id, cost=1):
+        yield self.use_case, AuthorizationContext(None, RolesEnum.GUEST), credentials
+
+
+@pytest.fixture
+def feed():
+    app = FastAPI()
+    app.include_router(posts_router.router)
+    use_case = FakeGetPosts()
+    container.wire(modules=[posts_router])
+    with container.get_posts_use_case.override(providers.Object(FakeGuard(use_case))):
+        yield TestClient(app), use_case
+    container.unwire()
+
+
+def test_full_feed(feed):
+    client, use_case = feed
+    response = client.get("/posts/")
+    assert response.status_code == 200
+    post = response.json()["posts"][0]
+    assert post["content"] == "Long content"
+    assert post["likes"] == 2
+    assert post["recent_comments"]["has_next"] is False
+    assert use_case.fields is None
+
+
+def test_sparse_feed(feed):
+    client, use_case = feed
+    response = client.get("/posts/", params={"fields": "title,likes"})
+    assert response.status_code == 200
+    assert response.json()["posts"] == [{"id": "1", "title": "Title", "likes": 2}]
+    assert use_case.fields == {"title", "likes"}
+
+
+def test_excerpt_feed(feed):
+    client, use_case = feed
+    response = client.get(
+        "/posts/", params={"fields": "title,content", "excerpt": True}
+    )
+    assert response.status_code == 200
+    assert response.json()["posts"] == [
+        {"id": "1", "title": "Title", "excerpt": "Long…"}
+    ]
+    assert use_case.fields == {"title", "excerpt"}
+
+
+def test_unknown_field_is_rejected(feed):
+    client, use_case = feed
+    response = client.get("/posts/", params={"fields": "title,password"})
+    assert response.status_code == 422
+    assert use_case.fields is None
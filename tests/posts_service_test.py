@@ -0,0 +1,125 @@
+import asyncio
+from datetime import UTC, datetime
+from types import SimpleNamespace
+
+from src.application.services.posts import PostsService
+from src.config import CONFIG
+from src.domain.entities.post import Post
+from src.domain.entities.user import Author
+
+
+class FakePostsRepository:
+    def __init__(self) -> None:
+        self.reads: list[bool] = []
+
+    async def get_posts(self, last_id, limit, stale_ok):
+        self.reads.append(stale_ok)
+        return [], False
+
+    async def get_sparse_posts(self, fields, last_id, limit, stale_ok):
+        self.reads.append(stale_ok)
+        return [{"id": "1"}], False
+
+    async def get_post(self, post_id, stale_ok):
+        self.reads.append(stale_ok)
+        return Post(
+            id=post_id,
+            title="Title",
+            content="Content",
+            author=Author(id=1, name="Author", email="a@example.com", photo_url=""),
+            dislikes=set(),
+            likes=set(),
+            created_at=datetime(2025, 1, 1, tzinfo=UTC),
+            comments_count=0,
+            recent_comments=[],
+        )
+
+    async def create_answer(self, answer, comment_id):
+        return answer
+
+    async def like_post(self, post_id, user_id):
+        return True
+
+
+def service(cache_client) -> tuple[PostsService, FakePostsRepository]:
+    posts = FakePostsRepository()
+    return PostsService(SimpleNamespace(posts=posts), cache_client), posts
+
+
+def test_stale_read_is_not_served_to_primary_reader(cache_client):
+    posts_service, posts = service(cache_client)
+    asyncio.run(posts_service.get_posts(stale_ok=True))
+    asyncio.run(posts_service.get_posts(stale_ok=False))
+    asyncio.run(posts_service.get_posts(stale_ok=True))
+    assert posts.reads == [True, False]
+    assert set(cache_client.items) == {"stale:posts:None:20", "posts:None:20"}
+
+
+def test_stale_read_expires_sooner(cache_client, monkeypatch):
+    monkeypatch.setattr(CONFIG, "STALE_CACHE_EXPIRE_SECONDS", 5)
+    posts_service, _ = service(cache_client)
+    asyncio.run(posts_service.get_posts(stale_ok=True))
+    asyncio.run(posts_service.get_posts(stale_ok=False))
+    assert cache_client.expirations == {
+        "stale:posts:None:20": 5,
+        "posts:None:20": CONFIG.POSTS_CACHE_EXPIRE_SECONDS,
+    }
+
+
+def test_stale_read_is_not_cached_with_zero_expiration(cache_client, monkeypatch):
+    monkeypatch.setattr(CONFIG, "STALE_CACHE_EXPIRE_SECONDS", 0)
+    posts_service, posts = service(cache_client)
+    asyncio.run(posts_service.get_posts(stale_ok=True))
+    asyncio.run(posts_service.get_posts(stale_ok=True))
+    assert posts.reads == [True, True]
+    assert cache_client.items == {}
+
+
+def test_write_invalidates_stale_reads(cache_client):
+    posts_service, _ = service(cache_client)
+    asyncio.run(posts_service.get_posts(stale_ok=True))
+    asyncio.run(posts_service.get_posts(stale_ok=False))
+    asyncio.run(posts_service.like_post(post_id="1", user_id=1))
+    assert cache_client.items == {}
+
+
+def test_sparse_stale_read_is_cached_separately(cache_client, monkeypatch):
+    monkeypatch.setattr(CONFIG, "STALE_CACHE_EXPIRE_SECONDS", 5)
+    posts_service, posts = service(cache_client)
+    fields = frozenset({"id", "title"})
+    asyncio.run(posts_service.get_sparse_posts(fields, stale_ok=True))
+    asyncio.run(posts_service.get_sparse_posts(fields, stale_ok=False))
+    assert posts.reads == [True, False]
+    assert cache_client.expirations == {
+        "stale:posts:None:20:id,title": 5,
+        "posts:None:20:id,title": CONFIG.POSTS_CACHE_EXPIRE_SECONDS,
+    }
+    asyncio.run(posts_service.like_post(post_id="1", user_id=1))
+    assert cache_client.items == {}
+
+
+def test_post_stale_read_is_cached_separately(cache_client, monkeypatch):
+    monkeypatch.setattr(CONFIG, "STALE_CACHE_EXPIRE_SECONDS", 5)
+    posts_service, posts = service(cache_client)
+    asyncio.run(posts_service.get_post("1", stale_ok=True))
+    asyncio.run(posts_service.get_post("1", stale_ok=False))
+    asyncio.run(posts_service.get_post("1", stale_ok=False))
+    assert posts.reads == [True, False]
+    assert cache_client.expirations == {
+        "stale:post:1": 5,
+        "post:1": CONFIG.POSTS_CACHE_EXPIRE_SECONDS,
+    }
+    asyncio.run(posts_service.like_post(post_id="1", user_id=1))
+    assert cache_client.items == {}
+
+
+def test_answer_invalidates_feed_pages(cache_client):
+    posts_service, _ = service(cache_client)
+    asyncio.run(posts_service.get_posts(stale_ok=True))
+    asyncio.run(posts_service.get_posts(stale_ok=False))
+    cache_client.items["comments:1:None:10"] = {}
+    cache_client.items["answers:2:None:10"] = {}
+    asyncio.run(
+        posts_service.create_answer(answer="answer", comment_id="2", post_id="1")
+    )
+    assert cache_client.items == {}
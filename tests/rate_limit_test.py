@@ -0,0 +1,108 @@
+import asyncio
+from collections import defaultdict
+from typing import Self
+
+import pytest
+
+pytest.importorskip("redis")
+
+from src.application.authorize import UseCaseGuard
+from src.context import CredentialsHolder
+from src.domain.entities.user import RolesEnum
+from src.domain.exceptions.base import RateLimitExceededError
+from src.domain.value_objects.auth import AuthorizationContext
+from src.infrastructure.rate_limit import (
+    LeasedRateLimiter,
+    RateLimitResult,
+)
+
+
+class MemoryLimiter:
+    """Лимитер с фиксированным окном в памяти; запоминает cost каждого обращения."""
+
+    def __init__(self, limit: int, period: int = 60) -> None:
+        self.limit = limit
+        self.period = period
+        self.used: dict[str, int] = defaultdict(int)
+        self.calls: list[int] = []
+
+    async def hit(self, key: str, cost: int = 1) -> RateLimitResult:
+        self.calls.append(cost)
+        allowed = self.used[key] + cost <= self.limit
+        if allowed:
+            self.used[key] += cost
+        return RateLimitResult(
+            allowed=allowed,
+            limit=self.limit,
+            remaining=self.limit - self.used[key],
+            retry_after=0 if allowed else 1.0,
+            reset_after=1.0,
+        )
+
+
+def hits(limiter: LeasedRateLimiter, key: str, count: int) -> list[RateLimitResult]:
+    async def run() -> list[RateLimitResult]:
+        return [await limiter.hit(key) for _ in range(count)]
+
+    return asyncio.run(run())
+
+
+def test_lease_is_spent_locally():
+    inner = MemoryLimiter(limit=100)
+    results = hits(LeasedRateLimiter(inner, lease_size=10), "k", 10)
+    assert inner.calls == [10]
+    assert all(result.allowed for result in results)
+    assert [result.remaining for result in results] == list(range(99, 89, -1))
+
+
+def test_next_lease_after_exhaustion():
+    inner = MemoryLimiter(limit=100)
+    hits(LeasedRateLimiter(inner, lease_size=10), "k", 11)
+    assert inner.calls == [10, 10]
+
+
+def test_falls_back_to_single_hits_without_full_lease():
+    inner = MemoryLimiter(limit=3)
+    results = hits(LeasedRateLimiter(inner, lease_size=10), "k", 4)
+    assert [result.allowed for result in results] == [True, True, True, False]
+    assert inner.calls == [10, 1, 10, 1, 10, 1, 10, 1]
+
+
+def test_keys_lease_separately():
+    inner = MemoryLimiter(limit=100)
+    limiter = LeasedRateLimiter(inner, lease_size=5)
+    hits(limiter, "a", 1)
+    hits(limiter, "b", 1)
+    assert inner.used == {"a": 5, "b": 5}
+
+
+class NoopUnitOfWork:
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(self, *args: object) -> None:
+        pass
+
+
+def test_batch_sub_request_is_charged_to_its_route():
+    limiter = MemoryLimiter(limit=1)
+    guard = UseCaseGuard(
+        required_role=RolesEnum.GUEST,
+        auth_service=None,
+        use_case=None,
+        uow=NoopUnitOfWork(),
+        default_context=AuthorizationContext(user_id=None, role=RolesEnum.GUEST),
+        rate_limiter=limiter,
+    )
+    # Контекст уже проверен запросом-пакетом.
+    holder = CredentialsHolder()
+    holder.context = AuthorizationContext(user_id=1, role=RolesEnum.USER)
+
+    async def sub_request() -> None:
+        async with guard(credentials=None, creds_holder=holder, device_id="ip"):
+            pass
+
+    asyncio.run(sub_request())
+    with pytest.raises(RateLimitExceededError):
+        asyncio.run(sub_request())
+    assert limiter.used == {"user:1": 1}
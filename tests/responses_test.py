@@ -0,0 +1,30 @@
+import pytest
+
+pytest.importorskip("starlette")
+
+from src.presentation.http.responses import accepted_encoding
+
+
+def scope(accept_encoding: str | None) -> dict:
+    headers = []
+    if accept_encoding is not None:
+        headers.append((b"accept-encoding", accept_encoding.encode()))
+    return {"type": "http", "headers": headers}
+
+
+def test_gzip_is_accepted():
+    assert accepted_encoding(scope("gzip, deflate")) == "gzip"
+
+
+def test_zero_q_value_refuses_encoding():
+    assert accepted_encoding(scope("gzip;q=0")) is None
+    assert accepted_encoding(scope("gzip; q=0.0")) is None
+
+
+def test_nonzero_q_value_is_accepted():
+    assert accepted_encoding(scope("gzip;q=0.5")) == "gzip"
+
+
+def test_missing_or_unknown_encoding():
+    assert accepted_encoding(scope(None)) is None
+    assert accepted_encoding(scope("identity")) is None
@@ -0,0 +1,226 @@
+import asyncio
+from time import time
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("jwt")
+pytest.importorskip("bcrypt")
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+
+from src.application.authorize import UseCaseGuard
+from src.application.services.users import UsersService
+from src.application.usecases.users.change_password import ChangePasswordUseCase
+from src.application.usecases.users.change_role import ChangeRoleUseCase
+from src.application.usecases.users.delete_user import DeleteUserUseCase
+from src.config import CONFIG
+from src.context import CredentialsHolder
+from src.domain.entities.user import RolesEnum, User
+from src.domain.exceptions.auth import (
+    AccessDeniedError,
+    AuthError,
+    SubjectNotFoundError,
+)
+from src.domain.value_objects.auth import AuthorizationContext
+from src.infrastructure.credentials import AccessTokenPayload, JwtCredentials, TokenType
+from src.infrastructure.hashing import BcryptHasher
+from src.infrastructure.keys import JwtKeyManager
+from src.infrastructure.services.auth import JwtAuthService
+from src.infrastructure.token_cache import VerifiedTokenCache
+
+USER = User(
+    id=1,
+    created_at=None,  # type: ignore[arg-type]
+    email="user@example.com",
+    password=b"",
+    username="user",
+    role=RolesEnum.USER,
+)
+
+
+class MemoryAuthRepository:
+    def __init__(self) -> None:
+        self.revoked: dict[str, float] = {}
+
+    async def revoke(self, subject: str, revoked_at: float, expiration: int) -> None:
+        self.revoked[subject] = revoked_at
+
+    async def revoked_at(self, subject: str) -> float | None:
+        return self.revoked.get(subject)
+
+    async def delete(self, subject: str, device_id: str) -> None:
+        pass
+
+
+@pytest.fixture
+def auth(tmp_path):
+    key = ec.generate_private_key(ec.SECP256R1())
+    private_path = tmp_path / "private.pem"
+    private_path.write_bytes(
+        key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        )
+    )
+    hasher = BcryptHasher(rounds=4)
+    yield JwtAuthService(
+        auth_repo=MemoryAuthRepository(),
+        keys=JwtKeyManager(private_path, []),
+        token_cache=VerifiedTokenCache(),
+        hasher=hasher,
+    )
+    hasher._executor.shutdown()
+
+
+def is_revoked(auth: JwtAuthService, token: str) -> bool:
+    async def run() -> bool:
+        context = await auth.authorize(JwtCredentials(token, ""), device_id="test")
+        return await auth.is_revoked(context)
+
+    return asyncio.run(run())
+
+
+def test_tokens_before_revocation_are_revoked_within_a_second(auth):
+    before = auth.create_access_token(USER).token
+    asyncio.run(auth.revoke(USER.id))
+    after = auth.create_access_token(USER).token
+    assert is_revoked(auth, before)
+    assert not is_revoked(auth, after)
+
+
+def test_no_revocation(auth):
+    assert not is_revoked(auth, auth.create_access_token(USER).token)
+
+
+def test_token_without_iat_is_aged_by_exp(auth):
+    def legacy_token(issued_at: float) -> str:
+        payload = AccessTokenPayload(
+            iss="portfolio_backend",
+            sub=str(USER.id),
+            role=USER.role.value,
+            exp=int(issued_at) + CONFIG.ACCESS_TOKEN_EXPIRE_SECONDS,
+            type=TokenType.ACCESS,
+        )
+        return auth._create_token(payload)
+
+    old = legacy_token(time() - 60)
+    asyncio.run(auth.revoke(USER.id))
+    new = legacy_token(time() + 1)
+    assert is_revoked(auth, old)
+    assert not is_revoked(auth, new)
+
+
+class FakeUsers:
+    def __init__(self, exists: bool) -> None:
+        self.exists = exists
+
+    async def get_user(self, user_filter):
+        return USER if self.exists else None
+
+    async def update(self, user_filter, update_data):
+        return User(**{**vars(USER), **update_data})
+
+    async def set_role(self, user_filter, role):
+        return User(**{**vars(USER), "role": role}) if self.exists else None
+
+    async def delete(self, user_filter):
+        return self.exists
+
+
+class FakeUnitOfWork:
+    def __init__(self, users: FakeUsers, events: list[str]) -> None:
+        self.users = users
+        self.events = events
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        pass
+
+    async def commit(self) -> None:
+        self.events.append("commit")
+
+    async def rollback(self) -> None:
+        pass
+
+
+def use_case(cls, cache_client, exists: bool = True):
+    events: list[str] = []
+
+    async def revoke(user_id: int) -> None:
+        events.append(f"revoke:{user_id}")
+
+    async def check_password(user_password: bytes, plain_password: str) -> bool:
+        return plain_password == "old"
+
+    async def hash_password(password: str) -> bytes:
+        return password.encode()
+
+    auth = SimpleNamespace(
+        revoke=revoke, check_password=check_password, hash_password=hash_password
+    )
+    uow = FakeUnitOfWork(FakeUsers(exists), events)
+    users = UsersService(uow=uow, cache_client=cache_client)
+    return cls(auth=auth, uow=uow, users=users), events
+
+
+def test_role_change_revokes_after_commit(cache_client):
+    change_role, events = use_case(ChangeRoleUseCase, cache_client)
+    user = asyncio.run(change_role(user_id=1, role=RolesEnum.ADMIN))
+    assert user.role == RolesEnum.ADMIN
+    assert events == ["commit", "revoke:1"]
+
+
+def test_delete_revokes_after_commit(cache_client):
+    delete_user, events = use_case(DeleteUserUseCase, cache_client)
+    asyncio.run(delete_user(user_id=1))
+    assert events == ["commit", "revoke:1"]
+
+
+def test_missing_user_is_not_revoked(cache_client):
+    delete_user, events = use_case(DeleteUserUseCase, cache_client, exists=False)
+    with pytest.raises(SubjectNotFoundError):
+        asyncio.run(delete_user(user_id=1))
+    assert events == []
+
+
+def test_password_change_revokes_after_commit(cache_client):
+    change_password, events = use_case(ChangePasswordUseCase, cache_client)
+    context = AuthorizationContext(user_id=1, role=RolesEnum.USER)
+    asyncio.run(change_password(context, password="old", new_password="New12345"))
+    assert events == ["commit", "revoke:1"]
+
+
+def test_wrong_password_changes_nothing(cache_client):
+    change_password, events = use_case(ChangePasswordUseCase, cache_client)
+    context = AuthorizationContext(user_id=1, role=RolesEnum.USER)
+    with pytest.raises(AuthError):
+        asyncio.run(change_password(context, password="bad", new_password="New12345"))
+    assert events == []
+
+
+def test_user_route_rejects_revoked_token(auth):
+    guard = UseCaseGuard(
+        required_role=RolesEnum.USER,
+        auth_service=auth,
+        use_case=None,
+        uow=FakeUnitOfWork(FakeUsers(exists=True), []),
+        default_context=AuthorizationContext(user_id=None, role=RolesEnum.GUEST),
+    )
+
+    async def call(token: str) -> None:
+        credentials = JwtCredentials(token, "")
+        async with guard(
+            credentials=credentials, creds_holder=CredentialsHolder(), device_id="test"
+        ):
+            pass
+
+    old = auth.create_access_token(USER).token
+    asyncio.run(auth.revoke(USER.id))
+    with pytest.raises(AccessDeniedError):
+        asyncio.run(call(old))
+    asyncio.run(call(auth.create_access_token(USER).token))
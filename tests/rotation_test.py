@@ -0,0 +1,89 @@
+import asyncio
+from time import time
+
+import pytest
+
+fakeredis = pytest.importorskip("fakeredis")
+pytest.importorskip("lupa")
+pytest.importorskip("jwt")
+pytest.importorskip("bcrypt")
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+
+from src.domain.entities.user import RolesEnum, User
+from src.domain.exceptions.auth import TokenError
+from src.infrastructure.credentials import JwtCredentials
+from src.infrastructure.hashing import BcryptHasher
+from src.infrastructure.keys import JwtKeyManager
+from src.infrastructure.repositories.tokens import JWTRedisAuthRepository
+from src.infrastructure.services.auth import JwtAuthService
+from src.infrastructure.token_cache import VerifiedTokenCache
+
+USER = User(
+    id=1,
+    created_at=None,  # type: ignore[arg-type]
+    email="user@example.com",
+    password=b"",
+    username="user",
+    role=RolesEnum.USER,
+)
+
+
+@pytest.fixture
+def auth(tmp_path):
+    key = ec.generate_private_key(ec.SECP256R1())
+    private_path = tmp_path / "private.pem"
+    private_path.write_bytes(
+        key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        )
+    )
+    hasher = BcryptHasher(rounds=4)
+    yield JwtAuthService(
+        auth_repo=JWTRedisAuthRepository(
+            redis_client=fakeredis.FakeAsyncRedis(decode_responses=True)
+        ),
+        keys=JwtKeyManager(private_path, []),
+        token_cache=VerifiedTokenCache(),
+        hasher=hasher,
+    )
+    hasher._executor.shutdown()
+
+
+async def get_user(user_id: int) -> User:
+    return USER
+
+
+def test_concurrent_renewals_share_one_rotation(auth):
+    async def run() -> None:
+        refresh = auth.create_refresh_token(USER)
+        await auth.auth_repo.register(
+            str(USER.id), refresh.payload.jti, refresh.payload.exp, refresh.token, "d"
+        )
+        credentials = JwtCredentials("", refresh.token)
+        first, second = await asyncio.gather(
+            auth.renew_credentials(credentials, "d", get_user),
+            auth.renew_credentials(credentials, "d", get_user),
+        )
+        assert first.get_raw_data() == second.get_raw_data()
+
+    asyncio.run(run())
+
+
+def test_waiters_stop_when_rotation_fails(auth):
+    async def run() -> None:
+        # Токен не зарегистрирован: владелец блокировки падает с Unknown token.
+        credentials = JwtCredentials("", auth.create_refresh_token(USER).token)
+        started = time()
+        results = await asyncio.gather(
+            auth.renew_credentials(credentials, "d", get_user),
+            auth.renew_credentials(credentials, "d", get_user),
+            return_exceptions=True,
+        )
+        assert all(isinstance(result, TokenError) for result in results)
+        assert time() - started < 1
+
+    asyncio.run(run())
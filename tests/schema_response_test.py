@@ -0,0 +1,102 @@
+import json
+from datetime import UTC, datetime
+
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("httpx")
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.domain.entities.post import Comment, Post
+from src.domain.entities.user import Author
+from src.infrastructure.schemas.post import (
+    PostsResponseSchema,
+    ReadPostSchema,
+    SparsePostsResponseSchema,
+)
+from src.presentation.http.responses import schema_response
+
+AUTHOR = Author(id=1, name="Author", email="author@example.com", photo_url="")
+CREATED_AT = datetime(2025, 1, 1, tzinfo=UTC)
+
+
+def make_post(post_id: str = "1") -> Post:
+    # Валидатор ReadPostSchema меняет recent_comments у поста, поэтому
+    # каждому пути — свой экземпляр.
+    comment = Comment(
+        id="c1",
+        text="First",
+        author=AUTHOR,
+        parent_id=None,
+        post_id=post_id,
+        dislikes={4},
+        likes={2, 3},
+        answers_count=1,
+        created_at=CREATED_AT,
+    )
+    return Post(
+        id=post_id,
+        title="Title",
+        content="Content",
+        author=AUTHOR,
+        dislikes=set(),
+        likes={2, 3},
+        created_at=CREATED_AT,
+        comments_count=2,
+        recent_comments=[comment],
+    )
+
+
+def make_client() -> TestClient:
+    app = FastAPI()
+
+    # Прежний путь: модель из маршрута, response_model по аннотации.
+    @app.get("/old/post")
+    async def old_post() -> ReadPostSchema:
+        return ReadPostSchema.model_validate(make_post(), from_attributes=True)
+
+    @app.get("/old/posts")
+    async def old_posts() -> PostsResponseSchema:
+        return PostsResponseSchema.model_validate(
+            {"posts": [make_post("1"), make_post("2")], "has_next": True},
+            from_attributes=True,
+        )
+
+    @app.get("/new/post", response_model=ReadPostSchema)
+    async def new_post():
+        return schema_response(ReadPostSchema, make_post())
+
+    @app.get("/new/posts", response_model=PostsResponseSchema)
+    async def new_posts():
+        return schema_response(
+            PostsResponseSchema,
+            {"posts": [make_post("1"), make_post("2")], "has_next": True},
+            compress=True,
+        )
+
+    return TestClient(app)
+
+
+@pytest.mark.parametrize("path", ["post", "posts"])
+def test_schema_response_matches_response_model(path: str) -> None:
+    client = make_client()
+    old = client.get(f"/old/{path}")
+    new = client.get(f"/new/{path}")
+    assert old.status_code == new.status_code == 200
+    assert new.headers["content-type"] == "application/json"
+    assert new.json() == old.json()
+
+
+def test_exclude_unset_keeps_only_selected_fields() -> None:
+    data = {
+        "posts": [{"id": "1", "title": "Title", "excerpt": "Cont…"}],
+        "has_next": False,
+    }
+    response = schema_response(SparsePostsResponseSchema, data, exclude_unset=True)
+    assert json.loads(response.body) == {
+        "posts": [{"id": "1", "title": "Title", "excerpt": "Cont…"}],
+        "last_id": "1",
+        "has_next": False,
+    }
@@ -0,0 +1,49 @@
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("gunicorn")
+pytest.importorskip("uvicorn")
+
+from src import serve
+from src.serve import available_cpus, cgroup_cpu_limit
+
+
+def write(path: Path, text: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+
+
+def test_cgroup_v2_quota(tmp_path: Path) -> None:
+    write(tmp_path / "cpu.max", "150000 100000\n")
+    assert cgroup_cpu_limit(tmp_path) == 1.5
+
+
+def test_cgroup_v2_without_limit(tmp_path: Path) -> None:
+    write(tmp_path / "cpu.max", "max 100000\n")
+    assert cgroup_cpu_limit(tmp_path) is None
+
+
+def test_cgroup_v1_quota(tmp_path: Path) -> None:
+    write(tmp_path / "cpu" / "cpu.cfs_quota_us", "200000\n")
+    write(tmp_path / "cpu" / "cpu.cfs_period_us", "100000\n")
+    assert cgroup_cpu_limit(tmp_path) == 2
+
+
+def test_cgroup_v1_without_limit(tmp_path: Path) -> None:
+    write(tmp_path / "cpu" / "cpu.cfs_quota_us", "-1\n")
+    write(tmp_path / "cpu" / "cpu.cfs_period_us", "100000\n")
+    assert cgroup_cpu_limit(tmp_path) is None
+
+
+def test_no_cgroup_files(tmp_path: Path) -> None:
+    assert cgroup_cpu_limit(tmp_path) is None
+
+
+@pytest.mark.parametrize(("limit", "cpus"), [(1.5, 2), (0.2, 1), (None, 32)])
+def test_available_cpus(
+    monkeypatch: pytest.MonkeyPatch, limit: float | None, cpus: int
+) -> None:
+    monkeypatch.setattr(serve.os, "sched_getaffinity", lambda pid: set(range(32)))
+    monkeypatch.setattr(serve, "cgroup_cpu_limit", lambda: limit)
+    assert available_cpus() == cpus
@@ -0,0 +1,56 @@
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("httpx")
+
+import importlib
+import pkgutil
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.application import usecases
+from src.application.usecases.abs import AbstractUseCase
+from src.presentation.http.middlewares import TimingMiddleware, is_internal_client
+from src.timing import LatencyRegistry
+
+
+def make_client(host: str) -> TestClient:
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping() -> dict[str, str]:
+        return {"status": "ok"}
+
+    app.add_middleware(TimingMiddleware, registry=LatencyRegistry())
+    return TestClient(app, client=(host, 50000))
+
+
+@pytest.mark.parametrize(
+    ("host", "internal"),
+    [
+        ("127.0.0.1", True),
+        ("::1", True),
+        ("10.0.0.1", False),
+        ("testclient", False),
+    ],
+)
+def test_is_internal_client(host: str, internal: bool) -> None:
+    assert is_internal_client({"client": (host, 50000)}) is internal
+
+
+def test_server_timing_header_only_for_internal_clients() -> None:
+    headers = {"X-Server-Timing": "1"}
+    internal = make_client("127.0.0.1").get("/ping", headers=headers)
+    external = make_client("203.0.113.5").get("/ping", headers=headers)
+    assert "total;dur=" in internal.headers["server-timing"]
+    assert "server-timing" not in external.headers
+
+
+def test_every_use_case_call_is_timed() -> None:
+    for module in pkgutil.walk_packages(usecases.__path__, f"{usecases.__name__}."):
+        importlib.import_module(module.name)
+    use_cases = AbstractUseCase.__subclasses__()
+    assert use_cases
+    for use_case in use_cases:
+        assert hasattr(use_case.__call__, "__wrapped__"), use_case.__name__
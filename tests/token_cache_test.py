@@ -0,0 +1,56 @@
+from time import time
+
+from src.infrastructure.credentials import AccessTokenPayload, TokenType
+from src.infrastructure.token_cache import VerifiedTokenCache
+
+
+def payload(ttl: float = 60) -> AccessTokenPayload:
+    return AccessTokenPayload(
+        iss="test", sub="1", role=1, exp=int(time() + ttl), type=TokenType.ACCESS
+    )
+
+
+def test_hit_and_miss():
+    cache = VerifiedTokenCache(maxsize=2)
+    token_payload = payload()
+    assert cache.get("a") is None
+    cache.put("a", token_payload)
+    assert cache.get("a") is token_payload
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_expired_payload_is_dropped():
+    cache = VerifiedTokenCache(maxsize=2)
+    cache.put("a", payload(ttl=-1))
+    assert cache.get("a") is None
+    stats = cache.stats()
+    assert stats["expired"] == 1
+    assert stats["size"] == 0
+
+
+def test_least_recently_used_is_evicted():
+    cache = VerifiedTokenCache(maxsize=2)
+    cache.put("a", payload())
+    cache.put("b", payload())
+    cache.get("a")
+    cache.put("c", payload())
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_zero_size_disables_cache():
+    cache = VerifiedTokenCache(maxsize=0)
+    cache.put("a", payload())
+    assert cache.get("a") is None
+    assert cache.stats()["size"] == 0
+
+
+def test_render_exposes_stats():
+    cache = VerifiedTokenCache(maxsize=2)
+    cache.get("a")
+    text = cache.render()
+    assert "access_token_cache_maxsize 2\n" in text
+    assert "access_token_cache_misses_total 1\n" in text
@@ -0,0 +1,112 @@
+import asyncio
+from time import time
+
+import pytest
+
+fakeredis = pytest.importorskip("fakeredis")
+pytest.importorskip("lupa")
+
+from src.infrastructure.repositories.tokens import (
+    SESSIONS_INDEXED_KEY,
+    SESSIONS_INDEXING_LOCK_KEY,
+    JWTRedisAuthRepository,
+)
+
+
+def make_repo() -> tuple[JWTRedisAuthRepository, object]:
+    redis = fakeredis.FakeAsyncRedis(decode_responses=True)
+    return JWTRedisAuthRepository(redis_client=redis), redis
+
+
+def test_delete_removes_device_sessions_and_expired_fields() -> None:
+    async def run() -> None:
+        repo, redis = make_repo()
+        exp = int(time()) + 60
+        await repo.register("1", "a", exp, "token-a", "phone")
+        await repo.register("1", "b", exp, "token-b", "laptop")
+        # Поле истёкшей сессии: сам ключ токена Redis уже удалил.
+        await redis.hset(repo.make_index_key("1"), "c:tablet", int(time()) - 1)
+
+        assert await repo.delete("1", "phone")
+        assert not await redis.exists(repo.make_key("1", "a", "phone"))
+        assert await redis.exists(repo.make_key("1", "b", "laptop"))
+        assert await redis.hkeys(repo.make_index_key("1")) == ["b:laptop"]
+
+        assert await repo.delete("1", "*")
+        assert not await redis.exists(repo.make_key("1", "b", "laptop"))
+        assert not await redis.exists(repo.make_index_key("1"))
+        assert not await repo.delete("1", "*")
+
+    asyncio.run(run())
+
+
+def test_legacy_sessions_are_indexed_once() -> None:
+    async def run() -> None:
+        repo, redis = make_repo()
+        legacy = repo.make_key("1", "a", "phone")
+        await redis.set(legacy, "token-a", ex=60)
+        await redis.set(repo.make_key("2", "b", "laptop"), "token-b", ex=30)
+
+        assert await repo.index_legacy_sessions() == 2
+        assert await redis.exists(SESSIONS_INDEXED_KEY)
+        assert await redis.hkeys(repo.make_index_key("1")) == ["a:phone"]
+        assert await redis.ttl(repo.make_index_key("1")) > 30
+
+        await redis.set(repo.make_key("3", "c", "phone"), "token-c", ex=60)
+        assert await repo.index_legacy_sessions() == 0
+
+        assert await repo.delete("1", "phone")
+        assert not await redis.exists(legacy)
+
+    asyncio.run(run())
+
+
+def test_interrupted_migration_is_retried() -> None:
+    async def run() -> None:
+        repo, redis = make_repo()
+        await redis.set(repo.make_key("1", "a", "phone"), "token-a", ex=60)
+        index_session = repo._index_session
+
+        async def fail(**kwargs: object) -> None:
+            raise ConnectionError
+
+        repo._index_session = fail
+        with pytest.raises(ConnectionError):
+            await repo.index_legacy_sessions()
+        assert not await redis.exists(SESSIONS_INDEXED_KEY, SESSIONS_INDEXING_LOCK_KEY)
+
+        repo._index_session = index_session
+        assert await repo.index_legacy_sessions() == 1
+        assert await redis.hkeys(repo.make_index_key("1")) == ["a:phone"]
+
+    asyncio.run(run())
+
+
+def test_migration_is_skipped_while_another_worker_runs_it() -> None:
+    async def run() -> None:
+        repo, redis = make_repo()
+        await redis.set(repo.make_key("1", "a", "phone"), "token-a", ex=60)
+        await redis.set(SESSIONS_INDEXING_LOCK_KEY, 1, ex=60)
+        assert await repo.index_legacy_sessions() == 0
+        assert not await redis.exists(SESSIONS_INDEXED_KEY)
+
+    asyncio.run(run())
+
+
+def test_rotation_lock_is_released_only_by_its_owner() -> None:
+    async def run() -> None:
+        repo, redis = make_repo()
+        token = await repo.lock_rotation("1", "a", timeout=10)
+        assert token is not None
+        assert await repo.lock_rotation("1", "a", timeout=10) is None
+
+        # Блокировка истекла и перехвачена: прежний владелец её не снимает.
+        await redis.delete(repo.make_rotation_lock_key("1", "a"))
+        other = await repo.lock_rotation("1", "a", timeout=10)
+        await repo.unlock_rotation("1", "a", token)
+        assert await repo.is_rotation_locked("1", "a")
+
+        await repo.unlock_rotation("1", "a", other)
+        assert not await repo.is_rotation_locked("1", "a")
+
+    asyncio.run(run())
@@ -0,0 +1,127 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("motor")
+pytest.importorskip("sqlalchemy")
+
+from src.infrastructure.unit_of_work import UnitOfWork
+
+
+class FakeSqlSession:
+    def __init__(self, log: list[str]) -> None:
+        self.log = log
+
+    async def commit(self) -> None:
+        self.log.append("sql commit")
+
+    async def rollback(self) -> None:
+        self.log.append("sql rollback")
+
+    async def close(self) -> None:
+        self.log.append("sql close")
+
+
+class FakeMongoSession:
+    def __init__(self, log: list[str]) -> None:
+        self.log = log
+
+    async def end_session(self) -> None:
+        self.log.append("mongo end")
+
+
+class FakeMongoClient:
+    def __init__(self, log: list[str]) -> None:
+        self.log = log
+
+    async def start_session(self) -> FakeMongoSession:
+        self.log.append("mongo start")
+        return FakeMongoSession(self.log)
+
+
+def make_uow() -> tuple[UnitOfWork, list[str]]:
+    log: list[str] = []
+
+    def sql_session_factory() -> FakeSqlSession:
+        log.append("sql open")
+        return FakeSqlSession(log)
+
+    return UnitOfWork(sql_session_factory, FakeMongoClient(log)), log
+
+
+def test_nested_entries_share_sessions():
+    uow, log = make_uow()
+
+    async def run() -> None:
+        async with uow:
+            outer = uow.users.session
+            async with uow:
+                assert uow.users.session is outer
+                await uow.commit()
+            # Выход из вложенного входа сессии не закрывает.
+            assert "sql close" not in log
+            assert uow.projects.session is outer
+
+    asyncio.run(run())
+    assert log == ["mongo start", "sql open", "sql commit", "sql close", "mongo end"]
+
+
+def test_sql_session_is_opened_on_first_use():
+    uow, log = make_uow()
+
+    async def run() -> None:
+        async with uow:
+            await uow.commit()
+
+    asyncio.run(run())
+    assert log == ["mongo start", "mongo end"]
+
+
+def test_inner_exception_rolls_back():
+    uow, log = make_uow()
+
+    async def run() -> None:
+        async with uow:
+            assert uow.users.session is not None
+            with pytest.raises(ValueError):
+                async with uow:
+                    raise ValueError
+            assert log[-1] == "sql rollback"
+            assert "sql close" not in log
+
+    asyncio.run(run())
+    assert log[-2:] == ["sql close", "mongo end"]
+
+
+def test_concurrent_tasks_get_their_own_sessions():
+    uow, _ = make_uow()
+
+    async def task() -> object:
+        async with uow:
+            session = uow.users.session
+            await asyncio.sleep(0)
+            assert uow.users.session is session
+            return session
+
+    async def run() -> None:
+        first, second = await asyncio.gather(task(), task())
+        assert first is not second
+
+    asyncio.run(run())
+
+
+def test_child_task_does_not_clear_parent_sessions():
+    uow, _ = make_uow()
+
+    async def child() -> object:
+        async with uow:
+            return uow.users.session
+
+    async def run() -> None:
+        async with uow:
+            parent = uow.users.session
+            # Задача наследует contextvar, но открывает свои сессии.
+            assert await asyncio.create_task(child()) is not parent
+            assert uow.users.session is parent
+
+    asyncio.run(run())
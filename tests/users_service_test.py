@@ -0,0 +1,82 @@
+import asyncio
+from datetime import UTC, datetime
+
+from src.application.services.users import UsersService
+from src.domain.entities.user import Author, RolesEnum, User
+from src.domain.filters.users import UserFilter
+
+AUTHOR = Author(id=1, name="user", email="user@example.com", photo_url="")
+USER = User(
+    id=1,
+    created_at=datetime.now(UTC),
+    email=AUTHOR.email,
+    password=b"",
+    username=AUTHOR.name,
+    role=RolesEnum.USER,
+)
+
+
+class FakeUsers:
+    def __init__(self) -> None:
+        self.loads = 0
+
+    async def get_authors(self, user_ids):
+        self.loads += 1
+        return {AUTHOR.id: AUTHOR} if AUTHOR.id in user_ids else {}
+
+    async def get_user(self, user_filter):
+        return USER
+
+    async def update(self, user_filter, update_data):
+        return USER
+
+    async def delete(self, user_filter):
+        return True
+
+
+class FakeUnitOfWork:
+    """Пишет в журнал коммиты; при коммите проверяет, что профиль ещё в кеше."""
+
+    def __init__(self, cache_client) -> None:
+        self.users = FakeUsers()
+        self.cache_client = cache_client
+        self.cached_at_commit: list[bool] = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        pass
+
+    async def commit(self) -> None:
+        key = UsersService.profile_key(AUTHOR.id)
+        self.cached_at_commit.append(key in self.cache_client.items)
+
+
+def service(cache_client) -> tuple[UsersService, FakeUnitOfWork]:
+    uow = FakeUnitOfWork(cache_client)
+    return UsersService(uow=uow, cache_client=cache_client), uow
+
+
+def test_profiles_are_cached_as_plain_dicts(cache_client):
+    users, uow = service(cache_client)
+    assert asyncio.run(users.get_authors([1])) == {1: AUTHOR}
+    assert cache_client.items == {users.profile_key(1): AUTHOR.to_dict()}
+    assert asyncio.run(users.get_author(1)) == AUTHOR
+    assert uow.users.loads == 1
+
+
+def test_update_invalidates_after_commit(cache_client):
+    users, uow = service(cache_client)
+    asyncio.run(users.get_author(1))
+    asyncio.run(users.update(UserFilter(id=1), {"password": b"new"}))
+    assert uow.cached_at_commit == [True]
+    assert cache_client.items == {}
+
+
+def test_delete_invalidates_after_commit(cache_client):
+    users, uow = service(cache_client)
+    asyncio.run(users.get_author(1))
+    assert asyncio.run(users.delete(UserFilter(id=1)))
+    assert uow.cached_at_commit == [True]
+    assert cache_client.items == {}
@@ -0,0 +1,31 @@
+import pytest
+
+pytest.importorskip("motor")
+
+from pydantic import ValidationError
+
+from src.config import Config, WriteConcernTier
+from src.infrastructure.repositories.posts import write_concern
+
+
+@pytest.mark.parametrize(
+    ("tier", "document"),
+    [
+        ("votes", {"w": 1, "j": False}),
+        ("comments", {"w": "majority", "wtimeout": 5000}),
+        ("posts", {"w": "majority", "j": True, "wtimeout": 5000}),
+    ],
+)
+def test_tier_maps_to_write_concern(tier, document):
+    assert write_concern(tier).document == document
+
+
+def test_unknown_tier_name_fails_at_startup(monkeypatch):
+    monkeypatch.setenv("MONGO_WRITE_CONCERNS", '{"vote": {"w": 1}}')
+    with pytest.raises(ValidationError):
+        Config()
+
+
+def test_unacknowledged_journaled_tier_is_rejected():
+    with pytest.raises(ValidationError):
+        WriteConcernTier(w=0, j=True)